@@ -0,0 +1,82 @@
+# ===================================================
+# File: benchmark_batch_ocr.py
+# Date: 10/18/2026
+# Description: Compares the OCR time per page of
+#   reading each block with its own Tesseract call
+#   against reading all the blocks of a page at once
+#   with the batch OCR agent, one page at a time and
+#   with pages spread across its workers.
+# ==================================================
+
+#! Run this benchmark from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m benchmarks.benchmark_batch_ocr [pdf files...]
+
+import os
+import sys
+import glob
+import time
+import layoutparser as lp
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LAParams, LTTextBox
+from utils.harvest.batch_ocr import BatchOcrAgent
+from utils.harvest.model_registry import OCR_LANGUAGES
+from utils.harvest.page_images import iter_page_images, DEFAULT_DPI
+from utils.harvest.text_layer import POINTS_PER_INCH
+
+DOCS_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + "/docs"
+
+# the most pages of each pdf read
+MAX_PAGES = 5
+
+def _get_page_blocks(pdf_file_path: str) -> list[list[tuple]]:
+    """Returns the pixel coordinates (x_1, y_1, x_2, y_2) of the text boxes found by pdfminer on each page, standing
+    in for the blocks the layout model would find."""
+    scale = DEFAULT_DPI / POINTS_PER_INCH
+    pages = []
+    for ltpage in extract_pages(pdf_file_path, maxpages=MAX_PAGES, laparams=LAParams()):
+        page_x0, _, _, page_y1 = ltpage.bbox
+        pages.append([(int((x0 - page_x0) * scale), int((page_y1 - y1) * scale), int((x1 - page_x0) * scale) + 1, int((page_y1 - y0) * scale) + 1)
+                      for x0, y0, x1, y1 in [element.bbox for element in ltpage if isinstance(element, LTTextBox)]])
+    return pages
+
+def _get_block_images(pdf_file_path: str) -> list[list]:
+    """Returns copies of the block images of each page."""
+    page_blocks = _get_page_blocks(pdf_file_path)
+    pages = []
+    for img, blocks in zip(iter_page_images(pdf_file_path, dpi=DEFAULT_DPI, page_count=len(page_blocks)), page_blocks):
+        pages.append([img[y_1:y_2, x_1:x_2].copy() for x_1, y_1, x_2, y_2 in blocks if x_2 > x_1 and y_2 > y_1])
+    return pages
+
+def main(pdf_file_paths: list[str]):
+    """Prints the OCR time per page of each way of reading the blocks on each pdf."""
+    block_agent = lp.TesseractAgent(languages=OCR_LANGUAGES)
+    batch_agent = BatchOcrAgent(OCR_LANGUAGES)
+    print("Batch agent uses {}".format("tesserocr" if batch_agent.use_tesserocr else "one stacked image per page"))
+    print("{:<40} {:>7} {:>8} {:>14} {:>14} {:>14}".format("document", "pages", "blocks", "per block (s)", "per page (s)", "workers (s)"))
+    for pdf_file_path in pdf_file_paths:
+        pages = _get_block_images(pdf_file_path)
+        if len(pages) == 0:
+            continue
+
+        start_time = time.perf_counter()
+        for images in pages:
+            for image in images:
+                block_agent.detect(image)
+        block_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for images in pages:
+            batch_agent.recognize(images)
+        page_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for future in [batch_agent.submit(images) for images in pages]:
+            future.result()
+        worker_time = time.perf_counter() - start_time
+
+        print("{:<40} {:>7} {:>8} {:>14.3f} {:>14.3f} {:>14.3f}".format(os.path.basename(pdf_file_path)[:40], len(pages), sum([len(images) for images in pages]),
+            block_time / len(pages), page_time / len(pages), worker_time / len(pages)))
+    batch_agent.close()
+
+if __name__ == "__main__":
+    main(sys.argv[1:] if len(sys.argv) > 1 else sorted(glob.glob(DOCS_DIRECTORY + "/*.pdf")))
@@ -0,0 +1,69 @@
+# ===================================================
+# File: benchmark_block_suppression.py
+# Date: 10/18/2026
+# Description: Compares removing redundant layout
+#   blocks with the pairwise refine loop against the
+#   vectorized suppression, on dense pages.
+# ==================================================
+
+#! Run this benchmark from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m benchmarks.benchmark_block_suppression
+
+import copy
+import time
+import random
+import layoutparser as lp
+from layoutparser.elements import TextBlock, Rectangle
+from utils.harvest.document_layout import refine, suppress_redundant_blocks
+
+# the numbers of blocks on the generated pages (a dense reference list has a few hundred)
+BLOCK_COUNTS = (50, 200, 500)
+
+# the size of a generated page in pixels
+PAGE_WIDTH = 1700
+PAGE_HEIGHT = 2200
+
+def _create_dense_page(block_count: int, seed: int) -> lp.Layout:
+    """Returns a layout of thin rows of text like a reference list, with some overlapping duplicates and other block types."""
+    rng = random.Random(seed)
+    blocks = []
+    row_height = PAGE_HEIGHT / block_count
+    for row in range(block_count):
+        x_1 = rng.uniform(100, 200)
+        y_1 = row * row_height + rng.uniform(-row_height / 2, row_height / 2)
+        x_2 = rng.uniform(PAGE_WIDTH - 300, PAGE_WIDTH - 100)
+        y_2 = y_1 + row_height * rng.uniform(0.5, 1.5)
+        block_type = rng.choice(("Text", "Text", "Text", "Title", "List", "Figure"))
+        blocks.append(TextBlock(Rectangle(x_1, y_1, x_2, y_2), type=block_type, score=rng.random()))
+    return lp.Layout(blocks)
+
+def _refine_pairwise(layout_result: lp.Layout):
+    """Removes redundant blocks with the pairwise loop `document_layout` used before suppression was vectorized."""
+    for layout_i in layout_result:
+        if layout_i.type != 'Text' and layout_i.type != 'Title':
+            continue
+        for layout_j in layout_result:
+            if layout_j.type != 'Text' and layout_j.type != 'Title':
+                continue
+            if layout_i != layout_j:
+                refine(layout_i, layout_j)
+
+def _time_suppression(suppression_function, layout_result: lp.Layout) -> tuple[float, list[str]]:
+    """Returns the seconds a suppression function took on a copy of the layout and the resulting block types."""
+    layout_result = copy.deepcopy(layout_result)
+    start_time = time.perf_counter()
+    suppression_function(layout_result)
+    return time.perf_counter() - start_time, [block.type for block in layout_result]
+
+def main():
+    """Prints the time of both suppression methods on pages of each size, and whether their results match."""
+    print("{:>8} {:>14} {:>14} {:>10} {:>8}".format("blocks", "pairwise (s)", "vectorized (s)", "speedup", "same"))
+    for block_count in BLOCK_COUNTS:
+        layout_result = _create_dense_page(block_count, block_count)
+        pairwise_time, pairwise_types = _time_suppression(_refine_pairwise, layout_result)
+        vectorized_time, vectorized_types = _time_suppression(suppress_redundant_blocks, layout_result)
+        same = "yes" if pairwise_types == vectorized_types else "no"
+        print("{:>8} {:>14.4f} {:>14.4f} {:>10.1f} {:>8}".format(block_count, pairwise_time, vectorized_time, pairwise_time / vectorized_time, same))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# ===================================================
+# File: benchmark_cpu_inference.py
+# Date: 10/18/2026
+# Description: Compares the latency and accuracy of
+#   the layout model run the default way against the
+#   cpu inference profile, with and without int8
+#   quantization.
+# ==================================================
+
+#! Run this benchmark from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m benchmarks.benchmark_cpu_inference [thread count] [pdf files...]
+
+import os
+import sys
+import glob
+import time
+import pdf2image
+import numpy as np
+from utils.harvest.model_registry import ModelRegistry
+from utils.harvest.cpu_inference import CpuInferenceProfile
+from utils.harvest.document_layout import detect_layouts, pdf_dir
+
+DOCS_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + "/docs"
+
+# the most pages of each pdf detected
+MAX_PAGES = 5
+
+# blocks of the same type overlapping by at least this much are the same block
+MATCH_IOU = 0.5
+
+def _get_iou(box_1: tuple, box_2: tuple) -> float:
+    """Returns the intersection over union of two (x_1, y_1, x_2, y_2) boxes."""
+    width = min(box_1[2], box_2[2]) - max(box_1[0], box_2[0])
+    height = min(box_1[3], box_2[3]) - max(box_1[1], box_2[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    area_1 = (box_1[2] - box_1[0]) * (box_1[3] - box_1[1])
+    area_2 = (box_2[2] - box_2[0]) * (box_2[3] - box_2[1])
+    return intersection / (area_1 + area_2 - intersection)
+
+def _get_f1(reference_layouts: list, layouts: list) -> float:
+    """Returns the F1 score of the blocks of the layouts against the blocks of the reference layouts, counting a
+    block as found when it has the same type as an unmatched reference block and overlaps it by MATCH_IOU."""
+    matched_count = reference_count = block_count = 0
+    for reference_layout, layout in zip(reference_layouts, layouts):
+        reference_blocks = [(block.type, block.coordinates) for block in reference_layout]
+        reference_count += len(reference_blocks)
+        block_count += len(layout)
+        for block in layout:
+            for reference_block in reference_blocks:
+                if reference_block[0] == block.type and _get_iou(reference_block[1], block.coordinates) >= MATCH_IOU:
+                    reference_blocks.remove(reference_block)
+                    matched_count += 1
+                    break
+    if reference_count + block_count == 0:
+        return 1.0
+    return 2 * matched_count / (reference_count + block_count)
+
+def _time_detection(model_registry: ModelRegistry, imgs: list) -> tuple[float, list]:
+    """Returns the seconds per page of detecting the layouts of the images and the layouts detected."""
+    model = model_registry.get_layout_model()
+    # the first page pays for the lazy setup of the network, so it isn't timed
+    detect_layouts(model, imgs[:1], inference_mode=model_registry.cpu_profile is not None)
+    start_time = time.perf_counter()
+    layouts = detect_layouts(model, imgs, inference_mode=model_registry.cpu_profile is not None)
+    return (time.perf_counter() - start_time) / len(imgs), layouts
+
+def main(thread_count: int, pdf_file_paths: list[str]):
+    """Prints the seconds per page and F1 score against the default model of each way of running the model."""
+    imgs = []
+    for pdf_file_path in pdf_file_paths:
+        imgs.extend([np.asarray(image) for image in pdf2image.convert_from_path(pdf_file_path, last_page=MAX_PAGES)])
+    if len(imgs) == 0:
+        print("No pages to detect")
+        return
+
+    # each model is loaded on its own since quantization changes it in place
+    configurations = [
+        ("default", ModelRegistry()),
+        ("fp32 profile", ModelRegistry(cpu_profile=CpuInferenceProfile(thread_count, quantize=False))),
+        ("int8 profile", ModelRegistry(cpu_profile=CpuInferenceProfile(thread_count, quantize=True)))
+    ]
+    print("{} pages, {} threads".format(len(imgs), thread_count))
+    print("{:<14} {:>12} {:>10} {:>8}".format("mode", "s per page", "speedup", "F1"))
+    reference_time = reference_layouts = None
+    for name, model_registry in configurations:
+        seconds_per_page, layouts = _time_detection(model_registry, imgs)
+        if reference_layouts is None:
+            reference_time, reference_layouts = seconds_per_page, layouts
+        print("{:<14} {:>12.3f} {:>10.2f} {:>8.3f}".format(name, seconds_per_page, reference_time / seconds_per_page, _get_f1(reference_layouts, layouts)))
+
+if __name__ == "__main__":
+    thread_count = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    pdf_file_paths = sys.argv[2:] if len(sys.argv) > 2 else sorted(glob.glob(str(pdf_dir) + "/*.pdf")) + sorted(glob.glob(DOCS_DIRECTORY + "/*.pdf"))
+    main(thread_count, pdf_file_paths)
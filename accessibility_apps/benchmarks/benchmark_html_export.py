@@ -0,0 +1,60 @@
+# ===================================================
+# File: benchmark_html_export.py
+# Date: 10/18/2026
+# Description: Compares exporting html with inline
+#   styles against exporting it with generated css
+#   classes, by html size and pdf render time.
+# ==================================================
+
+#! Run this benchmark from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m benchmarks.benchmark_html_export [pdf files...]
+
+import os
+import sys
+import glob
+import time
+import shutil
+import tempfile
+import statistics
+from utils.harvest.pdf_extractor import extract_paragraphs_and_fonts_and_sizes, export_to_html
+from utils.export.document_exporter import export_document_to_pdf
+
+DOCS_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + "/docs"
+
+# the number of times each pdf is rendered in each mode
+RENDER_REPEATS = 3
+
+def _time_render(html_file_path: str, pdf_file_path: str) -> float:
+    """Returns the median number of seconds it takes to render an html file to a pdf, or nan if it could not be rendered."""
+    render_times = []
+    for _ in range(RENDER_REPEATS):
+        if os.path.exists(pdf_file_path):
+            os.remove(pdf_file_path)
+        start_time = time.perf_counter()
+        export_document_to_pdf(html_file_path, pdf_file_path)
+        render_times.append(time.perf_counter() - start_time)
+        if not os.path.exists(pdf_file_path):
+            return float("nan")
+    return statistics.median(render_times)
+
+def main(pdf_file_paths: list[str]):
+    """Prints the html size and render time of each pdf exported in both modes."""
+    # rendering needs node with puppeteer installed (see setup.bat)
+    can_render = shutil.which("node") is not None
+    print("{:<40} {:>8} {:>12} {:>12} {:>10} {:>10}".format("document", "paras", "inline (B)", "classes (B)", "inline (s)", "classes (s)"))
+
+    with tempfile.TemporaryDirectory() as output_directory:
+        for pdf_file_path in pdf_file_paths:
+            paragraphs = extract_paragraphs_and_fonts_and_sizes(pdf_file_path)
+            results = []
+            for css_classes in (False, True):
+                html_file_path = os.path.join(output_directory, "classes.html" if css_classes else "inline.html")
+                export_to_html(paragraphs, html_file_path, css_classes=css_classes)
+                html_size = os.path.getsize(html_file_path)
+                render_time = _time_render(html_file_path, html_file_path[:-len("html")] + "pdf") if can_render else float("nan")
+                results.append((html_size, render_time))
+
+            print("{:<40} {:>8} {:>12} {:>12} {:>10.3f} {:>10.3f}".format(os.path.basename(pdf_file_path)[:40], len(paragraphs), results[0][0], results[1][0], results[0][1], results[1][1]))
+
+if __name__ == "__main__":
+    main(sys.argv[1:] if len(sys.argv) > 1 else sorted(glob.glob(DOCS_DIRECTORY + "/*.pdf")))
@@ -0,0 +1,56 @@
+# ===================================================
+# File: benchmark_layout_batching.py
+# Date: 10/18/2026
+# Description: Compares detecting page layouts one
+#   page at a time against detecting them in batches,
+#   in pages per second.
+# ==================================================
+
+#! Run this benchmark from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m benchmarks.benchmark_layout_batching [pdf files...]
+
+import os
+import sys
+import glob
+import time
+import pdf2image
+import numpy as np
+from utils.harvest.model_registry import get_model_registry
+from utils.harvest.document_layout import detect_layouts
+
+DOCS_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + "/docs"
+
+# the batch sizes compared against detecting one page at a time
+BATCH_SIZES = (2, 4, 8)
+
+def _time_detection(model, imgs: list, batch_size: int) -> tuple[float, list]:
+    """Returns the pages per second of detecting the layouts of the images and the layouts detected."""
+    start_time = time.perf_counter()
+    if batch_size == 1:
+        layouts = [model.detect(img) for img in imgs]
+    else:
+        layouts = detect_layouts(model, imgs, batch_size)
+    return len(imgs) / (time.perf_counter() - start_time), layouts
+
+def _get_boxes(layouts: list) -> list:
+    """Returns the type and rounded coordinates of every block of every layout, for comparing layouts."""
+    return [[(block.type, tuple(round(coordinate) for coordinate in block.coordinates)) for block in layout] for layout in layouts]
+
+def main(pdf_file_paths: list[str]):
+    """Prints the pages per second of each batch size over the pages of all the pdfs."""
+    imgs = [np.asarray(page_img) for pdf_file_path in pdf_file_paths for page_img in pdf2image.convert_from_path(pdf_file_path)]
+    model_registry = get_model_registry()
+    model_registry.warm_up()
+    model = model_registry.get_layout_model()
+    print("layout model loaded in {:.2f}s ({} pages)".format(model_registry.get_metrics()["layout_model"]["load_seconds"], len(imgs)))
+
+    pages_per_second, per_page_layouts = _time_detection(model, imgs, 1)
+    print("{:>10} {:>12} {:>10} {:>10}".format("batch", "pages/s", "speedup", "same"))
+    print("{:>10} {:>12.3f} {:>10.2f} {:>10}".format(1, pages_per_second, 1, "yes"))
+    for batch_size in BATCH_SIZES:
+        batch_pages_per_second, layouts = _time_detection(model, imgs, batch_size)
+        same = "yes" if _get_boxes(layouts) == _get_boxes(per_page_layouts) else "no"
+        print("{:>10} {:>12.3f} {:>10.2f} {:>10}".format(batch_size, batch_pages_per_second, batch_pages_per_second / pages_per_second, same))
+
+if __name__ == "__main__":
+    main(sys.argv[1:] if len(sys.argv) > 1 else sorted(glob.glob(DOCS_DIRECTORY + "/*.pdf")))
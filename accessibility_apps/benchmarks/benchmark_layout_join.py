@@ -0,0 +1,62 @@
+# ===================================================
+# File: benchmark_layout_join.py
+# Date: 10/18/2026
+# Description: Compares joining layout blocks with the
+#   paragraphs inside them through the per-page grid
+#   index against checking every block against every
+#   paragraph, on generated documents with thousands
+#   of blocks.
+# ==================================================
+
+#! Run this benchmark from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m benchmarks.benchmark_layout_join
+
+import time
+import random
+from utils.harvest.paragraph import Paragraph, FontStyle
+from utils.harvest.layout_join import LayoutBlock, join_blocks_to_paragraphs
+
+# the (pages, blocks and paragraphs per page) of the generated documents
+DOCUMENT_SIZES = ((10, 50), (100, 50), (200, 100))
+
+def _generate_document(page_count: int, items_per_page: int) -> tuple[list, list]:
+    """Returns the blocks and paragraphs of a document with items laid out down each page in two columns."""
+    generator = random.Random(page_count)
+    blocks = []
+    paragraphs = []
+    row_height = 750 / (items_per_page / 2)
+    for page_number in range(1, page_count + 1):
+        for item_number in range(items_per_page):
+            x0 = 40 if item_number % 2 == 0 else 310
+            y0 = 20 + (item_number // 2) * row_height
+            bbox = (x0, y0, x0 + 250, y0 + row_height * 0.8)
+            blocks.append(LayoutBlock("Text", "", page_number, bbox))
+            jitter = generator.uniform(-2, 2)
+            paragraphs.append(Paragraph([("text", FontStyle.STANDARD)], "12px", "Helvetica", page_number, (bbox[0] + jitter, bbox[1] + jitter, bbox[2] - jitter, bbox[3] - jitter)))
+    return blocks, paragraphs
+
+def _join_brute_force(blocks: list, paragraphs: list) -> list:
+    """Returns the paragraphs whose centers are inside each block by checking every pair."""
+    joined = []
+    for block in blocks:
+        x0, y0, x1, y1 = block.bbox
+        joined.append([paragraph for paragraph in paragraphs if paragraph.page_number == block.page_number
+                       and x0 <= (paragraph.bbox[0] + paragraph.bbox[2]) / 2 <= x1 and y0 <= (paragraph.bbox[1] + paragraph.bbox[3]) / 2 <= y1])
+    return joined
+
+def main():
+    """Prints the time of each way of joining the generated documents."""
+    print("{:>8} {:>8} {:>14} {:>14} {:>10}".format("pages", "blocks", "index (ms)", "pairs (ms)", "speedup"))
+    for page_count, items_per_page in DOCUMENT_SIZES:
+        blocks, paragraphs = _generate_document(page_count, items_per_page)
+        start_time = time.perf_counter()
+        joined = join_blocks_to_paragraphs(blocks, paragraphs)
+        index_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        brute_force_joined = _join_brute_force(blocks, paragraphs)
+        brute_force_time = time.perf_counter() - start_time
+        assert joined == brute_force_joined
+        print("{:>8} {:>8} {:>14.1f} {:>14.1f} {:>10.1f}".format(page_count, len(blocks), index_time * 1000, brute_force_time * 1000, brute_force_time / index_time))
+
+if __name__ == "__main__":
+    main()
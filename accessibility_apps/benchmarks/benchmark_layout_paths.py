@@ -0,0 +1,42 @@
+# ===================================================
+# File: benchmark_layout_paths.py
+# Date: 10/18/2026
+# Description: Reports which documents in a batch the
+#   heuristic layout is confident enough in to skip
+#   the layout model, and how long the heuristics took.
+# ==================================================
+
+#! Run this benchmark from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m benchmarks.benchmark_layout_paths [pdf files...]
+
+import os
+import sys
+import glob
+import time
+from collections import Counter
+from utils.harvest.heuristic_layout import heuristic_layout, DEFAULT_CONFIDENCE_THRESHOLD
+
+DOCS_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + "/docs"
+
+# the names of the layout paths (matching document_layout, which isn't imported so this runs without the layout model installed)
+HEURISTIC_LAYOUT_PATH = "heuristic"
+MODEL_LAYOUT_PATH = "model"
+
+def main(pdf_file_paths: list[str], confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD):
+    """Prints the heuristic confidence, layout path, and heuristic time of each pdf, then how many took each path."""
+    path_counts = Counter()
+    print("{:<40} {:>8} {:>8} {:>10} {:>10}".format("document", "blocks", "conf", "path", "time (s)"))
+    for pdf_file_path in pdf_file_paths:
+        start_time = time.perf_counter()
+        layout_data, confidence = heuristic_layout(pdf_file_path)
+        heuristic_time = time.perf_counter() - start_time
+        layout_path = HEURISTIC_LAYOUT_PATH if confidence >= confidence_threshold else MODEL_LAYOUT_PATH
+        path_counts[layout_path] += 1
+        print("{:<40} {:>8} {:>8.2f} {:>10} {:>10.2f}".format(os.path.basename(pdf_file_path)[:40], len(layout_data), confidence, layout_path, heuristic_time))
+
+    print()
+    for layout_path in (HEURISTIC_LAYOUT_PATH, MODEL_LAYOUT_PATH):
+        print("{}: {} of {} documents".format(layout_path, path_counts[layout_path], len(pdf_file_paths)))
+
+if __name__ == "__main__":
+    main(sys.argv[1:] if len(sys.argv) > 1 else sorted(glob.glob(DOCS_DIRECTORY + "/*.pdf")))
@@ -0,0 +1,105 @@
+# ===================================================
+# File: benchmark_reading_order.py
+# Date: 10/18/2026
+# Description: Compares ordering the blocks of dense
+#   multi-column pages with the sorted XY-cut against
+#   an XY-cut that finds its cuts by comparing blocks
+#   pairwise, and against sorting by the top of each
+#   block (how pages used to be ordered), by time and
+#   by how many pages are read in the right order.
+# ==================================================
+
+#! Run this benchmark from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m benchmarks.benchmark_reading_order
+
+import time
+import random
+from utils.harvest.reading_order import get_reading_order
+
+# the number of pages generated for each (column count, paragraphs per column band) page size
+PAGE_COUNT = 20
+PAGE_SIZES = ((2, 10), (3, 30), (4, 80), (6, 240))
+
+# the page width in pixels at the default dpi (letter paper at 200 dpi)
+PAGE_WIDTH = 1700
+
+def _generate_page(generator:random.Random, column_count:int, paragraphs_per_band:int) -> list:
+    """Returns the boxes of a page in reading order: bands of columns of paragraphs, each band after a block
+    spanning the columns (like a title or figure)."""
+    bboxes = []
+    column_width = (PAGE_WIDTH - 100) / column_count
+    y0 = 20
+    for _ in range(2):
+        bboxes.append((50, y0, PAGE_WIDTH - 50, y0 + 60))
+        band_top = y0 + 70
+        band_bottom = band_top
+        for column in range(column_count):
+            x0 = 50 + column * column_width
+            paragraph_top = band_top + generator.uniform(0, 10)
+            for _ in range(paragraphs_per_band // column_count):
+                height = generator.uniform(8, 40)
+                bboxes.append((x0, paragraph_top, x0 + column_width - 12, paragraph_top + height))
+                paragraph_top += height + generator.uniform(2, 6)
+            band_bottom = max(band_bottom, paragraph_top)
+        y0 = band_bottom + 10
+    return bboxes
+
+def _get_gaps(bboxes:list, ids:list, axis:int) -> list:
+    """Returns the positions along an axis, between blocks, that no block crosses, by checking every block
+    against every block end."""
+    gaps = []
+    for i in ids:
+        position = bboxes[i][axis + 2]
+        if all([bboxes[j][axis + 2] <= position or bboxes[j][axis] >= position for j in ids]) and any([bboxes[j][axis] >= position for j in ids]):
+            gaps.append(position)
+    return sorted(set(gaps))
+
+def _split_at(bboxes:list, ids:list, axis:int, gaps:list) -> list:
+    """Returns the blocks between each gap."""
+    return [[i for i in ids if start <= bboxes[i][axis] and bboxes[i][axis + 2] <= end]
+            for start, end in zip([float('-inf')] + gaps, gaps + [float('inf')])]
+
+def _get_reading_order_pairwise(bboxes:list, ids:list=None) -> list:
+    """Returns the reading order of the boxes with the same XY-cut as `get_reading_order`, finding the cuts by
+    comparing blocks pairwise at each step."""
+    if ids is None:
+        ids = list(range(len(bboxes)))
+    column_gaps = _get_gaps(bboxes, ids, 0)
+    if len(column_gaps) > 0:
+        return [i for column in _split_at(bboxes, ids, 0, column_gaps) for i in _get_reading_order_pairwise(bboxes, column)]
+    rows = _split_at(bboxes, ids, 1, _get_gaps(bboxes, ids, 1))
+    if len(rows) == 1:
+        return sorted(ids, key=lambda i: (bboxes[i][1], bboxes[i][0]))
+    bands = [rows[0]]
+    for row in rows[1:]:
+        if len(_get_gaps(bboxes, bands[-1] + row, 0)) > 0:
+            bands[-1] = bands[-1] + row
+        else:
+            bands.append(row)
+    return [i for band in bands for i in _get_reading_order_pairwise(bboxes, band)]
+
+def _get_reading_order_by_top(bboxes:list) -> list:
+    """Returns the boxes ordered by their top."""
+    return sorted(range(len(bboxes)), key=lambda i: bboxes[i][1])
+
+def main():
+    """Prints the time each way of ordering takes per page and the fraction of pages each reads in order."""
+    generator = random.Random(11)
+    print("{:>8} {:>8} {:>12} {:>14} {:>10} {:>12} {:>10}".format("columns", "blocks", "xy-cut (ms)", "pairwise (ms)", "speedup", "xy-cut right", "top right"))
+    for column_count, paragraphs_per_band in PAGE_SIZES:
+        pages = [_generate_page(generator, column_count, paragraphs_per_band) for _ in range(PAGE_COUNT)]
+        start_time = time.perf_counter()
+        orders = [get_reading_order(bboxes) for bboxes in pages]
+        xy_cut_time = (time.perf_counter() - start_time) / PAGE_COUNT
+        start_time = time.perf_counter()
+        pairwise_orders = [_get_reading_order_pairwise(bboxes) for bboxes in pages]
+        pairwise_time = (time.perf_counter() - start_time) / PAGE_COUNT
+        assert orders == pairwise_orders
+
+        xy_cut_right = len([order for order in orders if order == list(range(len(order)))]) / PAGE_COUNT
+        top_right = len([bboxes for bboxes in pages if _get_reading_order_by_top(bboxes) == list(range(len(bboxes)))]) / PAGE_COUNT
+        print("{:>8} {:>8.0f} {:>12.2f} {:>14.2f} {:>10.1f} {:>12.0%} {:>10.0%}".format(column_count, sum([len(bboxes) for bboxes in pages]) / PAGE_COUNT, xy_cut_time * 1000, pairwise_time * 1000,
+                                                                               pairwise_time / xy_cut_time, xy_cut_right, top_right))
+
+if __name__ == "__main__":
+    main()
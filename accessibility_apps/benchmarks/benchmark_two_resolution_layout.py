@@ -0,0 +1,48 @@
+# ===================================================
+# File: benchmark_two_resolution_layout.py
+# Date: 10/18/2026
+# Description: Compares parsing the layout of pdfs at
+#   a single resolution against detecting the layout
+#   at a low resolution and rasterizing only the text
+#   at a high resolution for OCR, by time and by how
+#   closely the OCR text matches the pdf's own text.
+# ==================================================
+
+#! Run this benchmark from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m benchmarks.benchmark_two_resolution_layout [pdf files...]
+
+import os
+import sys
+import glob
+import time
+from difflib import SequenceMatcher
+from utils.harvest.model_registry import get_model_registry
+from utils.harvest.pdf_extractor import extract_paragraphs_and_fonts_and_sizes
+from utils.harvest.document_layout import document_layout, TWO_RESOLUTION_DETECTION_DPI, TWO_RESOLUTION_OCR_DPI
+
+DOCS_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + "/docs"
+
+def _get_accuracy(layout_data: list[tuple], reference_words: list[str]) -> float:
+    """Returns how closely the words read by OCR match the reference words, from 0 to 1."""
+    ocr_words = " ".join([data for block_type, data in layout_data if block_type == 'Text' or block_type == 'Title']).split()
+    return SequenceMatcher(None, ocr_words, reference_words, autojunk=False).ratio()
+
+def _time_layout(pdf_file_path: str, **layout_options) -> tuple[float, list[tuple]]:
+    """Returns the seconds it took to parse the layout of a pdf and the layout data."""
+    start_time = time.perf_counter()
+    layout_data = document_layout(pdf_file_path, **layout_options)
+    return time.perf_counter() - start_time, layout_data
+
+def main(pdf_file_paths: list[str]):
+    """Prints the time and OCR accuracy of both modes on each pdf, using the text extracted from the pdf as the reference."""
+    get_model_registry().warm_up()
+    print("{:<40} {:>10} {:>10} {:>10} {:>10}".format("document", "single (s)", "two (s)", "single acc", "two acc"))
+    for pdf_file_path in pdf_file_paths:
+        reference_words = " ".join([paragraph.get_raw_text() for paragraph in extract_paragraphs_and_fonts_and_sizes(pdf_file_path)]).split()
+        single_time, single_data = _time_layout(os.path.abspath(pdf_file_path), use_text_layer=False)
+        two_time, two_data = _time_layout(os.path.abspath(pdf_file_path), dpi=TWO_RESOLUTION_DETECTION_DPI, ocr_dpi=TWO_RESOLUTION_OCR_DPI, use_text_layer=False)
+        print("{:<40} {:>10.2f} {:>10.2f} {:>10.3f} {:>10.3f}".format(os.path.basename(pdf_file_path)[:40], single_time, two_time,
+            _get_accuracy(single_data, reference_words), _get_accuracy(two_data, reference_words)))
+
+if __name__ == "__main__":
+    main(sys.argv[1:] if len(sys.argv) > 1 else sorted(glob.glob(DOCS_DIRECTORY + "/*.pdf")))
@@ -0,0 +1,46 @@
+# ===================================================
+# File: benchmark_worker_preload.py
+# Date: 10/18/2026
+# Description: Compares workers that load the layout
+#   model themselves against workers forked from a
+#   fork server that preloaded it, by the time until
+#   a fresh worker detects its first page and by the
+#   memory unique to each worker.
+# ==================================================
+
+#! Run this benchmark from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m benchmarks.benchmark_worker_preload [worker count] [preload]
+# The fork server is shared by the whole program, so each run measures one mode: with "preload" the fork server
+# loads the model, and without it each worker does.
+
+import sys
+import time
+from utils.worker_pool import PreloadedWorkerPool, DEFAULT_PRELOAD_MODULES
+
+# the number of tasks each worker runs, and the size of the page detected by each task
+TASKS_PER_WORKER = 3
+PAGE_SIZE = (1100, 850, 3)
+
+def _detect_page() -> float:
+    """Detects the layout of a blank page with the process's layout model and returns the seconds it took,
+    including loading the model if it wasn't loaded yet."""
+    start_time = time.perf_counter()
+    import numpy as np
+    from utils.harvest.model_registry import get_model_registry
+    get_model_registry().get_layout_model().detect(np.full(PAGE_SIZE, 255, dtype=np.uint8))
+    return time.perf_counter() - start_time
+
+def main(worker_count: int, preload: bool):
+    """Prints the seconds each task took and the unique memory of each worker."""
+    # workers are replaced after their tasks, so every task runs on a cold worker
+    with PreloadedWorkerPool(worker_count, max_tasks_per_worker=1, preload_modules=DEFAULT_PRELOAD_MODULES if preload else []) as pool:
+        print("{} workers ({}), {}".format(worker_count, pool.start_method, "model preloaded" if preload else "model loaded by each worker"))
+        start_time = time.perf_counter()
+        seconds = [future.result() for future in [pool.submit(_detect_page) for _ in range(worker_count * TASKS_PER_WORKER)]]
+        total_seconds = time.perf_counter() - start_time
+        print("cold task seconds: min {:.2f}, max {:.2f}, mean {:.2f}".format(min(seconds), max(seconds), sum(seconds) / len(seconds)))
+        print("total seconds (including fork server start): {:.2f}".format(total_seconds))
+        print(pool.get_memory_report())
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2, len(sys.argv) > 2 and sys.argv[2] == "preload")
@@ -0,0 +1,83 @@
+# ===================================================
+# File: test_batch_ocr.py
+# Date: 10/18/2026
+# Description: Tests stacking block images for one
+#   OCR call and splitting the words read back to the
+#   blocks they came from.
+# ==================================================
+
+#! Run This test from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m unittest -v tests.test_batch_ocr
+
+import sys
+import types
+import unittest
+from unittest import mock
+
+try:
+    import numpy as np
+    from utils.harvest.batch_ocr import BatchOcrAgent, STACK_GAP, _stack_images
+except ImportError:
+    np = None
+
+def _make_image_to_data(words:list):
+    '''Returns a stand in for `pytesseract.image_to_data` that reads the given (text, top, height, block, paragraph, line) words.'''
+    def image_to_data(image, lang=None, output_type=None):
+        return {
+            'text' : [word[0] for word in words],
+            'top' : [word[1] for word in words],
+            'height' : [word[2] for word in words],
+            'block_num' : [word[3] for word in words],
+            'par_num' : [word[4] for word in words],
+            'line_num' : [word[5] for word in words]
+        }
+    return image_to_data
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class BatchOcrTests(unittest.TestCase):
+    '''Tests reading stacked block images.'''
+
+    def test_stack_images(self):
+        '''Tests that images are stacked top to bottom on white with a gap between them.'''
+        images = [np.zeros((10, 30, 3), dtype=np.uint8), np.full((20, 15, 3), 100, dtype=np.uint8)]
+        stacked_image, offsets = _stack_images(images)
+        self.assertEqual(stacked_image.shape, (30 + STACK_GAP, 30, 3))
+        self.assertEqual(offsets, [0, 10 + STACK_GAP])
+        self.assertTrue((stacked_image[:10] == 0).all())
+        self.assertTrue((stacked_image[10:10 + STACK_GAP] == 255).all())
+        self.assertTrue((stacked_image[10 + STACK_GAP:, :15] == 100).all())
+        # the narrower image is padded with white
+        self.assertTrue((stacked_image[10 + STACK_GAP:, 15:] == 255).all())
+
+        # grayscale images stay grayscale
+        stacked_image, offsets = _stack_images([np.zeros((5, 5), dtype=np.uint8)])
+        self.assertEqual((stacked_image.shape, offsets), ((5, 5), [0]))
+
+    def test_recognize_stacked(self):
+        '''Tests that each word goes to the image its center is in, with the lines of each image kept apart.'''
+        images = [np.zeros((30, 40, 3), dtype=np.uint8), np.zeros((50, 40, 3), dtype=np.uint8), np.zeros((10, 40, 3), dtype=np.uint8)]
+        second_offset = 30 + STACK_GAP
+        words = [
+            ('', 0, 0, 1, 0, 0),
+            ('First', 2, 10, 1, 1, 1),
+            ('block', 2, 10, 1, 1, 1),
+            ('second', 15, 10, 1, 1, 2),
+            ('line', 15, 10, 1, 1, 2),
+            # a tall word whose top is in the gap but whose center is in the second image
+            ('Middle', second_offset - 6, 20, 2, 1, 1),
+            ('block', second_offset + 30, 10, 2, 1, 2),
+            ('  ', second_offset + 40, 5, 2, 1, 2)
+        ]
+        fake_pytesseract = types.SimpleNamespace(image_to_data=_make_image_to_data(words), Output=types.SimpleNamespace(DICT='dict'))
+        agent = BatchOcrAgent(workers=1)
+        agent.use_tesserocr = False
+        try:
+            with mock.patch.dict(sys.modules, {'pytesseract' : fake_pytesseract}):
+                texts = agent.submit(images).result()
+        finally:
+            agent.close()
+        self.assertEqual(texts, ['First block\nsecond line', 'Middle\nblock', ''])
+        self.assertEqual(agent.recognize([]), [])
+
+if __name__ == '__main__':
+    unittest.main()
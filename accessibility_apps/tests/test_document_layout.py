@@ -0,0 +1,84 @@
+# ===================================================
+# File: test_document_layout.py
+# Date: 10/18/2026
+# Description: Tests removing redundant blocks from
+#   the layout detected on a page.
+# ==================================================
+
+#! Run This test from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m unittest -v tests.test_document_layout
+
+import copy
+import random
+import unittest
+
+try:
+    import torch
+    import layoutparser as lp
+    from layoutparser.elements import TextBlock, Rectangle
+    from utils.harvest.document_layout import refine, suppress_redundant_blocks
+except ImportError:
+    torch = None
+
+# the types of the generated blocks (only Text and Title blocks are suppressed)
+BLOCK_TYPES = ('Text', 'Title', 'List', 'Figure')
+
+def _refine_pairwise(layout_result:'lp.Layout'):
+    '''Removes redundant blocks with the pairwise loop `document_layout` used before suppression was vectorized.'''
+    for layout_i in layout_result:
+        if layout_i.type != 'Text' and layout_i.type != 'Title':
+            continue
+        for layout_j in layout_result:
+            if layout_j.type != 'Text' and layout_j.type != 'Title':
+                continue
+            if layout_i != layout_j:
+                refine(layout_i, layout_j)
+
+def _create_page(generator:random.Random, block_count:int) -> 'lp.Layout':
+    '''Returns a layout of random blocks, many of them overlapping, nested in others, or duplicated.'''
+    blocks = []
+    for _ in range(block_count):
+        block_type = generator.choice(BLOCK_TYPES)
+        if len(blocks) > 0 and generator.random() < 0.3:
+            # a block nested in (or the same as) an earlier one
+            x_1, y_1, x_2, y_2 = generator.choice(blocks).coordinates
+            if generator.random() < 0.3:
+                blocks.append(TextBlock(Rectangle(x_1, y_1, x_2, y_2), type=block_type))
+                continue
+            x_1, x_2 = x_1 + generator.uniform(0, (x_2 - x_1) / 3), x_2 - generator.uniform(0, (x_2 - x_1) / 3)
+            y_1, y_2 = y_1 + generator.uniform(0, (y_2 - y_1) / 3), y_2 - generator.uniform(0, (y_2 - y_1) / 3)
+        else:
+            x_1, y_1 = generator.uniform(0, 500), generator.uniform(0, 700)
+            x_2, y_2 = x_1 + generator.uniform(10, 300), y_1 + generator.uniform(10, 150)
+        blocks.append(TextBlock(Rectangle(x_1, y_1, x_2, y_2), type=block_type, score=generator.random()))
+    return lp.Layout(blocks)
+
+@unittest.skipIf(torch is None, 'torch and layoutparser are not installed')
+class DocumentLayoutTests(unittest.TestCase):
+    '''Tests the layout refinement.'''
+
+    def test_suppression_matches_refine(self):
+        '''Tests that suppressing redundant blocks marks the same blocks as refining every pair.'''
+        generator = random.Random(5)
+        for block_count in (0, 1, 2, 5, 20, 60):
+            for _ in range(10):
+                layout_result = _create_page(generator, block_count)
+                refined_layout = copy.deepcopy(layout_result)
+                _refine_pairwise(refined_layout)
+                suppress_redundant_blocks(layout_result)
+                self.assertEqual([block.type for block in layout_result], [block.type for block in refined_layout])
+
+    def test_nested_blocks(self):
+        '''Tests that a block inside a larger one is suppressed only when both are Text or Title blocks.'''
+        layout_result = lp.Layout([
+            TextBlock(Rectangle(0, 0, 100, 100), type='Text'),
+            TextBlock(Rectangle(10, 10, 50, 50), type='Title'),
+            TextBlock(Rectangle(20, 20, 40, 40), type='Figure'),
+            TextBlock(Rectangle(200, 0, 300, 100), type='List'),
+            TextBlock(Rectangle(210, 10, 250, 50), type='Text')
+        ])
+        suppress_redundant_blocks(layout_result)
+        self.assertEqual([block.type for block in layout_result], ['Text', 'None', 'Figure', 'List', 'Text'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+# ===================================================
+# File: test_export_manifest.py
+# Date: 10/18/2026
+# Description: Tests recording exported documents in
+#   the export manifest.
+# ==================================================
+
+#! Run This test from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m unittest -v tests.test_export_manifest
+
+import os
+import csv
+import time
+import tempfile
+import unittest
+from multiprocessing import Pool
+from utils.export.export_manifest import ExportManifest, EXPORT_CSV_HEADER, get_export_manifest, write_export_csv, close_export_manifests
+
+def _record_exports(database_path:str, worker_number:int, export_count:int):
+    '''Records exports to a manifest from a worker process.'''
+    export_manifest = ExportManifest(database_path, batch_size=7)
+    for export_number in range(export_count):
+        export_manifest.record(str(worker_number) + '-' + str(export_number), 'file.pdf', 'Title')
+    export_manifest.close()
+
+class ExportManifestTests(unittest.TestCase):
+    '''Tests the export manifest.'''
+
+    def setUp(self):
+        '''Sets up a temporary folder for the manifest.'''
+        self.output_folder = tempfile.TemporaryDirectory()
+        self.database_path = os.path.join(self.output_folder.name, 'export_manifest.sqlite3')
+        self.csv_file_path = os.path.join(self.output_folder.name, 'export_data.csv')
+
+    def tearDown(self):
+        '''Removes the temporary folder.'''
+        self.output_folder.cleanup()
+
+    def read_csv(self) -> list:
+        '''Returns the rows of the export csv.'''
+        with open(self.csv_file_path, 'r', newline='') as export_csv:
+            return list(csv.reader(export_csv))
+
+    def test_record_and_contains(self):
+        '''Tests that records are buffered into batches and that recorded ids are found.'''
+        export_manifest = ExportManifest(self.database_path, batch_size=2)
+        export_manifest.record('1', 'first.pdf', 'First')
+        self.assertTrue(export_manifest.contains('1'))
+        self.assertFalse(export_manifest.contains('2'))
+        self.assertFalse(export_manifest.contains(None))
+
+        # the first record is only written once the batch is full
+        other_manifest = ExportManifest(self.database_path)
+        self.assertFalse(other_manifest.contains('1'))
+        export_manifest.record(None, 'local.pdf', 'Local')
+        self.assertTrue(other_manifest.contains('1'))
+
+        self.assertEqual(len(export_manifest), 2)
+        export_manifest.close()
+        other_manifest.close()
+
+        # reopening keeps what was recorded
+        export_manifest = ExportManifest(self.database_path)
+        self.assertTrue(export_manifest.contains('1'))
+        export_manifest.close()
+
+    def test_export_csv(self):
+        '''Tests that the legacy csv is rendered in the order exports were recorded and can be imported again.'''
+        export_manifest = ExportManifest(self.database_path)
+        export_manifest.record('1', 'first.pdf', 'First, with a comma')
+        export_manifest.record(None, 'local.pdf', 'Local')
+        export_manifest.export_csv(self.csv_file_path)
+        export_manifest.close()
+        expected_rows = [EXPORT_CSV_HEADER, ['1', 'first.pdf', 'First, with a comma'], ['', 'local.pdf', 'Local']]
+        self.assertEqual(self.read_csv(), expected_rows)
+
+        os.remove(self.database_path)
+        export_manifest = ExportManifest(self.database_path)
+        export_manifest.import_csv(self.csv_file_path)
+        self.assertTrue(export_manifest.contains('1'))
+        export_manifest.export_csv(self.csv_file_path)
+        export_manifest.close()
+        self.assertEqual(self.read_csv(), expected_rows)
+
+    def test_concurrent_processes(self):
+        '''Tests that exports recorded by several processes at once are all kept.'''
+        worker_count = 4
+        export_count = 50
+        # create the database before the workers use it
+        export_manifest = ExportManifest(self.database_path)
+        self.assertEqual(len(export_manifest), 0)
+        with Pool(worker_count) as pool:
+            pool.starmap(_record_exports, [(self.database_path, worker_number, export_count) for worker_number in range(worker_count)])
+        # the exports the workers recorded are found by a manifest opened before them
+        self.assertTrue(export_manifest.contains('0-0'))
+        self.assertFalse(export_manifest.contains('0-' + str(export_count)))
+        export_manifest.close()
+
+        export_manifest = ExportManifest(self.database_path)
+        self.assertEqual(len(export_manifest), worker_count * export_count)
+        export_manifest.export_csv(self.csv_file_path)
+        export_manifest.close()
+        rows = self.read_csv()[1:]
+        self.assertEqual(sorted([row[0] for row in rows]), sorted([str(worker_number) + '-' + str(export_number) for worker_number in range(worker_count) for export_number in range(export_count)]))
+        # each worker's rows keep their order
+        for worker_number in range(worker_count):
+            worker_ids = [row[0] for row in rows if row[0].startswith(str(worker_number) + '-')]
+            self.assertEqual(worker_ids, [str(worker_number) + '-' + str(export_number) for export_number in range(export_count)])
+
+    def test_lazy_open(self):
+        '''Tests that the database is only created once the manifest is used, and the csv is only written when
+        there are new exports.'''
+        export_manifest = get_export_manifest(self.output_folder.name)
+        write_export_csv(self.output_folder.name)
+        close_export_manifests()
+        self.assertFalse(os.path.exists(self.database_path))
+        self.assertFalse(os.path.exists(self.csv_file_path))
+
+        # a legacy csv is imported once the manifest is first used, without writing the csv again
+        with open(self.csv_file_path, 'w', newline='') as export_csv:
+            csv.writer(export_csv).writerows([EXPORT_CSV_HEADER, ['1', 'first.pdf', 'First']])
+        csv_modified_time = os.path.getmtime(self.csv_file_path)
+        export_manifest = get_export_manifest(self.output_folder.name)
+        self.assertTrue(export_manifest.contains('1'))
+        self.assertTrue(os.path.exists(self.database_path))
+        close_export_manifests()
+        self.assertEqual(os.path.getmtime(self.csv_file_path), csv_modified_time)
+
+        get_export_manifest(self.output_folder.name).record('2', 'second.pdf', 'Second')
+        close_export_manifests()
+        self.assertEqual(self.read_csv(), [EXPORT_CSV_HEADER, ['1', 'first.pdf', 'First'], ['2', 'second.pdf', 'Second']])
+
+    def test_flush_timer(self):
+        '''Tests that buffered records are written once they are old enough without another record.'''
+        export_manifest = ExportManifest(self.database_path, flush_interval=0.1)
+        export_manifest.record('1', 'first.pdf', 'First')
+        other_manifest = ExportManifest(self.database_path)
+        self.assertFalse(other_manifest.contains('1'))
+        time.sleep(0.5)
+        self.assertTrue(other_manifest.contains('1'))
+        export_manifest.close()
+        other_manifest.close()
+
+if __name__ == '__main__':
+    unittest.main()
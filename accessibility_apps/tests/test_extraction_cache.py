@@ -0,0 +1,73 @@
+# ===================================================
+# File: test_extraction_cache.py
+# Date: 10/18/2026
+# Description: Tests caching extracted paragraphs
+#   on disk.
+# ==================================================
+
+#! Run This test from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m unittest -v tests.test_extraction_cache
+
+import os
+import tempfile
+import unittest
+from utils.harvest.paragraph import *
+from utils.harvest.extraction_cache import ExtractionCache, encode_paragraphs, decode_paragraphs
+
+TEST_PDF = '../data/input/pdf_extractor_test.pdf'
+
+class ExtractionCacheTests(unittest.TestCase):
+    '''Tests the extraction cache.'''
+
+    def setUp(self):
+        '''Sets up a temporary cache directory and data for the test cases.'''
+        self.cache_directory = tempfile.TemporaryDirectory()
+        self.test_paragraphs = [
+            Paragraph([('This is a PDF', FontStyle.STANDARD)], '27px', 'Helvetica'),
+            Paragraph([('Bold ', FontStyle.BOLD), ('and italic ünïcode', FontStyle.BOLD_ITALIC)], '12px', 'Helvetica-BoldOblique'),
+            Paragraph([('This is the end of the pdf.', FontStyle.ITALIC)], '12px', 'Helvetica', 2, (31.19, 623.206, 165.938, 635.206))
+        ]
+
+    def tearDown(self):
+        '''Removes the temporary cache directory.'''
+        self.cache_directory.cleanup()
+
+    def test_encode_decode_paragraphs(self):
+        '''Tests that paragraphs survive being encoded to binary and back.'''
+        decoded_paragraphs = decode_paragraphs(encode_paragraphs(self.test_paragraphs))
+        self.assertEqual(len(decoded_paragraphs), len(self.test_paragraphs))
+        for paragraph_1, paragraph_2 in zip(decoded_paragraphs, self.test_paragraphs):
+            self.assertEqual(paragraph_1, paragraph_2)
+            self.assertEqual(paragraph_1.page_number, paragraph_2.page_number)
+            self.assertEqual(paragraph_1.bbox, paragraph_2.bbox)
+
+    def test_hits_and_misses(self):
+        '''Tests that paragraphs are only found in the cache after being put there.'''
+        cache = ExtractionCache(self.cache_directory.name)
+        key = cache.get_key(TEST_PDF)
+        self.assertIsNone(cache.get_paragraphs(key))
+        cache.put_paragraphs(key, self.test_paragraphs)
+        self.assertEqual(cache.get_paragraphs(key), self.test_paragraphs)
+
+        stats = cache.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['entries'], 1)
+
+    def test_least_recently_used_eviction(self):
+        '''Tests that the least recently used entries are removed once the cache is over its size cap.'''
+        entry_size = len(encode_paragraphs(self.test_paragraphs))
+        cache = ExtractionCache(self.cache_directory.name, max_size_bytes=entry_size * 2)
+        cache.put_paragraphs('first', self.test_paragraphs)
+        cache.put_paragraphs('second', self.test_paragraphs)
+        # make the first entry the oldest, then use the second one
+        os.utime(os.path.join(self.cache_directory.name, 'first.bin'), (0, 0))
+        cache.get_paragraphs('second')
+        cache.put_paragraphs('third', self.test_paragraphs)
+
+        self.assertIsNone(cache.get_paragraphs('first'))
+        self.assertIsNotNone(cache.get_paragraphs('second'))
+        self.assertIsNotNone(cache.get_paragraphs('third'))
+
+if __name__ == '__main__':
+    unittest.main()
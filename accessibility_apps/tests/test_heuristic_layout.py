@@ -0,0 +1,63 @@
+# ===================================================
+# File: test_heuristic_layout.py
+# Date: 10/18/2026
+# Description: Tests finding the layout of simple pdfs
+#   with heuristics.
+# ==================================================
+
+#! Run This test from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m unittest -v tests.test_heuristic_layout
+
+import unittest
+from utils.harvest.heuristic_layout import heuristic_layout, get_body_font_size, _get_text_box_type, _TextBoxInfo
+
+TEST_PDF = '../data/input/pdf_extractor_test.pdf'
+
+def _make_text_box(text:str, font_size:float, is_bold:bool=False) -> _TextBoxInfo:
+    '''Returns a text box with the lines of the text in a font size (already rounded to the half point).'''
+    text_box = _TextBoxInfo.__new__(_TextBoxInfo)
+    text_box.bbox = (0, 0, 100, 100)
+    text_box.lines = text.split('\n')
+    text_box.font_size = font_size
+    text_box.is_bold = is_bold
+    return text_box
+
+class HeuristicLayoutTests(unittest.TestCase):
+    '''Tests the heuristic layout.'''
+
+    def test_heuristic_layout(self):
+        '''Tests the layout and confidence of a simple pdf.'''
+        expected_layout_data = [
+            ('Title', 'This is a PDF'),
+            ('Text', 'This is information.'),
+            ('Text', 'Information continued.'),
+            ('Text', 'This is the end of the pdf.')
+        ]
+        layout_data, confidence = heuristic_layout(TEST_PDF)
+        self.assertEqual(layout_data, expected_layout_data)
+        self.assertEqual(confidence, 1.0)
+
+    def test_body_font_size(self):
+        '''Tests finding the font size most of the text is in.'''
+        text_boxes = [
+            _make_text_box('A Title', 27),
+            _make_text_box('Some body text', 12),
+            _make_text_box('More body text', 12)
+        ]
+        self.assertEqual(get_body_font_size(text_boxes), 12)
+        self.assertEqual(get_body_font_size([]), 0)
+
+    def test_fractional_body_font_size(self):
+        '''Tests that text a little bigger than a fractional body size (10.9pt, rounded to 11) isn't a title.'''
+        text_boxes = [
+            _make_text_box('Body text in a 10.9pt font\nover a couple of lines', 11),
+            _make_text_box('More body text in the same font', 11),
+            _make_text_box('Slightly larger text', 12.5),
+            _make_text_box('A Real Title', 13.5)
+        ]
+        body_font_size = get_body_font_size(text_boxes)
+        self.assertEqual(body_font_size, 11)
+        self.assertEqual([_get_text_box_type(text_box, body_font_size) for text_box in text_boxes], ['Text', 'Text', 'Text', 'Title'])
+
+if __name__ == '__main__':
+    unittest.main()
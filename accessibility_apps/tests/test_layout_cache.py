@@ -0,0 +1,72 @@
+# ===================================================
+# File: test_layout_cache.py
+# Date: 10/18/2026
+# Description: Tests caching the layout blocks of
+#   pages on disk.
+# ==================================================
+
+#! Run This test from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m unittest -v tests.test_layout_cache
+
+import tempfile
+import unittest
+from utils.harvest.layout_cache import LayoutCache, encode_page_layout, decode_page_layout
+from utils.harvest.layout_join import LayoutBlock
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class LayoutCacheTests(unittest.TestCase):
+    '''Tests the layout cache.'''
+
+    def setUp(self):
+        '''Sets up a temporary cache directory and the blocks of a page.'''
+        self.cache_directory = tempfile.TemporaryDirectory()
+        self.page_layout_data = [
+            ('Title', 'This is a PDF'),
+            ('Text', 'Ünïcode text\nover two lines'),
+            LayoutBlock('Figure', 'IMG DATA -- NOT ADDED', 3, (10.0, 20.5, 300.0, 400.25))
+        ]
+
+    def tearDown(self):
+        '''Removes the temporary cache directory.'''
+        self.cache_directory.cleanup()
+
+    def test_encode_and_decode(self):
+        '''Tests that page blocks come back the same after being encoded.'''
+        self.assertEqual(decode_page_layout(encode_page_layout(self.page_layout_data)), self.page_layout_data)
+        self.assertEqual(decode_page_layout(encode_page_layout([])), [])
+
+        # the bboxes are kept, and the page number comes from where the page is being read
+        decoded_blocks = decode_page_layout(encode_page_layout(self.page_layout_data), 7)
+        self.assertEqual([block.bbox for block in decoded_blocks], [None, None, (10.0, 20.5, 300.0, 400.25)])
+        self.assertEqual([block.page_number for block in decoded_blocks], [7, 7, 7])
+
+    def test_get_and_put(self):
+        '''Tests caching page blocks and the hit rate of the cache.'''
+        layout_cache = LayoutCache(self.cache_directory.name)
+        key = 'page-v1'
+        self.assertIsNone(layout_cache.get_page_layout(key))
+        layout_cache.put_page_layout(key, self.page_layout_data)
+        self.assertEqual(layout_cache.get_page_layout(key), self.page_layout_data)
+        self.assertEqual(layout_cache.get_stats()['hit_rate'], 0.5)
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_get_key(self):
+        '''Tests that the key of a page changes with its pixels, its settings, and its text layer.'''
+        layout_cache = LayoutCache(self.cache_directory.name)
+        page_image = np.zeros((20, 10, 3), dtype=np.uint8)
+        settings = {'dpi' : 200, 'use_text_layer' : True}
+        key = layout_cache.get_key(page_image, settings)
+        self.assertEqual(layout_cache.get_key(page_image.copy(), dict(settings)), key)
+        self.assertNotEqual(layout_cache.get_key(np.ones((20, 10, 3), dtype=np.uint8), settings), key)
+        self.assertNotEqual(layout_cache.get_key(page_image, {'dpi' : 300, 'use_text_layer' : True}), key)
+        # the same page with a different text layer
+        text_layer_key = layout_cache.get_key(page_image, settings, 'a' * 64)
+        self.assertNotIn(text_layer_key, (key, layout_cache.get_key(page_image, settings, 'b' * 64)))
+        self.assertEqual(layout_cache.get_key(page_image, settings, 'a' * 64), text_layer_key)
+
+if __name__ == '__main__':
+    unittest.main()
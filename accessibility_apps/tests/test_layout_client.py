@@ -0,0 +1,115 @@
+# ===================================================
+# File: test_layout_client.py
+# Date: 10/18/2026
+# Description: Tests encoding layouts and sending
+#   pages to a stub layout server over a temporary
+#   Unix socket.
+# ==================================================
+
+#! Run This test from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m unittest -v tests.test_layout_client
+
+import os
+import json
+import socket
+import tempfile
+import threading
+import unittest
+
+try:
+    import numpy as np
+    import layoutparser as lp
+    from utils.harvest.layout_client import LayoutServerClient, LayoutServerError, encode_layout, decode_layout
+except ImportError:
+    lp = None
+
+class _StubLayoutServer():
+    '''Answers each page with one block the size of the page, or never answers when `hang` is set.'''
+
+    def __init__(self, socket_path:str, hang:bool=False):
+        '''Listens on the socket and answers pages on a thread.'''
+        self.hang = hang
+        self.requests = []
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(socket_path)
+        self.listener.listen(1)
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        '''Answers the pages of one connection until it closes.'''
+        connection, _ = self.listener.accept()
+        with connection, connection.makefile('r', encoding='utf-8') as requests:
+            for line in requests:
+                request = json.loads(line)
+                self.requests.append(request)
+                if self.hang:
+                    continue
+                height, width = request['shape'][:2]
+                response = {'id' : request['id'], 'ok' : True, 'blocks' : [[0, 0, width, height, 'Text', 0.9]]}
+                connection.sendall((json.dumps(response) + '\n').encode('utf-8'))
+
+    def close(self):
+        '''Stops listening.'''
+        self.listener.close()
+
+@unittest.skipIf(lp is None, 'numpy and layoutparser are not installed')
+class LayoutClientTests(unittest.TestCase):
+    '''Tests the layout server client.'''
+
+    def setUp(self):
+        '''Makes a directory for the socket.'''
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.directory.name, 'layout.sock')
+
+    def tearDown(self):
+        '''Removes the socket's directory.'''
+        self.directory.cleanup()
+
+    def test_encode_decode(self):
+        '''Tests that a layout survives encoding and decoding.'''
+        layout = lp.Layout([
+            lp.TextBlock(lp.Rectangle(1.5, 2, 30, 40.25), type='Title', score=0.75),
+            lp.TextBlock(lp.Rectangle(0, 50, 100, 200), type='Figure', score=None)
+        ])
+        blocks = json.loads(json.dumps(encode_layout(layout)))
+        decoded_layout = decode_layout(blocks)
+        self.assertEqual([(block.coordinates, block.type, block.score) for block in decoded_layout],
+                         [((1.5, 2, 30, 40.25), 'Title', 0.75), ((0, 50, 100, 200), 'Figure', None)])
+
+    def test_detect_many(self):
+        '''Tests that every page is answered and its shared memory is freed.'''
+        server = _StubLayoutServer(self.socket_path)
+        client = LayoutServerClient(self.socket_path, timeout=10)
+        try:
+            layouts = client.detect_many([np.zeros((20, 10, 3), dtype=np.uint8), np.zeros((40, 30, 3), dtype=np.uint8)])
+        finally:
+            client.close()
+            server.close()
+        self.assertEqual([layout[0].coordinates for layout in layouts], [(0, 0, 10, 20), (0, 0, 30, 40)])
+        self.assertEqual(client._pending_pages, {})
+        for request in server.requests:
+            self.assertFalse(os.path.exists(os.path.join('/dev/shm', request['memory'])))
+
+    def test_timeout(self):
+        '''Tests that pages the server doesn't answer time out together and have their shared memory freed.'''
+        server = _StubLayoutServer(self.socket_path, hang=True)
+        client = LayoutServerClient(self.socket_path, timeout=0.2)
+        try:
+            with self.assertRaises(LayoutServerError):
+                client.detect_many([np.zeros((20, 10, 3), dtype=np.uint8) for _ in range(3)])
+            self.assertEqual(client._pending_pages, {})
+        finally:
+            client.close()
+            server.close()
+        self.assertEqual(len(server.requests), 3)
+        for request in server.requests:
+            self.assertFalse(os.path.exists(os.path.join('/dev/shm', request['memory'])))
+
+    def test_unreachable(self):
+        '''Tests that a missing server raises a layout server error.'''
+        client = LayoutServerClient(self.socket_path)
+        with self.assertRaises(LayoutServerError):
+            client.detect(np.zeros((20, 10, 3), dtype=np.uint8))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# ===================================================
+# File: test_layout_join.py
+# Date: 10/18/2026
+# Description: Tests locating layout blocks and
+#   joining them with the paragraphs inside them.
+# ==================================================
+
+#! Run This test from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m unittest -v tests.test_layout_join
+
+import pickle
+import random
+import unittest
+from utils.harvest.paragraph import Paragraph, ParagraphStore, FontStyle
+from utils.harvest.heuristic_layout import heuristic_layout
+from utils.harvest.pdf_extractor import extract_paragraphs_and_fonts_and_sizes
+from utils.harvest.layout_join import LayoutBlock, ParagraphIndex, join_blocks_to_paragraphs
+
+TEST_PDF = '../data/input/pdf_extractor_test.pdf'
+
+def _make_paragraph(text:str, page_number:int, bbox:tuple) -> Paragraph:
+    '''Returns a paragraph of plain text at a location.'''
+    return Paragraph([(text, FontStyle.STANDARD)], '12px', 'Helvetica', page_number, bbox)
+
+class LayoutJoinTests(unittest.TestCase):
+    '''Tests layout blocks and the paragraph index.'''
+
+    def test_layout_block(self):
+        '''Tests that layout blocks act like (type, data) tuples and keep their location.'''
+        block = LayoutBlock('Text', 'Some text', 2, [1, 2, 3, 4])
+        self.assertEqual(block, ('Text', 'Some text'))
+        block_type, data = block
+        self.assertEqual((block_type, data), (block.type, block.data))
+        self.assertEqual(block.bbox, (1, 2, 3, 4))
+        unpickled_block = pickle.loads(pickle.dumps(block))
+        self.assertEqual(unpickled_block, block)
+        self.assertEqual((unpickled_block.page_number, unpickled_block.bbox), (2, (1, 2, 3, 4)))
+
+    def test_queries(self):
+        '''Tests finding paragraphs by region, point, and block.'''
+        paragraphs = [
+            _make_paragraph('Top', 1, (50, 700, 550, 750)),
+            _make_paragraph('Left', 1, (50, 400, 290, 690)),
+            _make_paragraph('Right', 1, (310, 400, 550, 690)),
+            _make_paragraph('Next page', 2, (50, 700, 550, 750)),
+            Paragraph([('Nowhere', FontStyle.STANDARD)], '12px', 'Helvetica')
+        ]
+        paragraph_index = ParagraphIndex(ParagraphStore(paragraphs))
+        self.assertEqual([paragraph.get_raw_text() for paragraph in paragraph_index.query(1, (0, 500, 300, 720))], ['Top', 'Left'])
+        self.assertEqual([paragraph.get_raw_text() for paragraph in paragraph_index.query_point(1, 400, 500)], ['Right'])
+        self.assertEqual(paragraph_index.query_point(1, 300, 500), [])
+        self.assertEqual(paragraph_index.query(3, (0, 0, 600, 800)), [])
+
+        # a block takes the paragraphs whose centers are inside it, on its own page
+        self.assertEqual([paragraph.get_raw_text() for paragraph in paragraph_index.get_block_paragraphs(LayoutBlock('Text', '', 1, (40, 390, 560, 695)))], ['Left', 'Right'])
+        self.assertEqual([paragraph.get_raw_text() for paragraph in paragraph_index.get_block_paragraphs(LayoutBlock('Title', '', 2, (40, 690, 560, 760)))], ['Next page'])
+        self.assertEqual(paragraph_index.get_block_paragraphs(('Text', 'no location')), [])
+
+    def test_join_matches_brute_force(self):
+        '''Tests that joining many blocks with the index finds the same paragraphs as checking every pair.'''
+        generator = random.Random(7)
+        paragraphs = []
+        blocks = []
+        for page_number in range(1, 21):
+            for paragraph_number in range(100):
+                x0, y0 = generator.uniform(0, 550), generator.uniform(0, 750)
+                paragraphs.append(_make_paragraph(str(paragraph_number), page_number, (x0, y0, x0 + generator.uniform(5, 200), y0 + generator.uniform(5, 60))))
+            for _ in range(100):
+                x0, y0 = generator.uniform(0, 500), generator.uniform(0, 700)
+                blocks.append(LayoutBlock('Text', '', page_number, (x0, y0, x0 + generator.uniform(20, 300), y0 + generator.uniform(20, 200))))
+
+        def is_inside(paragraph, block):
+            x0, y0, x1, y1 = paragraph.bbox
+            block_x0, block_y0, block_x1, block_y1 = block.bbox
+            return paragraph.page_number == block.page_number and block_x0 <= (x0 + x1) / 2 <= block_x1 and block_y0 <= (y0 + y1) / 2 <= block_y1
+
+        expected = [[paragraph for paragraph in paragraphs if is_inside(paragraph, block)] for block in blocks]
+        self.assertEqual(join_blocks_to_paragraphs(blocks, paragraphs), expected)
+
+    def test_join_heuristic_layout(self):
+        '''Tests joining the blocks of a pdf's layout with its extracted paragraphs.'''
+        paragraphs = extract_paragraphs_and_fonts_and_sizes(TEST_PDF)
+        layout_blocks, _ = heuristic_layout(TEST_PDF)
+        block_paragraphs = join_blocks_to_paragraphs(layout_blocks, paragraphs)
+        self.assertEqual(len(block_paragraphs), len(layout_blocks))
+        for block, paragraphs_in_block in zip(layout_blocks, block_paragraphs):
+            self.assertEqual(block.page_number, 1)
+            self.assertEqual([paragraph.get_raw_text() for paragraph in paragraphs_in_block], [block.data])
+
+if __name__ == '__main__':
+    unittest.main()
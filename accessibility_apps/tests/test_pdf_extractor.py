@@ -10,7 +10,7 @@
 
 import unittest
 from utils.harvest.paragraph import *
-from utils.harvest.pdf_extractor import _get_font_style_delimeter, _get_font_style, _get_attributes, _convert_cid_str, extract_paragraphs_and_fonts_and_sizes, _get_exported_html_value
+from utils.harvest.pdf_extractor import _get_font_style_delimeter, _get_font_style, _get_attributes, _convert_cid_str, extract_paragraphs_and_fonts_and_sizes, _get_exported_html_value, iter_paragraphs, HTML_ENGINE, LAYOUT_ENGINE
 
 class PdfExtractionTests(unittest.TestCase):
     '''Tests pdf extraction functions.'''
@@ -100,12 +100,79 @@ class PdfExtractionTests(unittest.TestCase):
         self.assertEqual(p_1, p_3)
         self.assertNotEqual(p_1, p_2)
         self.assertNotEqual(p_3, p_4)
+
+    def test_paragraph_font_size(self):
+        '''Tests that font sizes are stored as numbers but still read back as strings.'''
+        paragraph = Paragraph([('This is information.', FontStyle.STANDARD)], '12px', 'Helvetica')
+        self.assertEqual(paragraph.font_size_value, 12)
+        self.assertEqual(paragraph.font_size, '12px')
+        self.assertEqual(paragraph, Paragraph([('This is information.', FontStyle.STANDARD)], 12, 'Helvetica'))
+
+    def test_paragraph_store(self):
+        '''Tests that the paragraphs in a columnar store behave like the paragraphs put in it.'''
+        store = ParagraphStore(self.test_paragraphs)
+        store.append(Paragraph([('Bold', FontStyle.BOLD), ('italic', FontStyle.ITALIC)], '10.5px', 'Georgia'))
+        self.assertEqual(len(store), 5)
+        for paragraph_1, paragraph_2 in zip(store, self.test_paragraphs):
+            self.assertEqual(paragraph_1, paragraph_2)
+            self.assertEqual(repr(paragraph_1), repr(paragraph_2))
+        self.assertEqual(store[-1].text_info, [('Bold', FontStyle.BOLD), ('italic', FontStyle.ITALIC)])
+        self.assertEqual(store[-1].get_raw_text(), 'Bold italic')
+        self.assertEqual(store[-1].font_size, '10.5px')
+        self.assertEqual(store.font_families, ['Helvetica', 'Georgia'])
     
     def test_extract_paragraphs_and_fonts_and_sizes(self):
         '''Tests extracting paragraphs from the html.'''
         for paragraph_1, paragraph_2 in zip(extract_paragraphs_and_fonts_and_sizes('../data/input/pdf_extractor_test.pdf'), self.test_paragraphs):
             self.assertEqual(paragraph_1, paragraph_2)
 
+    def test_extraction_engines_match(self):
+        '''Tests that walking the layout objects gives the same paragraphs as parsing the html.'''
+        html_paragraphs = extract_paragraphs_and_fonts_and_sizes('../data/input/pdf_extractor_test.pdf', HTML_ENGINE)
+        layout_paragraphs = extract_paragraphs_and_fonts_and_sizes('../data/input/pdf_extractor_test.pdf', LAYOUT_ENGINE)
+        self.assertEqual(len(html_paragraphs), len(layout_paragraphs))
+        for paragraph_1, paragraph_2 in zip(html_paragraphs, layout_paragraphs):
+            self.assertEqual(paragraph_1, paragraph_2)
+
+    def test_parallel_extraction(self):
+        '''Tests that extracting ranges of pages in parallel keeps the paragraphs in page order.'''
+        paragraphs = extract_paragraphs_and_fonts_and_sizes('../data/output/example.pdf')
+        parallel_paragraphs = extract_paragraphs_and_fonts_and_sizes('../data/output/example.pdf', workers=2, pages_per_chunk=1)
+        self.assertEqual(len(paragraphs), len(parallel_paragraphs))
+        for paragraph_1, paragraph_2 in zip(paragraphs, parallel_paragraphs):
+            self.assertEqual(paragraph_1, paragraph_2)
+
+    def test_paragraph_locations(self):
+        '''Tests that paragraphs extracted from the layout know their page and bbox, also when extracted in parallel.'''
+        paragraphs = extract_paragraphs_and_fonts_and_sizes('../data/input/pdf_extractor_test.pdf')
+        self.assertEqual([paragraph.page_number for paragraph in paragraphs], [1, 1, 1, 1])
+        # the title is above the rest of the text (pdf coordinates go up the page)
+        self.assertGreater(paragraphs[0].bbox[1], paragraphs[1].bbox[3])
+        for paragraph in paragraphs:
+            x0, y0, x1, y1 = paragraph.bbox
+            self.assertLess(x0, x1)
+            self.assertLess(y0, y1)
+
+        parallel_paragraphs = extract_paragraphs_and_fonts_and_sizes('../data/output/example.pdf', workers=2, pages_per_chunk=1)
+        page_numbers = [paragraph.page_number for paragraph in parallel_paragraphs]
+        self.assertEqual(page_numbers, sorted(page_numbers))
+        self.assertEqual(page_numbers[0], 1)
+        self.assertEqual([paragraph.page_number for paragraph in extract_paragraphs_and_fonts_and_sizes('../data/output/example.pdf')], page_numbers)
+
+        store = ParagraphStore(paragraphs)
+        store.append(Paragraph([('No location', FontStyle.STANDARD)], '12px', 'Helvetica'))
+        self.assertEqual([paragraph.bbox for paragraph in store][:-1], [paragraph.bbox for paragraph in paragraphs])
+        self.assertEqual(store[0].page_number, 1)
+        self.assertIsNone(store[-1].page_number)
+        self.assertIsNone(store[-1].bbox)
+
+    def test_iter_paragraphs(self):
+        '''Tests streaming the paragraphs one page at a time.'''
+        paragraph_generator = iter_paragraphs('../data/input/pdf_extractor_test.pdf')
+        self.assertEqual(next(paragraph_generator), self.test_paragraphs[0])
+        for paragraph_1, paragraph_2 in zip(paragraph_generator, self.test_paragraphs[1:]):
+            self.assertEqual(paragraph_1, paragraph_2)
+
     def test_export_html(self):
         '''Tests the data of exporting an html.'''
         html_result_value = _get_exported_html_value(self.test_paragraphs)
@@ -113,5 +180,36 @@ class PdfExtractionTests(unittest.TestCase):
         html_lines = [line.strip() for line in html_result_value.splitlines()]
         self.assertEqual(html_lines, self.test_html_value)
 
+    def test_export_html_css_classes(self):
+        '''Tests that each distinct font gets one css class when exporting an html with css classes.'''
+        html_result_value = _get_exported_html_value(self.test_paragraphs, css_classes=True)
+        html_lines = [line.strip() for line in html_result_value.splitlines()]
+        self.assertEqual(html_lines[3:7], [
+            '<style>',
+            '.f0 {font-size:27px; font-family:Helvetica}',
+            '.f1 {font-size:12px; font-family:Helvetica}',
+            '</style>'
+        ])
+        self.assertEqual(html_lines.count('<div class="f1">'), 3)
+        self.assertNotIn('style=', html_result_value)
+
+        # streamed paragraphs get their style block at the end of the body instead
+        streamed_html_lines = [line.strip() for line in _get_exported_html_value(iter(self.test_paragraphs), css_classes=True).splitlines()]
+        self.assertEqual(streamed_html_lines[-6:], html_lines[3:7] + ['</body>', '</html>'])
+
+    def test_export_html_escaping(self):
+        '''Tests that text and font names are escaped when exporting an html.'''
+        paragraph = Paragraph([('x < y & z', FontStyle.BOLD_ITALIC)], '12px', 'Odd"Font')
+        html_result_value = _get_exported_html_value([paragraph], pretty=False)
+        self.assertEqual(html_result_value.splitlines()[5:12], [
+            '<div style="font-size:12px">',
+            '<p style="font-family:Odd&quot;Font">',
+            '<strong>',
+            '<em>',
+            'x &lt; y &amp; z',
+            '</em>',
+            '</strong>'
+        ])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,87 @@
+# ===================================================
+# File: test_pdf_metadata.py
+# Date: 10/18/2026
+# Description: Tests setting pdf metadata with an
+#   incremental update.
+# ==================================================
+
+#! Run This test from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m unittest -v tests.test_pdf_metadata
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from PyPDF2 import PdfReader
+from utils.export.pdf_metadata import add_metadata_to_pdf_bytes, add_metadata_to_pdf_file
+
+TEST_PDF = '../data/input/pdf_extractor_test.pdf'
+
+TEST_METADATA = {
+    '/Author' : 'Trent Bultsma, Reagan Kelley',
+    '/Title' : 'A (Parenthesized) Title \\ With a Backslash',
+    '/Subject' : 'Ünïcode subject',
+    '/Creator' : 'WSU Library Accessibilty App',
+    '/Keywords' : 'Pdf; Information'
+}
+
+def _create_xref_stream_pdf() -> bytes:
+    '''Returns a single page pdf that uses a cross-reference stream instead of a cross-reference table.'''
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 200 200] >>'
+    ]
+    pdf = b'%PDF-1.5\n'
+    offsets = []
+    for object_number, pdf_object in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += str(object_number).encode('ascii') + b' 0 obj\n' + pdf_object + b'\nendobj\n'
+    xref_offset = len(pdf)
+    entries = bytes([0, 0, 0, 0, 0, 255, 255])
+    for offset in offsets + [xref_offset]:
+        entries += bytes([1]) + offset.to_bytes(4, 'big') + bytes(2)
+    pdf += b'4 0 obj\n<< /Type /XRef /Size 5 /Root 1 0 R /W [1 4 2] /Length ' + str(len(entries)).encode('ascii') + b' >>\nstream\n'
+    pdf += entries + b'\nendstream\nendobj\nstartxref\n' + str(xref_offset).encode('ascii') + b'\n%%EOF\n'
+    return pdf
+
+class PdfMetadataTests(unittest.TestCase):
+    '''Tests the incremental update pdf metadata writer.'''
+
+    def assertMetadataMatches(self, pdf_bytes: bytes, page_count: int):
+        '''Checks that the pdf has the test metadata and the expected number of pages.'''
+        reader = PdfReader(io.BytesIO(pdf_bytes))
+        self.assertEqual(len(reader.pages), page_count)
+        for name, value in TEST_METADATA.items():
+            self.assertEqual(reader.metadata[name], value)
+
+    def test_add_metadata_to_pdf_bytes(self):
+        '''Tests that metadata is appended to a pdf without changing the existing bytes.'''
+        with open(TEST_PDF, 'rb') as pdf_file:
+            pdf_bytes = pdf_file.read()
+        updated_pdf_bytes = add_metadata_to_pdf_bytes(pdf_bytes, TEST_METADATA)
+        self.assertTrue(updated_pdf_bytes.startswith(pdf_bytes))
+        self.assertMetadataMatches(updated_pdf_bytes, 1)
+
+        # updating again replaces the metadata from the first update
+        updated_pdf_bytes = add_metadata_to_pdf_bytes(updated_pdf_bytes, dict(TEST_METADATA, **{'/Title' : 'Second'}))
+        self.assertEqual(PdfReader(io.BytesIO(updated_pdf_bytes)).metadata['/Title'], 'Second')
+
+    def test_add_metadata_to_pdf_file(self):
+        '''Tests appending metadata to a pdf file in place.'''
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            pdf_file_path = os.path.join(temporary_directory, 'test.pdf')
+            shutil.copy(TEST_PDF, pdf_file_path)
+            add_metadata_to_pdf_file(pdf_file_path, TEST_METADATA)
+            with open(pdf_file_path, 'rb') as pdf_file:
+                self.assertMetadataMatches(pdf_file.read(), 1)
+
+    def test_add_metadata_to_xref_stream_pdf(self):
+        '''Tests that pdfs with cross-reference streams get a cross-reference stream update.'''
+        updated_pdf_bytes = add_metadata_to_pdf_bytes(_create_xref_stream_pdf(), TEST_METADATA)
+        self.assertIn(b'/Type /XRef\n/Size 7', updated_pdf_bytes)
+        self.assertMetadataMatches(updated_pdf_bytes, 1)
+
+if __name__ == '__main__':
+    unittest.main()
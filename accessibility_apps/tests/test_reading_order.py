@@ -0,0 +1,67 @@
+# ===================================================
+# File: test_reading_order.py
+# Date: 10/18/2026
+# Description: Tests ordering the blocks of a page for
+#   reading with a recursive XY-cut.
+# ==================================================
+
+#! Run This test from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m unittest -v tests.test_reading_order
+
+import random
+import unittest
+from utils.harvest.reading_order import get_reading_order
+
+class ReadingOrderTests(unittest.TestCase):
+    '''Tests the reading order of page blocks.'''
+
+    def test_single_column(self):
+        '''Tests that a single column is read top to bottom.'''
+        self.assertEqual(get_reading_order([]), [])
+        self.assertEqual(get_reading_order([(50, 300, 550, 400), (50, 20, 550, 100), (60, 150, 540, 250)]), [1, 2, 0])
+
+    def test_columns(self):
+        '''Tests that columns whose paragraphs line up are read one after the other, and that blocks spanning the
+        columns split the page into bands.'''
+        bboxes = [
+            (310, 80, 550, 200),  # right column, first band
+            (50, 20, 550, 60),    # title
+            (50, 220, 290, 300),  # left column, first band
+            (50, 80, 290, 200),   # left column, first band
+            (310, 220, 550, 300), # right column, first band
+            (50, 320, 550, 500),  # figure spanning the columns
+            (310, 520, 550, 600), # right column, second band
+            (50, 520, 290, 600)   # left column, second band
+        ]
+        self.assertEqual(get_reading_order(bboxes), [1, 3, 2, 0, 4, 5, 7, 6])
+
+        # three columns of staggered paragraphs
+        bboxes = [(x0, y0, x0 + 150, y0 + 90) for y0 in (20, 130, 240) for x0 in (40, 220, 400)]
+        self.assertEqual(get_reading_order(bboxes), [0, 3, 6, 1, 4, 7, 2, 5, 8])
+
+    def test_min_gap(self):
+        '''Tests that gaps smaller than the smallest gap don't cut the page, and overlapping blocks are read by their top.'''
+        bboxes = [(50, 20, 298, 100), (302, 20, 550, 100), (50, 110, 298, 200), (302, 110, 550, 200)]
+        self.assertEqual(get_reading_order(bboxes), [0, 2, 1, 3])
+        self.assertEqual(get_reading_order(bboxes, min_gap=10), [0, 1, 2, 3])
+        self.assertEqual(get_reading_order([(0, 10, 100, 100), (50, 0, 150, 90)]), [1, 0])
+
+    def test_random_pages(self):
+        '''Tests that every block of random pages is read once, in the order of generated columns.'''
+        generator = random.Random(3)
+        for _ in range(20):
+            column_count = generator.randint(1, 4)
+            bboxes = []
+            for column in range(column_count):
+                y0 = generator.uniform(0, 20)
+                while y0 < 1000:
+                    height = generator.uniform(10, 80)
+                    bboxes.append((column * 150, y0, column * 150 + 140, y0 + height))
+                    y0 += height + generator.uniform(1, 10)
+            shuffled_ids = list(range(len(bboxes)))
+            generator.shuffle(shuffled_ids)
+            order = get_reading_order([bboxes[i] for i in shuffled_ids])
+            self.assertEqual([shuffled_ids[i] for i in order], list(range(len(bboxes))))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+# ===================================================
+# File: test_text_layer.py
+# Date: 10/18/2026
+# Description: Tests the spatial index and reading
+#   the text of page regions from the text layer.
+# ==================================================
+
+#! Run This test from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m unittest -v tests.test_text_layer
+
+import unittest
+from utils.harvest.spatial_index import GridIndex
+from utils.harvest.text_layer import iter_page_text_layers, is_text_usable, PageTextLayerReader
+
+TEST_PDF = '../data/input/pdf_extractor_test.pdf'
+
+class SpatialIndexTests(unittest.TestCase):
+    '''Tests the grid spatial index.'''
+
+    def setUp(self):
+        '''Sets up an index with boxes in and across several cells.'''
+        self.index = GridIndex(cell_size=10)
+        self.index.insert((0, 0, 5, 5), 'a')
+        self.index.insert((8, 8, 25, 12), 'b')
+        self.index.insert((40, 40, 45, 45), 'c')
+        self.index.insert((-15, 2, -11, 4), 'd')
+
+    def test_query(self):
+        '''Tests finding the boxes that overlap a region, in insertion order.'''
+        self.assertEqual(self.index.query((4, 4, 9, 9)), ['a', 'b'])
+        self.assertEqual(self.index.query((20, 0, 30, 30)), ['b'])
+        self.assertEqual(self.index.query((-20, 0, 50, 50)), ['a', 'b', 'c', 'd'])
+        self.assertEqual(self.index.query((5, 5, 8, 8)), [])
+        self.assertEqual(len(self.index), 4)
+
+    def test_query_centers(self):
+        '''Tests finding the boxes whose centers are in a region.'''
+        self.assertEqual(self.index.query_centers((0, 0, 10, 10)), ['a'])
+        self.assertEqual(self.index.query_centers((10, 5, 20, 15)), ['b'])
+        self.assertEqual(self.index.query_centers((-20, 0, 0, 10)), ['d'])
+
+class TextLayerTests(unittest.TestCase):
+    '''Tests reading text from the text layer of a pdf.'''
+
+    def test_page_text(self):
+        '''Tests reading the text of a whole page and of a region of it on a page image.'''
+        text_layers = list(iter_page_text_layers(TEST_PDF))
+        self.assertEqual(len(text_layers), 1)
+        text_layer = text_layers[0]
+        self.assertEqual(text_layer.get_text(text_layer.bbox), 'This is a PDF\nThis is information.\nInformation continued.\nThis is the end of the pdf.')
+        # the top of the page rasterized at 200 dpi
+        self.assertEqual(text_layer.get_image_block_text((0, 0, 1654, 400), 200), 'This is a PDF\nThis is information.')
+        self.assertEqual(text_layer.get_image_block_text((0, 2000, 1654, 2339), 200), '')
+
+    def test_page_text_layer_reader(self):
+        '''Tests reading the text layers of pages in order, skipping the ones that aren't needed.'''
+        text_layer_reader = PageTextLayerReader(TEST_PDF)
+        text_layer = text_layer_reader.read_next_page()
+        self.assertEqual(text_layer.get_text(text_layer.bbox), next(iter_page_text_layers(TEST_PDF)).get_text(text_layer.bbox))
+        self.assertEqual(text_layer.get_hash(), next(iter_page_text_layers(TEST_PDF)).get_hash())
+        self.assertIsNone(text_layer_reader.read_next_page())
+        text_layer_reader.close()
+
+        text_layer_reader = PageTextLayerReader(TEST_PDF)
+        self.assertIsNone(text_layer_reader.read_next_page(lay_out=False))
+        self.assertIsNone(text_layer_reader.read_next_page())
+        text_layer_reader.close()
+
+    def test_get_hash(self):
+        '''Tests that the hash of a text layer changes when its characters do.'''
+        text_layer = next(iter_page_text_layers(TEST_PDF))
+        page_hash = text_layer.get_hash()
+        text_layer.index.insert((10, 10, 20, 20), (99, 'x'))
+        self.assertNotEqual(text_layer.get_hash(), page_hash)
+
+    def test_is_text_usable(self):
+        '''Tests detecting missing and garbled text.'''
+        self.assertTrue(is_text_usable('This is a PDF'))
+        self.assertFalse(is_text_usable(' \n '))
+        self.assertFalse(is_text_usable('(cid:72)(cid:101)(cid:108)lo'))
+        self.assertFalse(is_text_usable('\ufffd\ufffd\ufffdllo'))
+
+if __name__ == '__main__':
+    unittest.main()
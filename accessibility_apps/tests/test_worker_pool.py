@@ -0,0 +1,104 @@
+# ===================================================
+# File: test_worker_pool.py
+# Date: 10/18/2026
+# Description: Tests running tasks in workers forked
+#   from a preloaded fork server.
+# ==================================================
+
+#! Run This test from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m unittest -v tests.test_worker_pool
+
+import os
+import sys
+import unittest
+import subprocess
+import multiprocessing
+from utils.worker_pool import PreloadedWorkerPool, get_unique_memory_bytes, _claim_worker_slot, APP_DIRECTORY
+
+# the process that imported this module, which is the fork server for workers it was preloaded into
+IMPORTING_PID = os.getpid()
+
+# the name the fork server imports this module by, relative to the app's folder like the app's modules (which
+# isn't always its __name__, like under pytest)
+PRELOAD_MODULE_NAME = os.path.splitext(os.path.relpath(os.path.abspath(__file__), APP_DIRECTORY))[0].replace(os.sep, '.')
+
+# starts a pool from the repository root the way run_application.bat starts the app (with the app's folder on the
+# module search path of the program, but not the working directory) and prints the modules it didn't preload
+REPO_ROOT_POOL_SCRIPT = """
+import sys
+sys.path.insert(0, {!r})
+from utils.worker_pool import PreloadedWorkerPool
+with PreloadedWorkerPool(1, preload_modules=['utils.disk_cache']) as pool:
+    print(pool.get_missing_preload_modules())
+""".format(APP_DIRECTORY)
+
+def _get_importing_pid() -> tuple:
+    '''Returns the pid of the process that imported the preloaded copy of this module and the pid of the worker.'''
+    preloaded_module = sys.modules.get(PRELOAD_MODULE_NAME)
+    return None if preloaded_module is None else preloaded_module.IMPORTING_PID, os.getpid()
+
+def _add(a:int, b:int) -> int:
+    '''Returns the sum of two numbers.'''
+    return a + b
+
+class WorkerPoolTests(unittest.TestCase):
+    '''Tests the preloaded worker pool.'''
+
+    def test_results(self):
+        '''Tests that tasks return their results and record the memory of the workers that ran them.'''
+        with PreloadedWorkerPool(2, preload_modules=[PRELOAD_MODULE_NAME]) as pool:
+            futures = [pool.submit(_add, number, b=1) for number in range(10)]
+            self.assertEqual([future.result() for future in futures], list(range(1, 11)))
+            worker_memory = pool.get_worker_memory()
+        self.assertEqual(sum([worker['task_count'] for worker in worker_memory.values()]), 10)
+        for worker in worker_memory.values():
+            self.assertGreater(worker['uss_bytes'], 0)
+            self.assertGreaterEqual(worker['peak_uss_bytes'], worker['uss_bytes'])
+
+    @unittest.skipUnless('forkserver' in multiprocessing.get_all_start_methods(), 'fork servers are not supported')
+    def test_preloaded_modules(self):
+        '''Tests that workers get the preloaded modules from the fork server instead of importing them, and that
+        workers are replaced after their tasks.'''
+        with PreloadedWorkerPool(1, max_tasks_per_worker=1, preload_modules=[PRELOAD_MODULE_NAME]) as pool:
+            results = [pool.submit(_get_importing_pid).result() for _ in range(3)]
+            self.assertEqual(pool.get_missing_preload_modules(), [])
+        importing_pids = set([importing_pid for importing_pid, _ in results])
+        worker_pids = set([worker_pid for _, worker_pid in results])
+        self.assertEqual(len(importing_pids), 1)
+        self.assertNotIn(None, importing_pids)
+        self.assertNotIn(os.getpid(), importing_pids)
+        self.assertTrue(importing_pids.isdisjoint(worker_pids))
+        self.assertEqual(len(worker_pids), 3)
+
+    @unittest.skipUnless('forkserver' in multiprocessing.get_all_start_methods(), 'fork servers are not supported')
+    def test_preload_from_repo_root(self):
+        '''Tests that the fork server preloads the app's modules when the app isn't run from its own folder.'''
+        environment = dict(os.environ)
+        environment.pop('PYTHONPATH', None)
+        result = subprocess.run([sys.executable, '-c', REPO_ROOT_POOL_SCRIPT], cwd=os.path.dirname(APP_DIRECTORY), env=environment,
+                                capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '[]')
+
+    def test_claim_worker_slot(self):
+        '''Tests that workers take the slots (shares of the cpus) of workers that are no longer running.'''
+        worker_pids = multiprocessing.Array('i', 2)
+        self.assertEqual(_claim_worker_slot(worker_pids), 0)
+        self.assertEqual(_claim_worker_slot(worker_pids), 1)
+        # every slot is held by a running process
+        self.assertEqual(_claim_worker_slot(worker_pids), os.getpid() % 2)
+        finished_process = subprocess.Popen([sys.executable, '-c', 'pass'])
+        finished_process.wait()
+        worker_pids[0] = finished_process.pid
+        self.assertEqual(_claim_worker_slot(worker_pids), 0)
+        self.assertEqual(list(worker_pids), [os.getpid(), os.getpid()])
+
+    def test_unique_memory(self):
+        '''Tests reading the unique memory of this process.'''
+        if not os.path.exists('/proc/self/smaps'):
+            self.skipTest('/proc is not available')
+        self.assertGreater(get_unique_memory_bytes(), 0)
+        self.assertEqual(get_unique_memory_bytes(-1), 0)
+
+if __name__ == '__main__':
+    unittest.main()
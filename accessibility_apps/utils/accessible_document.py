@@ -19,14 +19,17 @@ class AccessibleDocument(Document):
         Document (Document): Parent Class
     """
 
-    def __init__(self, file_path:str, delete_on_fail=False):
+    def __init__(self, file_path:str, delete_on_fail=False, stream_paragraphs=False, extraction_cache=None, layout_cache=None):
         """Create a new instance of AccessibleDocument.
 
         Args:
             file_path (string): The path name of the PDF that will be processed.
             delete_on_fail (bool): Whether to delete the document at the specified path if it fails to open.
+            stream_paragraphs (bool): Whether to extract the paragraphs page by page each time they are used.
+            extraction_cache (ExtractionCache): A cache of previously extracted paragraphs to check before extracting them.
+            layout_cache (LayoutCache): A cache of the layout blocks of previously parsed pages to check before parsing a page.
         """
-        super().__init__(file_path, delete_on_fail)
+        super().__init__(file_path, delete_on_fail, stream_paragraphs, extraction_cache, layout_cache)
 
     # Last Edit By: Reagan Kelley
     # * Edit Details: Initial implementation
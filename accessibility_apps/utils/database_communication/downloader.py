@@ -9,6 +9,7 @@
 import requests
 from xml.etree import ElementTree
 from utils.accessible_document import AccessibleDocument
+from utils.export.export_manifest import ExportManifest
 
 REPOSITORY_URL = "https://na01.alma.exlibrisgroup.com/view/oai/01ALLIANCE_WSU/request"
 OAI_STANDARD_PREFIX = ".//{http://www.openarchives.org/OAI/2.0/}"
@@ -18,13 +19,18 @@ DOCUMENT_IDENTIFIER_PREFIX = "oai:alma.01ALLIANCE_WSU:"
 class DocumentDownloader():
     """Provides a stream of documents from the WSU research exchange repository."""
 
-    def __init__(self, download_path:str):
+    def __init__(self, download_path:str, export_manifest:ExportManifest=None, skip_exported:bool=False):
         """Initializes the stream of documents.
         
         Args:
             download_path (str): the path of the folder to download new documents to.
+            export_manifest (ExportManifest): The manifest of exported documents, or `None` if there isn't one.
+            skip_exported (bool): Whether to skip documents in the export manifest instead of downloading them again.
+                Off by default, since documents are often processed again after changing the pipeline.
         """
         self.download_path = download_path
+        self.export_manifest = export_manifest
+        self.skip_exported = skip_exported
         self.resumption_token = None
         self.identifiers = self._get_identifier_batch()
         # for keeping track of the id of the previous document 
@@ -69,17 +75,22 @@ class DocumentDownloader():
     def _get_next_identifier(self) -> str:
         """Gets the identifier for the next document from the repository."""
 
-        # refill the identifier list if it is empty
-        if len(self.identifiers) == 0:
-            self.identifiers = self._get_identifier_batch()
-        
-        # at this point, we have run out of documents
-        if len(self.identifiers) == 0:
-            return None
-
-        # take note of the identifier and return it off the identifiers list
-        self.previous_document_identifier = self.identifiers.pop()
-        return self.previous_document_identifier
+        while True:
+            # refill the identifier list if it is empty
+            if len(self.identifiers) == 0:
+                self.identifiers = self._get_identifier_batch()
+            
+            # at this point, we have run out of documents
+            if len(self.identifiers) == 0:
+                return None
+
+            # take note of the identifier and return it off the identifiers list
+            self.previous_document_identifier = self.identifiers.pop()
+
+            # skip documents that have already been exported rather than downloading them again (if asked to)
+            if self.skip_exported and self.export_manifest is not None and self.export_manifest.contains(self.previous_document_identifier[len(DOCUMENT_IDENTIFIER_PREFIX):]):
+                continue
+            return self.previous_document_identifier
 
     def get_next_document(self, delete_on_fail:bool=False, document_identifier_number:str=None):
         """Returns a Document object for the next document in the repository.
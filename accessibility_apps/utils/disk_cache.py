@@ -0,0 +1,122 @@
+# ===================================================
+# File: disk_cache.py
+# Date: 10/18/2026
+# Description: A size-capped on-disk cache of byte
+#   values with least recently used eviction.
+# ==================================================
+
+import os
+import threading
+from uuid import uuid4
+
+# the default size cap of a cache (1 GB)
+DEFAULT_MAX_SIZE_BYTES = 1024 * 1024 * 1024
+
+# the file extension of cache entries
+ENTRY_EXTENSION = ".bin"
+
+class DiskCache():
+    """Stores byte values in files named by their key within a directory. When the files take up more than
+    the size cap, the least recently used ones are removed. Entries are written atomically so multiple
+    processes can share a cache directory."""
+
+    def __init__(self, cache_directory:str, max_size_bytes:int=DEFAULT_MAX_SIZE_BYTES):
+        """Initializes the cache, creating the directory if needed.
+
+        Args:
+            cache_directory (str): The directory to store the cache entries in.
+            max_size_bytes (int): The most bytes the entries can take up before old ones are evicted.
+        """
+        self.cache_directory = cache_directory
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_directory, exist_ok=True)
+
+    def _get_entry_path(self, key:str) -> str:
+        """Returns the path of the file storing the entry for a key."""
+        return os.path.join(self.cache_directory, key + ENTRY_EXTENSION)
+
+    def get(self, key:str) -> bytes:
+        """Returns the value stored for a key, or `None` if it is not in the cache.
+
+        Args:
+            key (str): The key of the entry, which must be usable as a file name.
+        """
+        entry_path = self._get_entry_path(key)
+        try:
+            with open(entry_path, "rb") as entry_file:
+                value = entry_file.read()
+            # mark the entry as recently used
+            os.utime(entry_path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key:str, value:bytes):
+        """Stores the value for a key, then evicts the least recently used entries if over the size cap.
+
+        Args:
+            key (str): The key of the entry, which must be usable as a file name.
+            value (bytes): The value to store.
+        """
+        # write to a temporary file first so readers never see a partially written entry
+        temporary_path = os.path.join(self.cache_directory, ".tmp-" + uuid4().hex)
+        with open(temporary_path, "wb") as temporary_file:
+            temporary_file.write(value)
+        os.replace(temporary_path, self._get_entry_path(key))
+
+        self._evict()
+
+    def _evict(self):
+        """Removes the least recently used entries until the cache is within its size cap."""
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.cache_directory):
+            if entry.name.endswith(ENTRY_EXTENSION):
+                try:
+                    entry_stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry_stat.st_mtime, entry_stat.st_size, entry.path))
+                total_size += entry_stat.st_size
+
+        if total_size <= self.max_size_bytes:
+            return
+
+        # remove the oldest entries first
+        entries.sort()
+        for _, entry_size, entry_path in entries:
+            if total_size <= self.max_size_bytes:
+                break
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                # another process already removed it
+                pass
+            total_size -= entry_size
+
+    def get_stats(self) -> dict:
+        """Returns the hit and miss counts of this cache object along with the number and size of the stored entries."""
+        entry_count = 0
+        size_bytes = 0
+        for entry in os.scandir(self.cache_directory):
+            if entry.name.endswith(ENTRY_EXTENSION):
+                entry_count += 1
+                size_bytes += entry.stat().st_size
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits" : self.hits,
+                "misses" : self.misses,
+                "hit_rate" : self.hits / lookups if lookups > 0 else 0.0,
+                "entries" : entry_count,
+                "size_bytes" : size_bytes
+            }
@@ -5,15 +5,18 @@
 
 # * Modules
 import os
-import csv
 from sys import platform
 from yake import KeywordExtractor
 from PyPDF2 import PdfReader, PdfWriter
 
-from utils.harvest.pdf_extractor import export_to_html
-from utils.export.document_exporter import export_document_to_pdf
-from utils.harvest.pdf_extractor import extract_paragraphs_and_fonts_and_sizes
-from utils.harvest.document_layout import document_layout
+from utils.harvest.pdf_extractor import export_to_html, export_to_html_str
+from utils.export.document_exporter import export_document_to_pdf, export_html_to_pdf_bytes
+from utils.export.pdf_metadata import add_metadata_to_pdf_bytes, add_metadata_to_pdf_file, MetadataUpdateError
+from utils.export.export_manifest import get_export_manifest
+from utils.harvest.pdf_extractor import extract_paragraphs_and_fonts_and_sizes, ParagraphStream
+from utils.harvest.document_layout import document_layout_with_fast_path
+from utils.harvest.model_registry import get_model_registry
+from utils.harvest.layout_join import join_blocks_to_paragraphs
 
 # Last Edit By: Trent Bultsma
 # * Edit Details: Use the pdf_extractor to extract and export data.
@@ -22,15 +25,22 @@ class Document:
     """
     # Last Edit By: Trent Bultsma
     # * Edit Details: Use the pdf_extractor to extract and export data.
-    def __init__(self, file_path:str, delete_on_fail=False):
+    def __init__(self, file_path:str, delete_on_fail=False, stream_paragraphs=False, extraction_cache=None, layout_cache=None):
         """Create instance of Document class object.
 
         Args:
             file_path (string): The path name of the PDF that will be processed.
             delete_on_fail (bool): Whether to delete the document at the specified path if it fails to open.
+            stream_paragraphs (bool): Whether to extract the paragraphs page by page each time they are used
+                instead of keeping them all in memory, which trades extraction time for memory on large documents.
+            extraction_cache (ExtractionCache): A cache of previously extracted paragraphs to check before extracting them.
+            layout_cache (LayoutCache): A cache of the layout blocks of previously parsed pages to check before parsing a page.
         """
         self.file_path = file_path
         self.paragraphs = []
+        self.stream_paragraphs = stream_paragraphs
+        self.extraction_cache = extraction_cache
+        self.layout_cache = layout_cache
 
         # setup metadata values
         self.author = ""
@@ -80,18 +90,31 @@ class Document:
         # make sure the file is a pdf
         if file_path is not None and file_path.lower().endswith(".pdf"):
             
-            # extract the data
-            self.paragraphs = extract_paragraphs_and_fonts_and_sizes(file_path)
+            # extract the data (or set it up to be extracted as it is used)
+            if self.stream_paragraphs:
+                self.paragraphs = ParagraphStream(file_path)
+            elif self.extraction_cache is not None:
+                # only extract the data when it is not cached already
+                cache_key = self.extraction_cache.get_key(file_path)
+                self.paragraphs = self.extraction_cache.get_paragraphs(cache_key)
+                if self.paragraphs is None:
+                    self.paragraphs = extract_paragraphs_and_fonts_and_sizes(file_path)
+                    self.extraction_cache.put_paragraphs(cache_key, self.paragraphs)
+            else:
+                self.paragraphs = extract_paragraphs_and_fonts_and_sizes(file_path)
             
             # calculate the keywords
             self.keywords = self._calculate_keywords()
 
             # get the layout of the document for tagging (it is ordered and includes tag type and data)
             if platform == "linux" or platform == "linux2":
-                self.layout_blocks = document_layout(self.file_path, True)
+                # simple documents are laid out with heuristics, and the rest with the layout model and OCR agent shared by every document in the process
+                self.layout_blocks, self.layout_path, self.layout_confidence = document_layout_with_fast_path(self.file_path, True, model_registry=get_model_registry(), layout_cache=self.layout_cache)
             else:
                 print("Layout Parsing Skipped: Non-Linux distributions not yet supported...")
                 self.layout_blocks = []
+                self.layout_path = None
+                self.layout_confidence = None
         else:
             raise ValueError("Invalid file path, must be a pdf file")
 
@@ -105,40 +128,55 @@ class Document:
 
     # Last Edit By: Trent Bultsma
     # * Edit Details: Use the pdf_extractor to extract and export data.
-    def export_document(self, pdf_file_path):
+    def export_document(self, pdf_file_path, in_memory=None, export_manifest=None):
         """ Transforms the metadata from codable data structures back into a usable and readable
             format: HTML
 
             Args:
                 pdf_file_path (string): The path name of the pdf doc to be exported.
+                in_memory (bool): Whether to pipe the html straight to the pdf renderer and get the pdf back
+                    so the pdf is the only file written. Otherwise the html goes through a temporary file.
+                    Defaults to piping unless the paragraphs are streamed, since the renderer needs the whole
+                    html at once and streamed paragraphs would otherwise all end up in memory as html.
+                export_manifest (ExportManifest): The manifest to record the export in. Defaults to the shared
+                    manifest of the folder the pdf is exported to.
         """
-        html_file_path = pdf_file_path[:-len("pdf")] + "html"
+        if in_memory is None:
+            in_memory = not self.stream_paragraphs
+        if in_memory:
+            # export the document to html (with css classes rather than inline styles to speed up rendering)
+            html = export_to_html_str(self.paragraphs, pretty=False, css_classes=True)
+
+            # convert to pdf and add the metadata before it is written so the file is only written once
+            pdf_bytes = export_html_to_pdf_bytes(html)
+            try:
+                pdf_bytes = add_metadata_to_pdf_bytes(pdf_bytes, self._get_metadata())
+                metadata_applied = True
+            except MetadataUpdateError:
+                metadata_applied = False
+            with open(pdf_file_path, "wb") as pdf_file:
+                pdf_file.write(pdf_bytes)
+        else:
+            html_file_path = pdf_file_path[:-len("pdf")] + "html"
 
-        # export the document to html
-        export_to_html(self.paragraphs, html_file_path)
+            # export the document to html (with css classes rather than inline styles to speed up rendering)
+            export_to_html(self.paragraphs, html_file_path, css_classes=True)
 
-        # convert to pdf
-        export_document_to_pdf(html_file_path, pdf_file_path)
+            # convert to pdf
+            export_document_to_pdf(html_file_path, pdf_file_path)
 
-        # remove the html document
-        os.remove(html_file_path)
+            # remove the html document
+            os.remove(html_file_path)
+            metadata_applied = False
 
         # add metadata to the pdf
-        self._apply_metadata(pdf_file_path)
-
-        # add document information to the export csv
-        output_folder = os.path.dirname(pdf_file_path)
-        export_csv_exists = "export_data.csv" in os.listdir(output_folder)
-        with open(output_folder + "/export_data.csv", "a", newline="") as export_csv:
-            writer = csv.writer(export_csv)
+        if not metadata_applied:
+            self._apply_metadata(pdf_file_path)
 
-            # write the header if the file was just created
-            if not export_csv_exists:
-                writer.writerow(["Document ID", "File Name", "Document Title"])
-
-            # write data
-            formatted_document_id = "" if self.id is None else self.id
-            writer.writerow([formatted_document_id, self.get_filename(), self.title])
+        # record the export in the manifest of the output folder
+        if export_manifest is None:
+            export_manifest = get_export_manifest(os.path.dirname(pdf_file_path))
+        export_manifest.record(self.id, self.get_filename(), self.title)
 
     # Last Edit By: Trent Bultsma
     # * Edit Details: Use the pdf_extractor to extract and export data.
@@ -157,6 +195,16 @@ class Document:
         os.remove(self.file_path)
         self.deleted = True
 
+    def _get_metadata(self) -> dict:
+        """Returns the document metadata values keyed by their pdf Info dictionary names."""
+        return {
+            "/Author" : self.author,
+            "/Title" : self.title,
+            "/Subject" : self.subject,
+            "/Creator" : self.creator,
+            "/Keywords" : "; ".join(self.keywords)
+        }
+
     def _apply_metadata(self, export_file_path:str):
         """Applies the document metadata to the inputted pdf file path.
         
@@ -166,6 +214,14 @@ class Document:
         # make sure the file is a pdf
         if not export_file_path.lower().endswith(".pdf"):
             raise ValueError("Must be a pdf file")
+
+        # append the metadata as an incremental update so the existing pdf is not rewritten
+        try:
+            add_metadata_to_pdf_file(export_file_path, self._get_metadata())
+            return
+        except MetadataUpdateError:
+            # fall back to rewriting the whole pdf when its cross-reference data can't be updated
+            pass
         
         # setup the reader and writer
         reader = PdfReader(export_file_path)
@@ -174,27 +230,25 @@ class Document:
             writer.add_page(page)
 
         # add the metadata to the writer
-        writer.add_metadata(
-            {
-                "/Author" : self.author,
-                "/Title" : self.title,
-                "/Subject" : self.subject,
-                "/Creator" : self.creator,
-                "/Keywords" : "; ".join(self.keywords)
-            }
-        )
+        writer.add_metadata(self._get_metadata())
 
         # overwrite the file now with metadata
         with open(export_file_path, "wb") as file:
             writer.write(file)
 
+    def get_block_paragraphs(self) -> list:
+        """ Returns the paragraphs inside each of the document's layout blocks, in the same order as `layout_blocks`,
+        found with a spatial index of the paragraphs on each page.
+        """
+        return join_blocks_to_paragraphs(self.layout_blocks, self.paragraphs)
+
     def _calculate_keywords(self) -> str:
         """ Returns a list of key words for the document. This is done 
         by looking through the paragraphs of the document and determining 
         key words by looking at frequency and uniqueness of each word.
         """
         # preprocess the text from the current document
-        document_raw_text = " . ".join([paragraph.get_raw_text().lower() for paragraph in self.paragraphs])
+        document_raw_text = " . ".join(paragraph.get_raw_text().lower() for paragraph in self.paragraphs)
 
         # extract the key phrases from the text
         keywords_and_scores = []
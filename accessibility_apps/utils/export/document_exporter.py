@@ -2,19 +2,97 @@
 
 """ Creates a pdf from a html link
 """
+import io
 import os
+import atexit
+import shutil
+import threading
 import subprocess
+from utils.export.render_server import PdfRenderServer, RenderServerError
+
+PDF_EXPORTER_SCRIPT = os.path.dirname(os.path.abspath(__file__)) + '/pdf_exporter.js'
+
+# the number of characters of html encoded and piped to the exporter at a time
+HTML_CHUNK_SIZE = 1 << 16
+
+# a render server shared by every export, started the first time it is needed
+_render_server = None
+_render_server_unavailable = False
+_render_server_lock = threading.Lock()
+
+def get_render_server() -> PdfRenderServer:
+    """ Returns the shared render server, starting it if needed, or None if it cannot be started
+        (for example when node or puppeteer is not installed).
+    """
+    global _render_server, _render_server_unavailable
+    with _render_server_lock:
+        if _render_server is None and not _render_server_unavailable:
+            if shutil.which("node") is None:
+                _render_server_unavailable = True
+                return None
+            render_server = PdfRenderServer()
+            try:
+                render_server.start()
+            except RenderServerError:
+                _render_server_unavailable = True
+                return None
+            atexit.register(render_server.close)
+            _render_server = render_server
+        return _render_server
 
 # Last Edit By: Marisa Loyd
 # * Edit Details: Current code is from Marisa
-def export_document_to_pdf(input_file_path, output_file_path):
+def export_document_to_pdf(input_file_path, output_file_path, use_render_server=True):
     """ Transforms the metadata from codable data structures back into a usable and readable
         format: PDF
 
     Args:
         input_file_path (str): File address of the input html.
         output_file_path (str): File address of the output pdf.
+        use_render_server (bool): Whether to render with the shared render server when it is available
+            instead of launching a browser just for this document.
     """
-    p = subprocess.Popen(['node', os.path.dirname(os.path.abspath(__file__)) + '/pdf_exporter.js', input_file_path, output_file_path], stdout=subprocess.PIPE)
+    if use_render_server:
+        render_server = get_render_server()
+        if render_server is not None:
+            try:
+                render_server.render(input_file_path, output_file_path)
+                return
+            except RenderServerError:
+                # fall back to rendering on its own
+                pass
+
+    p = subprocess.Popen(['node', PDF_EXPORTER_SCRIPT, input_file_path, output_file_path], stdout=subprocess.PIPE)
     p.wait()
-    return
\ No newline at end of file
+    return
+
+def export_html_to_pdf_bytes(html, use_render_server=True):
+    """ Returns the bytes of the pdf rendered from html. The html is piped straight to the renderer 
+        and the pdf piped back, so nothing is written to disk.
+
+    Args:
+        html (str): The html to render.
+        use_render_server (bool): Whether to render with the shared render server when it is available
+            instead of launching a browser just for this document.
+    """
+    if use_render_server:
+        render_server = get_render_server()
+        if render_server is not None:
+            try:
+                return render_server.render_html(html)
+            except RenderServerError:
+                # fall back to rendering on its own
+                pass
+
+    # '-' tells the exporter to read the html from stdin and write the pdf to stdout
+    p = subprocess.Popen(['node', PDF_EXPORTER_SCRIPT, '-', '-'], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    # encode the html a chunk at a time rather than making an encoded copy of all of it (the exporter reads
+    # all of stdin before writing the pdf, so the pdf can be read after the html is written)
+    with io.TextIOWrapper(p.stdin, encoding='utf-8') as html_input:
+        for start in range(0, len(html), HTML_CHUNK_SIZE):
+            html_input.write(html[start:start + HTML_CHUNK_SIZE])
+    pdf_bytes = p.stdout.read()
+    p.stdout.close()
+    if p.wait() != 0:
+        raise subprocess.CalledProcessError(p.returncode, p.args)
+    return pdf_bytes
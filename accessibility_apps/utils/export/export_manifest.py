@@ -0,0 +1,249 @@
+# ===================================================
+# File: export_manifest.py
+# Date: 10/18/2026
+# Description: Records which documents have been
+#   exported in a SQLite database shared by every
+#   thread and process exporting to a folder, and
+#   renders the legacy export csv from it.
+# ==================================================
+
+import os
+import csv
+import time
+import atexit
+import sqlite3
+import threading
+
+# the name of the manifest database and legacy csv within an output folder
+MANIFEST_FILE_NAME = "export_manifest.sqlite3"
+EXPORT_CSV_FILE_NAME = "export_data.csv"
+EXPORT_CSV_HEADER = ["Document ID", "File Name", "Document Title"]
+
+# buffered records are written once there are this many of them or they are this many seconds old (a timer
+# writes them when no more records come along to fill the batch)
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_FLUSH_INTERVAL = 5
+
+# seconds to wait for another process to finish writing to the database
+BUSY_TIMEOUT = 30
+
+class ExportManifest():
+    """Records the id, file name, and title of each exported document. Records are buffered in memory and
+    written in batches to a SQLite database in write-ahead logging mode, so any number of threads and
+    processes can record exports to the same manifest without their rows interleaving. The database is only
+    created once the manifest is first used."""
+
+    def __init__(self, database_path:str, batch_size:int=DEFAULT_BATCH_SIZE, flush_interval:float=DEFAULT_FLUSH_INTERVAL,
+                 legacy_csv_path:str=None):
+        """Initializes the manifest without opening the database.
+
+        Args:
+            database_path (str): The path of the manifest database.
+            batch_size (int): The number of buffered records that causes them to be written.
+            flush_interval (float): The age in seconds of the oldest buffered record that causes them to be written.
+            legacy_csv_path (str): A legacy export csv to import when the database is created, or `None` for none.
+        """
+        self.database_path = database_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.legacy_csv_path = legacy_csv_path
+        # whether exports were recorded since the csv was last written
+        self.has_new_records = False
+        self._lock = threading.RLock()
+        self._pending_records = []
+        self._flush_timer = None
+        self._connection = None
+        self._connection_pid = None
+        # the ids known to be in the manifest, for checking exports without querying the database (loaded when it is opened)
+        self._exported_ids = None
+
+    def open(self):
+        """Opens the database, creating it (and importing the legacy csv) if needed, which is otherwise done the
+        first time the manifest is used."""
+        with self._lock:
+            self._open()
+
+    def _open(self):
+        """Opens the database the first time the manifest is used, creating it (and importing the legacy csv) if
+        needed. Should be called while holding the lock."""
+        if self._exported_ids is not None:
+            return
+        is_new = not os.path.exists(self.database_path)
+        self._exported_ids = set([document_id for (document_id,) in self._get_connection().execute("SELECT DISTINCT document_id FROM exports WHERE document_id IS NOT NULL")])
+        if is_new and self.legacy_csv_path is not None and os.path.exists(self.legacy_csv_path):
+            self.import_csv(self.legacy_csv_path)
+            # the csv already has the imported exports
+            self.has_new_records = False
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Returns the connection to the database, opening a new one in a process forked from the one that opened it."""
+        if self._connection is None or self._connection_pid != os.getpid():
+            connection = sqlite3.connect(self.database_path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS exports (document_id TEXT, file_name TEXT, document_title TEXT, exported_at REAL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS exports_document_id ON exports (document_id)")
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def record(self, document_id:str, file_name:str, document_title:str):
+        """Records that a document was exported. The record is written along with others once enough of
+        them are buffered, or when the manifest is flushed.
+
+        Args:
+            document_id (str): The id of the document, or `None` if it doesn't have one.
+            file_name (str): The file name of the document.
+            document_title (str): The title of the document.
+        """
+        with self._lock:
+            self._open()
+            if document_id is not None:
+                self._exported_ids.add(document_id)
+            self.has_new_records = True
+            self._pending_records.append((document_id, file_name, document_title, time.time()))
+            if len(self._pending_records) >= self.batch_size:
+                self.flush()
+            elif self._flush_timer is None or not self._flush_timer.is_alive():
+                # write the records when they are old enough even if no more exports come along to fill the batch
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def record_many(self, records:'list[tuple[str, str, str]]'):
+        """Records many exported documents at once.
+
+        Args:
+            records (list[tuple[str, str, str]]): The (document id, file name, document title) of each document.
+        """
+        with self._lock:
+            for document_id, file_name, document_title in records:
+                self.record(document_id, file_name, document_title)
+
+    def flush(self):
+        """Writes the buffered records to the database in a single transaction."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if len(self._pending_records) == 0:
+                return
+            connection = self._get_connection()
+            # take the write lock up front so a transaction from another process can't slip in halfway through
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany("INSERT INTO exports VALUES (?, ?, ?, ?)", self._pending_records)
+                connection.execute("COMMIT")
+            except:
+                connection.execute("ROLLBACK")
+                raise
+            self._pending_records = []
+
+    def contains(self, document_id:str) -> bool:
+        """Returns whether a document with the id has been exported.
+
+        Args:
+            document_id (str): The id of the document.
+        """
+        if document_id is None:
+            return False
+        with self._lock:
+            self._open()
+            if document_id in self._exported_ids:
+                return True
+            # it may have been exported by another process since the ids were loaded
+            row = self._get_connection().execute("SELECT 1 FROM exports WHERE document_id = ? LIMIT 1", (document_id,)).fetchone()
+            if row is not None:
+                self._exported_ids.add(document_id)
+            return row is not None
+
+    def import_csv(self, csv_file_path:str):
+        """Records the exports listed in a legacy export csv.
+
+        Args:
+            csv_file_path (str): The path of the csv.
+        """
+        with open(csv_file_path, "r", newline="") as export_csv:
+            reader = csv.reader(export_csv)
+            # skip the header
+            next(reader, None)
+            self.record_many([(row[0] if row[0] != "" else None, row[1], row[2]) for row in reader if len(row) == len(EXPORT_CSV_HEADER)])
+        self.flush()
+
+    def export_csv(self, csv_file_path:str):
+        """Writes every recorded export to a csv in the legacy export csv format, in the order they were recorded.
+
+        Args:
+            csv_file_path (str): The path of the csv.
+        """
+        with self._lock:
+            self._open()
+            self.flush()
+            rows = self._get_connection().execute("SELECT document_id, file_name, document_title FROM exports ORDER BY rowid").fetchall()
+            self.has_new_records = False
+
+        # write to a temporary file and swap it in so the csv is never seen half written
+        temporary_file_path = csv_file_path + "." + str(os.getpid()) + ".tmp"
+        with open(temporary_file_path, "w", newline="") as export_csv:
+            writer = csv.writer(export_csv)
+            writer.writerow(EXPORT_CSV_HEADER)
+            writer.writerows([("" if document_id is None else document_id, file_name, document_title) for document_id, file_name, document_title in rows])
+        os.replace(temporary_file_path, csv_file_path)
+
+    def __len__(self) -> int:
+        """Returns the number of recorded exports."""
+        with self._lock:
+            self._open()
+            self.flush()
+            return self._get_connection().execute("SELECT COUNT(*) FROM exports").fetchone()[0]
+
+    def close(self):
+        """Writes the buffered records and closes the database."""
+        with self._lock:
+            self.flush()
+            if self._connection is not None and self._connection_pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+# the manifests of each output folder, opened the first time a document is exported to the folder
+_export_manifests = {}
+_export_manifests_lock = threading.Lock()
+
+def get_export_manifest(output_folder:str) -> ExportManifest:
+    """Returns the shared manifest of an output folder. A folder that only has a legacy export csv
+    has its rows imported into the new manifest when it is first used.
+
+    Args:
+        output_folder (str): The folder documents are exported to.
+    """
+    output_folder = os.path.abspath(output_folder)
+    with _export_manifests_lock:
+        export_manifest = _export_manifests.get(output_folder)
+        if export_manifest is None:
+            export_manifest = ExportManifest(os.path.join(output_folder, MANIFEST_FILE_NAME), legacy_csv_path=os.path.join(output_folder, EXPORT_CSV_FILE_NAME))
+            _export_manifests[output_folder] = export_manifest
+        return export_manifest
+
+def write_export_csv(output_folder:str, force:bool=False):
+    """Writes the legacy export csv of an output folder from its manifest, if anything was exported to the
+    folder since it was last written.
+
+    Args:
+        output_folder (str): The folder documents are exported to.
+        force (bool): Whether to write it anyway, like when the exports were recorded by other processes.
+    """
+    export_manifest = get_export_manifest(output_folder)
+    if force or export_manifest.has_new_records:
+        export_manifest.export_csv(os.path.join(output_folder, EXPORT_CSV_FILE_NAME))
+
+def close_export_manifests():
+    """Writes the legacy export csv of every open manifest that has new exports and closes them."""
+    with _export_manifests_lock:
+        export_manifests = list(_export_manifests.items())
+        _export_manifests.clear()
+    for output_folder, export_manifest in export_manifests:
+        if export_manifest.has_new_records:
+            export_manifest.export_csv(os.path.join(output_folder, EXPORT_CSV_FILE_NAME))
+        export_manifest.close()
+
+atexit.register(close_export_manifests)
@@ -1,29 +1,46 @@
 const puppeteer = require('puppeteer');
 const fs = require('fs');
-const os = require('node:os');
-const path = require('path');
 
-(async () => {
+const PDF_OPTIONS = {
+    margin: { top:'100px', right:'50px', bottom:'100px', left:'50px'},
+    printBackground:true,
+    format:'A4',
+};
 
-    var inputName = process.argv[2];
-    var outputName = process.argv[3];
+// launches the headless browser used to render pdfs
+async function launchBrowser() {
+    return await puppeteer.launch({dumpio:false , ignoreDefaultArgs: ['--disable-extensions','--enable-popup-blocking'], args: ['headless', '--no-sandbox', '--disable-setuid-sandbox','--disable-gpu'],});
+}
 
+// renders html to a pdf with the page, writing it to outputName if given and returning the pdf bytes
+async function renderPdf(page, html, outputName) {
+    await page.setContent(html, {waitUntil: 'domcontentloaded'});
 
-    const browser = await puppeteer.launch({dumpio:false , ignoreDefaultArgs: ['--disable-extensions','--enable-popup-blocking'], args: ['headless', '--no-sandbox', '--disable-setuid-sandbox','--disable-gpu'],});
+    await page.emulateMediaType('screen');
+    return await page.pdf({...PDF_OPTIONS, path:outputName});
+}
 
-    const page = await browser.newPage();
+module.exports = { launchBrowser, renderPdf };
 
-    const html = fs.readFileSync(inputName, 'utf-8');
-    await page.setContent(html, {waitUntil: 'domcontentloaded'});
+// convert a single html file when run as a script, where an input or output name of '-'
+// means reading the html from stdin or writing the pdf to stdout instead of using a file
+if (require.main === module) {
+    (async () => {
 
-    await page.emulateMediaType('screen');
-    const pdf = await page.pdf({
-        path:outputName,
-        margin: { top:'100px', right:'50px', bottom:'100px', left:'50px'},
-        printBackground:true,
-        format:'A4',
-    });
+        var inputName = process.argv[2];
+        var outputName = process.argv[3];
+
+        const browser = await launchBrowser();
+
+        const page = await browser.newPage();
+
+        const html = fs.readFileSync(inputName === '-' ? 0 : inputName, 'utf-8');
+        const pdf = await renderPdf(page, html, outputName === '-' ? undefined : outputName);
+        if (outputName === '-') {
+            process.stdout.write(Buffer.from(pdf));
+        }
 
-    await browser.close();
+        await browser.close();
 
-})();
\ No newline at end of file
+    })();
+}
@@ -0,0 +1,145 @@
+# ===================================================
+# File: pdf_metadata.py
+# Date: 10/18/2026
+# Description: Sets the metadata of a pdf by appending
+#   an incremental update with a new Info dictionary
+#   instead of rewriting the whole file.
+# ==================================================
+
+import os
+import re
+
+# how far from the end of a pdf to look for the startxref keyword
+STARTXREF_SEARCH_SIZE = 2048
+
+class MetadataUpdateError(Exception):
+    """Raised when a pdf's cross-reference data cannot be read well enough to append an update to it."""
+
+def _encode_text_string(text:str) -> bytes:
+    """Returns a pdf text string object for the text. Ascii text is written as a literal string and
+    anything else as utf-16 with a byte order mark in hex."""
+    if all(32 <= ord(character) < 127 for character in text):
+        return b"(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("ascii") + b")"
+    return b"<FEFF" + text.encode("utf-16-be").hex().upper().encode("ascii") + b">"
+
+def _create_info_object(object_number:int, metadata:dict) -> bytes:
+    """Returns an indirect Info dictionary object holding the metadata.
+
+    Args:
+        object_number (int): The object number of the Info dictionary.
+        metadata (dict): Maps names like "/Title" to their text.
+    """
+    entries = b"".join([name.encode("ascii") + b" " + _encode_text_string(value) + b"\n" for name, value in metadata.items()])
+    return str(object_number).encode("ascii") + b" 0 obj\n<<\n" + entries + b">>\nendobj\n"
+
+def _find_startxref(end_of_pdf:bytes) -> int:
+    """Returns the offset of the last cross-reference section from the end of a pdf."""
+    startxref_match = re.search(rb"startxref\s+(\d+)\s+%%EOF\s*$", end_of_pdf[end_of_pdf.rfind(b"startxref"):])
+    if startxref_match is None:
+        raise MetadataUpdateError("Could not find the startxref of the pdf")
+    return int(startxref_match.group(1))
+
+def _read_trailer_entries(xref_section:bytes) -> 'tuple[bool, bytes]':
+    """Returns whether the cross-reference section is a cross-reference stream, and the bytes of its
+    trailer dictionary (or stream dictionary).
+
+    Args:
+        xref_section (bytes): The pdf from the start of the last cross-reference section to the end.
+    """
+    if xref_section.startswith(b"xref"):
+        trailer_start = xref_section.find(b"trailer")
+        trailer_end = xref_section.find(b"startxref", trailer_start)
+        if trailer_start == -1 or trailer_end == -1:
+            raise MetadataUpdateError("Could not find the trailer of the pdf")
+        return False, xref_section[trailer_start:trailer_end]
+    if re.match(rb"\d+\s+\d+\s+obj", xref_section) is not None:
+        stream_start = xref_section.find(b"stream")
+        if stream_start == -1:
+            raise MetadataUpdateError("Could not find the cross-reference stream of the pdf")
+        return True, xref_section[:stream_start]
+    raise MetadataUpdateError("The startxref of the pdf does not point to cross-reference data")
+
+def _get_trailer_value(trailer:bytes, pattern:bytes) -> 're.Match':
+    """Returns the match of a pattern for an entry of the trailer, raising if it is not there."""
+    match = re.search(pattern, trailer)
+    if match is None:
+        raise MetadataUpdateError("The pdf trailer is missing " + pattern.decode("ascii"))
+    return match
+
+def _create_metadata_update(xref_section:bytes, xref_offset:int, pdf_length:int, metadata:dict) -> bytes:
+    """Returns an incremental update section that sets the metadata of a pdf.
+
+    Args:
+        xref_section (bytes): The pdf from the start of its last cross-reference section to the end.
+        xref_offset (int): The offset of the last cross-reference section.
+        pdf_length (int): The length of the pdf the update is appended to.
+        metadata (dict): Maps names like "/Title" to their text.
+    """
+    is_xref_stream, trailer = _read_trailer_entries(xref_section)
+    if b"/Encrypt" in trailer:
+        raise MetadataUpdateError("Encrypted pdfs are not supported")
+    size = int(_get_trailer_value(trailer, rb"/Size\s+(\d+)").group(1))
+    root = _get_trailer_value(trailer, rb"/Root\s+\d+\s+\d+\s+R").group(0)
+    id_match = re.search(rb"/ID\s*\[[^\]]*\]", trailer)
+    document_id = b"" if id_match is None else id_match.group(0) + b"\n"
+
+    # the update starts on a new line after the existing pdf
+    update = b"" if xref_section.endswith(b"\n") else b"\n"
+    info_offset = pdf_length + len(update)
+    info_object_number = size
+    update += _create_info_object(info_object_number, metadata)
+    new_xref_offset = pdf_length + len(update)
+
+    if not is_xref_stream:
+        # a classic cross-reference table with the one new object in it
+        update += b"xref\n" + str(info_object_number).encode("ascii") + b" 1\n"
+        update += ("%010d 00000 n\r\n" % info_offset).encode("ascii")
+        update += b"trailer\n<<\n/Size " + str(size + 1).encode("ascii") + b"\n" + root + b"\n"
+        update += b"/Info " + str(info_object_number).encode("ascii") + b" 0 R\n"
+        update += b"/Prev " + str(xref_offset).encode("ascii") + b"\n" + document_id + b">>\n"
+    else:
+        # a pdf with cross-reference streams gets another one, covering the Info object and itself
+        xref_object_number = size + 1
+        entries = bytes([1]) + info_offset.to_bytes(4, "big") + bytes(2)
+        entries += bytes([1]) + new_xref_offset.to_bytes(4, "big") + bytes(2)
+        update += str(xref_object_number).encode("ascii") + b" 0 obj\n<<\n/Type /XRef\n/Size " + str(size + 2).encode("ascii") + b"\n"
+        update += root + b"\n/Info " + str(info_object_number).encode("ascii") + b" 0 R\n"
+        update += b"/Prev " + str(xref_offset).encode("ascii") + b"\n" + document_id
+        update += b"/W [1 4 2]\n/Index [" + str(info_object_number).encode("ascii") + b" 2]\n/Length " + str(len(entries)).encode("ascii") + b"\n>>\n"
+        update += b"stream\n" + entries + b"\nendstream\nendobj\n"
+
+    update += b"startxref\n" + str(new_xref_offset).encode("ascii") + b"\n%%EOF\n"
+    return update
+
+def add_metadata_to_pdf_bytes(pdf_bytes:bytes, metadata:dict) -> bytes:
+    """Returns the pdf with an incremental update appended that sets its metadata, so the metadata
+    can be added before the pdf is ever written to disk.
+
+    Args:
+        pdf_bytes (bytes): The pdf.
+        metadata (dict): Maps names like "/Title" to their text.
+    """
+    xref_offset = _find_startxref(pdf_bytes[-STARTXREF_SEARCH_SIZE:])
+    if xref_offset >= len(pdf_bytes):
+        raise MetadataUpdateError("The startxref of the pdf is past its end")
+    return pdf_bytes + _create_metadata_update(pdf_bytes[xref_offset:], xref_offset, len(pdf_bytes), metadata)
+
+def add_metadata_to_pdf_file(pdf_file_path:str, metadata:dict):
+    """Appends an incremental update that sets the metadata of a pdf file. Only the cross-reference
+    data at the end of the file is read and none of the existing objects are rewritten.
+
+    Args:
+        pdf_file_path (str): The path of the pdf file.
+        metadata (dict): Maps names like "/Title" to their text.
+    """
+    with open(pdf_file_path, "r+b") as pdf_file:
+        pdf_length = pdf_file.seek(0, os.SEEK_END)
+        pdf_file.seek(max(0, pdf_length - STARTXREF_SEARCH_SIZE))
+        xref_offset = _find_startxref(pdf_file.read())
+        if xref_offset >= pdf_length:
+            raise MetadataUpdateError("The startxref of the pdf is past its end")
+
+        pdf_file.seek(xref_offset)
+        update = _create_metadata_update(pdf_file.read(), xref_offset, pdf_length, metadata)
+        pdf_file.seek(0, os.SEEK_END)
+        pdf_file.write(update)
@@ -0,0 +1,123 @@
+// A long-lived pdf renderer. It launches one browser with a pool of pages and then renders
+// jobs read from stdin, one JSON object per line, answering each on stdout the same way:
+//   job:      {"id": 1, "input": "/path/in.html", "output": "/path/out.pdf"}
+//   response: {"id": 1, "ok": true} or {"id": 1, "ok": false, "error": "..."}
+// A job can carry the html itself as "html" instead of an input file, and when it has no
+// output file, the pdf is sent back base64 encoded as "pdf" in the response.
+// {"ready": true} is written once the browser is up. When stdin closes, the jobs in
+// progress are finished and the browser is closed.
+const fs = require('fs');
+const readline = require('readline');
+const { launchBrowser, renderPdf } = require('./pdf_exporter.js');
+
+const pageCount = parseInt(process.argv[2] || '2');
+
+function respond(message) {
+    process.stdout.write(JSON.stringify(message) + '\n');
+}
+
+(async () => {
+    const browser = await launchBrowser();
+    // let whoever started the server know when the browser dies so it can start a new one
+    browser.on('disconnected', () => process.exit(1));
+
+    // pages that are free to render with and jobs waiting for one
+    const idlePages = [];
+    const waitingForPage = [];
+    for (let i = 0; i < pageCount; i++) {
+        idlePages.push(await browser.newPage());
+    }
+    // the number of open pages, which drops below pageCount when a broken page can't be replaced
+    let openPageCount = pageCount;
+
+    async function acquirePage() {
+        if (idlePages.length > 0) {
+            return idlePages.pop();
+        }
+        if (openPageCount < pageCount) {
+            // make up for a page that couldn't be replaced earlier
+            openPageCount++;
+            try {
+                return await browser.newPage();
+            } catch (error) {
+                openPageCount--;
+                throw error;
+            }
+        }
+        return new Promise((resolve) => waitingForPage.push(resolve));
+    }
+
+    function releasePage(page) {
+        if (waitingForPage.length > 0) {
+            waitingForPage.shift()(page);
+        } else {
+            idlePages.push(page);
+        }
+    }
+
+    function losePage() {
+        openPageCount--;
+        // a job waiting for a page would otherwise wait for one that will never be released
+        if (waitingForPage.length > 0) {
+            openPageCount++;
+            browser.newPage().then(releasePage, () => { openPageCount--; });
+        }
+    }
+
+    async function runJob(job) {
+        let page = null;
+        try {
+            page = await acquirePage();
+            const html = job.html !== undefined ? job.html : fs.readFileSync(job.input, 'utf-8');
+            const pdf = await renderPdf(page, html, job.output);
+            if (job.output) {
+                respond({ id: job.id, ok: true });
+            } else {
+                respond({ id: job.id, ok: true, pdf: Buffer.from(pdf).toString('base64') });
+            }
+        } catch (error) {
+            respond({ id: job.id, ok: false, error: String(error) });
+            if (page !== null) {
+                // the page may be left in a bad state, so swap it for a fresh one
+                await page.close().catch(() => {});
+                try {
+                    page = await browser.newPage();
+                } catch (newPageError) {
+                    console.error(newPageError);
+                }
+            }
+        } finally {
+            // only pages that are still open go back in the pool
+            if (page !== null && !page.isClosed()) {
+                releasePage(page);
+            } else if (page !== null) {
+                losePage();
+            }
+        }
+    }
+
+    const runningJobs = new Set();
+    const lines = readline.createInterface({ input: process.stdin });
+    lines.on('line', (line) => {
+        let job;
+        try {
+            job = JSON.parse(line);
+        } catch (error) {
+            respond({ id: null, ok: false, error: String(error) });
+            return;
+        }
+        const running = runJob(job).catch((error) => console.error(error));
+        runningJobs.add(running);
+        running.finally(() => runningJobs.delete(running));
+    });
+    lines.on('close', async () => {
+        await Promise.all(runningJobs);
+        browser.removeAllListeners('disconnected');
+        await browser.close();
+    });
+
+    respond({ ready: true });
+})().catch((error) => {
+    console.error(error);
+    process.exit(1);
+});
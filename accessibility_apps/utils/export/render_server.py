@@ -0,0 +1,202 @@
+# ===================================================
+# File: render_server.py
+# Date: 10/18/2026
+# Description: Manages a long-lived node process that
+#   keeps a headless browser open to render html to
+#   pdfs, instead of launching one per document.
+# ==================================================
+
+import os
+import json
+import base64
+import threading
+import subprocess
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+SERVER_SCRIPT = os.path.dirname(os.path.abspath(__file__)) + "/pdf_render_server.js"
+
+# the number of browser pages rendering at once
+DEFAULT_PAGE_COUNT = 2
+
+# the number of jobs a server process renders before it is replaced with a fresh one
+DEFAULT_MAX_JOBS_PER_PROCESS = 200
+
+# seconds to wait for the browser to launch and for a single job to render
+DEFAULT_START_TIMEOUT = 60
+DEFAULT_JOB_TIMEOUT = 120
+
+class RenderServerError(Exception):
+    """Raised when the render server cannot be started or fails to render a document."""
+
+class _RenderProcess():
+    """A single node render server process and the jobs waiting on it."""
+
+    def __init__(self, page_count:int, start_timeout:float):
+        """Starts the process and waits for its browser to launch.
+
+        Args:
+            page_count (int): The number of browser pages rendering at once.
+            start_timeout (float): Seconds to wait for the browser to launch.
+        """
+        self.process = subprocess.Popen(["node", SERVER_SCRIPT, str(page_count)], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding="utf-8")
+        self.lock = threading.Lock()
+        self.pending_jobs = {}
+        self.next_job_id = 0
+        self.job_count = 0
+        self.dead = False
+        self.ready = Future()
+
+        # responses are read on their own thread so jobs can run concurrently
+        threading.Thread(target=self._read_responses, daemon=True).start()
+        try:
+            self.ready.result(start_timeout)
+        except Exception as e:
+            self.kill()
+            raise RenderServerError("The render server failed to start: " + str(e))
+
+    def _read_responses(self):
+        """Hands each response from the process to the job waiting on it until the process exits."""
+        for line in self.process.stdout:
+            try:
+                response = json.loads(line)
+            except ValueError:
+                continue
+            if response.get("ready"):
+                self.ready.set_result(True)
+                continue
+            with self.lock:
+                job_future = self.pending_jobs.pop(response.get("id"), None)
+            if job_future is not None:
+                job_future.set_result(response)
+
+        # the process exited, so fail anything still waiting on it
+        with self.lock:
+            self.dead = True
+            pending_jobs = self.pending_jobs
+            self.pending_jobs = {}
+        error = RenderServerError("The render server exited")
+        if not self.ready.done():
+            self.ready.set_exception(error)
+        for job_future in pending_jobs.values():
+            job_future.set_exception(error)
+
+    def submit(self, job:dict) -> Future:
+        """Sends a job to the process and returns a future for its response.
+
+        Args:
+            job (dict): The job, which is given an id.
+        """
+        with self.lock:
+            if self.dead:
+                raise RenderServerError("The render server exited")
+            job["id"] = self.next_job_id
+            self.next_job_id += 1
+            self.job_count += 1
+            job_future = Future()
+            self.pending_jobs[job["id"]] = job_future
+            try:
+                self.process.stdin.write(json.dumps(job) + "\n")
+                self.process.stdin.flush()
+            except OSError as e:
+                self.dead = True
+                self.pending_jobs.pop(job["id"])
+                raise RenderServerError("The render server exited: " + str(e))
+        return job_future
+
+    def close(self, timeout:float=DEFAULT_JOB_TIMEOUT):
+        """Lets the process finish the jobs it has and exit, killing it if that takes too long."""
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.kill()
+
+    def kill(self):
+        """Kills the process, failing any jobs waiting on it."""
+        self.dead = True
+        self.process.kill()
+        self.process.wait()
+
+class PdfRenderServer():
+    """Renders html files to pdfs with a node process that stays running between documents, holding
+    one browser with a pool of pages. The process is replaced after a number of jobs, and whenever
+    it crashes, the job is retried once on a new process."""
+
+    def __init__(self, page_count:int=DEFAULT_PAGE_COUNT, max_jobs_per_process:int=DEFAULT_MAX_JOBS_PER_PROCESS, start_timeout:float=DEFAULT_START_TIMEOUT):
+        """Initializes the server. The node process is started by `start` or the first render.
+
+        Args:
+            page_count (int): The number of browser pages rendering at once.
+            max_jobs_per_process (int): The number of jobs a process renders before it is replaced.
+            start_timeout (float): Seconds to wait for the browser to launch.
+        """
+        self.page_count = page_count
+        self.max_jobs_per_process = max_jobs_per_process
+        self.start_timeout = start_timeout
+        self._process = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Starts the node process if it is not already running. Raises `RenderServerError` if it cannot start."""
+        self._get_process()
+
+    def _get_process(self) -> _RenderProcess:
+        """Returns the running process, starting a new one if it crashed or has rendered enough jobs."""
+        with self._lock:
+            if self._process is not None and (self._process.dead or self._process.job_count >= self.max_jobs_per_process):
+                # let the old process finish its jobs in the background
+                threading.Thread(target=self._process.close, daemon=True).start()
+                self._process = None
+            if self._process is None:
+                self._process = _RenderProcess(self.page_count, self.start_timeout)
+            return self._process
+
+    def _run_job(self, job:dict, timeout:float) -> dict:
+        """Runs a job and returns its successful response, retrying once if the process crashes."""
+        for attempt in range(2):
+            process = self._get_process()
+            try:
+                response = process.submit(dict(job)).result(timeout)
+            except RenderServerError:
+                if attempt == 1:
+                    raise
+                continue
+            except FutureTimeoutError:
+                # a stuck browser would hold up every later job, so start over with a new one
+                process.kill()
+                raise RenderServerError("The render server timed out")
+            if not response.get("ok"):
+                raise RenderServerError(response.get("error"))
+            return response
+
+    def render(self, input_file_path:str, output_file_path:str, timeout:float=DEFAULT_JOB_TIMEOUT):
+        """Renders an html file to a pdf file.
+
+        Args:
+            input_file_path (str): File address of the input html.
+            output_file_path (str): File address of the output pdf.
+            timeout (float): Seconds to wait for the pdf to render.
+        """
+        self._run_job({"input" : os.path.abspath(input_file_path), "output" : os.path.abspath(output_file_path)}, timeout)
+
+    def render_html(self, html:str, timeout:float=DEFAULT_JOB_TIMEOUT) -> bytes:
+        """Returns the bytes of the pdf rendered from html, which are passed to and from the server
+        through its pipes so no files are written.
+
+        Args:
+            html (str): The html to render.
+            timeout (float): Seconds to wait for the pdf to render.
+        """
+        response = self._run_job({"html" : html}, timeout)
+        return base64.b64decode(response["pdf"])
+
+    def close(self):
+        """Finishes the jobs in progress and stops the node process."""
+        with self._lock:
+            process = self._process
+            self._process = None
+        if process is not None:
+            process.close()
@@ -0,0 +1,133 @@
+# ===================================================
+# File: batch_ocr.py
+# Date: 10/18/2026
+# Description: Reads the text of all the blocks of a
+#   page with one OCR engine call, on a bounded pool
+#   of workers, instead of starting Tesseract once
+#   per block.
+# ==================================================
+
+import os
+import bisect
+import threading
+import numpy as np
+from PIL import Image
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# tesserocr keeps Tesseract loaded in process, which is used when it is installed
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+# the languages read by default
+DEFAULT_OCR_LANGUAGES = 'eng'
+
+# the most pages read at once
+DEFAULT_OCR_WORKERS = min(4, os.cpu_count() or 1)
+
+# the white space left between block images stacked into one image, in pixels
+STACK_GAP = 40
+
+def _stack_images(images:'list[np.ndarray]') -> 'tuple[np.ndarray, list[int]]':
+    """Returns the images stacked top to bottom on a white background with a gap between them, and the
+    y offset of each one."""
+    channels = images[0].shape[2:]
+    width = max([image.shape[1] for image in images])
+    height = sum([image.shape[0] for image in images]) + STACK_GAP * (len(images) - 1)
+    stacked_image = np.full((height, width) + channels, 255, dtype=np.uint8)
+    offsets = []
+    offset = 0
+    for image in images:
+        offsets.append(offset)
+        stacked_image[offset:offset + image.shape[0], :image.shape[1]] = image
+        offset += image.shape[0] + STACK_GAP
+    return stacked_image, offsets
+
+class BatchOcrAgent():
+    """Reads the text of many block images at once. With tesserocr installed, each worker thread keeps its own
+    Tesseract API handle and reads the blocks one after another in process. Otherwise the blocks of a page are
+    stacked into one image for a single Tesseract call and the words are split back to their blocks by position."""
+
+    def __init__(self, languages:str=DEFAULT_OCR_LANGUAGES, workers:int=DEFAULT_OCR_WORKERS):
+        """Initializes the agent and its worker pool.
+
+        Args:
+            languages (str): The languages to read, like 'eng' or 'eng+fra'.
+            workers (int): The most pages read at once.
+        """
+        self.languages = languages
+        self.use_tesserocr = tesserocr is not None
+        self._local = threading.local()
+        self._apis = []
+        self._apis_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def _get_api(self):
+        """Returns the Tesseract API handle of the current thread, creating it if needed."""
+        api = getattr(self._local, "api", None)
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(lang=self.languages)
+            self._local.api = api
+            with self._apis_lock:
+                self._apis.append(api)
+        return api
+
+    def _recognize_with_api(self, images:'list[np.ndarray]') -> 'list[str]':
+        """Returns the text of each image, read with the thread's Tesseract API handle."""
+        api = self._get_api()
+        texts = []
+        for image in images:
+            api.SetImage(Image.fromarray(image))
+            texts.append(api.GetUTF8Text())
+        return texts
+
+    def _recognize_stacked(self, images:'list[np.ndarray]') -> 'list[str]':
+        """Returns the text of each image, read with one Tesseract call on all of them stacked together."""
+        # only needed without tesserocr, so it isn't a dependency of everything that imports this module
+        import pytesseract
+        stacked_image, offsets = _stack_images(images)
+        data = pytesseract.image_to_data(stacked_image, lang=self.languages, output_type=pytesseract.Output.DICT)
+
+        # put each word with the image its center is in, keeping the words of each line together
+        lines = [[] for _ in images]
+        current_lines = [None] * len(images)
+        for word_number, word in enumerate(data["text"]):
+            if len(word.strip()) == 0:
+                continue
+            center = data["top"][word_number] + data["height"][word_number] / 2
+            image_number = bisect.bisect_right(offsets, center) - 1
+            line_id = (data["block_num"][word_number], data["par_num"][word_number], data["line_num"][word_number])
+            if current_lines[image_number] != line_id:
+                lines[image_number].append([])
+                current_lines[image_number] = line_id
+            lines[image_number][-1].append(word)
+        return ["\n".join([" ".join(line) for line in image_lines]) for image_lines in lines]
+
+    def recognize(self, images:'list[np.ndarray]') -> 'list[str]':
+        """Returns the text of each image (the blocks of a page) read in one OCR call.
+
+        Args:
+            images (list[np.ndarray]): The block images.
+        """
+        if len(images) == 0:
+            return []
+        if self.use_tesserocr:
+            return self._recognize_with_api(images)
+        return self._recognize_stacked(images)
+
+    def submit(self, images:'list[np.ndarray]') -> Future:
+        """Starts reading the images on the worker pool and returns a future for their text.
+
+        Args:
+            images (list[np.ndarray]): The block images.
+        """
+        return self._executor.submit(self.recognize, images)
+
+    def close(self):
+        """Waits for the pages being read and releases the workers and Tesseract handles."""
+        self._executor.shutdown(wait=True)
+        with self._apis_lock:
+            for api in self._apis:
+                api.End()
+            self._apis = []
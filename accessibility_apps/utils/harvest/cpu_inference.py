@@ -0,0 +1,115 @@
+# ===================================================
+# File: cpu_inference.py
+# Date: 10/18/2026
+# Description: An opt-in profile for running the
+#   layout model on hosts without a gpu: pins the
+#   torch threads of a worker and quantizes the
+#   model's fully connected layers to int8.
+# ==================================================
+
+import os
+import torch
+import layoutparser as lp
+
+# the environment variable that turns the profile on for a process: "int8" to also quantize the model, or "fp32"
+CPU_PROFILE_ENV = 'LAYOUT_CPU_PROFILE'
+
+# the environment variables with the number of torch threads of a worker, and the cpus to pin it to (like "0-3" or "0,2,4")
+CPU_THREADS_ENV = 'LAYOUT_CPU_THREADS'
+CPU_IDS_ENV = 'LAYOUT_CPU_IDS'
+
+def parse_cpu_ids(cpu_ids:str) -> 'list[int]':
+    """Returns the cpu numbers in a list like "0-3,6"."""
+    ids = []
+    for part in cpu_ids.split(','):
+        part = part.strip()
+        if len(part) == 0:
+            continue
+        if '-' in part:
+            first, last = part.split('-', 1)
+            ids.extend(range(int(first), int(last) + 1))
+        else:
+            ids.append(int(part))
+    return ids
+
+class CpuInferenceProfile():
+    """How the layout model is run on the cpu. Applying the profile sets the number of threads torch uses for each
+    operation (one worker's share of the host instead of every core, which oversubscribes the cpu when several
+    workers run), optionally pins the process to a set of cpus, and with `quantize` converts the weights of the
+    fully connected layers to int8. Layouts detected with the profile are run under `torch.inference_mode`."""
+
+    def __init__(self, thread_count:int=None, cpu_ids:'list[int]'=None, quantize:bool=True):
+        """Initializes the profile.
+
+        Args:
+            thread_count (int): The number of threads torch uses for each operation. Defaults to the number of
+                cpus the process is pinned to, or every cpu.
+            cpu_ids (list[int]): The cpus to pin the process to, or `None` to leave it unpinned.
+            quantize (bool): Whether to quantize the fully connected layers to int8.
+        """
+        self.cpu_ids = cpu_ids
+        self.thread_count = thread_count if thread_count is not None else (len(cpu_ids) if cpu_ids else os.cpu_count() or 1)
+        self.quantize = quantize
+
+    @staticmethod
+    def from_environment() -> 'CpuInferenceProfile':
+        """Returns the profile set by CPU_PROFILE_ENV, CPU_THREADS_ENV, and CPU_IDS_ENV, or `None` if it isn't turned on."""
+        profile = os.environ.get(CPU_PROFILE_ENV)
+        if profile is None or profile.strip().lower() not in ('int8', 'fp32'):
+            return None
+        thread_count = os.environ.get(CPU_THREADS_ENV)
+        cpu_ids = os.environ.get(CPU_IDS_ENV)
+        return CpuInferenceProfile(int(thread_count) if thread_count else None, parse_cpu_ids(cpu_ids) if cpu_ids else None,
+                                   profile.strip().lower() == 'int8')
+
+    def get_cache_settings(self) -> dict:
+        """Returns the parts of the profile that change the layouts detected, for the layout cache key."""
+        return {"quantize" : self.quantize}
+
+    def for_worker(self, worker_number:int, worker_count:int) -> 'CpuInferenceProfile':
+        """Returns the profile of one of several workers sharing this profile, pinned to its own share of the
+        profile's cpus (or of the cpus the process can run on), with no more threads than it has cpus.
+
+        Args:
+            worker_number (int): The number of the worker, from 0.
+            worker_count (int): The number of workers sharing the profile.
+        """
+        cpu_ids = self.cpu_ids
+        if not cpu_ids and hasattr(os, "sched_getaffinity"):
+            cpu_ids = sorted(os.sched_getaffinity(0))
+        if not cpu_ids:
+            return CpuInferenceProfile(max(1, self.thread_count // worker_count), None, self.quantize)
+        share = max(1, len(cpu_ids) // worker_count)
+        start = (worker_number * share) % len(cpu_ids)
+        worker_cpu_ids = cpu_ids[start:start + share]
+        return CpuInferenceProfile(min(self.thread_count, len(worker_cpu_ids)), worker_cpu_ids, self.quantize)
+
+    def apply_threads(self):
+        """Pins this process to the profile's cpus and sets the number of threads torch uses. This only affects the
+        calling process, but is inherited by processes forked from it."""
+        if self.cpu_ids and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, self.cpu_ids)
+        torch.set_num_threads(self.thread_count)
+
+    def quantize_model(self, model:lp.Detectron2LayoutModel) -> lp.Detectron2LayoutModel:
+        """Converts the model in place if the profile quantizes it, returning it.
+
+        Args:
+            model (lp.Detectron2LayoutModel): The layout model, loaded on the cpu.
+        """
+        if self.quantize:
+            # dynamic quantization only covers fully connected (and recurrent) layers, which in the mask r-cnn
+            # are the box head's two large layers; the convolutions of the backbone stay in fp32
+            network = model.model.model
+            network.eval()
+            torch.ao.quantization.quantize_dynamic(network, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        return model
+
+    def apply(self, model:lp.Detectron2LayoutModel) -> lp.Detectron2LayoutModel:
+        """Sets up the process's threads and converts the model in place, returning it.
+
+        Args:
+            model (lp.Detectron2LayoutModel): The layout model, loaded on the cpu.
+        """
+        self.apply_threads()
+        return self.quantize_model(model)
@@ -1,4 +1,4 @@
-import pdf2image
+import itertools
 import numpy as np
 from pathlib import Path
 import os
@@ -12,9 +12,37 @@ from PIL import Image
 import torchvision.ops.boxes as bops
 import torch
 
+from utils.harvest.model_registry import ModelRegistry, get_model_registry
+from utils.harvest.page_images import iter_page_images, rasterize_page_region, DEFAULT_DPI
+from utils.harvest.text_layer import PageTextLayer, PageTextLayerReader, is_text_usable, image_to_pdf_bbox, POINTS_PER_INCH
+from utils.harvest.layout_join import LayoutBlock
+from utils.harvest.reading_order import get_reading_order
+from utils.harvest.layout_cache import LayoutCache
+from utils.harvest.layout_client import LayoutServerClient
+from utils.harvest.model_registry import LAYOUT_MODEL_CONFIG, LAYOUT_MODEL_EXTRA_CONFIG, LAYOUT_LABEL_MAP
+from utils.harvest.heuristic_layout import heuristic_layout, DEFAULT_CONFIDENCE_THRESHOLD
+
 pdf_dir : Path = Path(os.path.realpath(os.path.dirname(__file__))).parent.parent.parent.absolute()
 pdf_dir = pdf_dir.joinpath("data").joinpath("input")
 
+# the number of pages run through the layout model at once
+DEFAULT_LAYOUT_BATCH_SIZE = 4
+
+# the most memory a batch is estimated to use before it is split into smaller batches (1 GB)
+DEFAULT_MAX_BATCH_BYTES = 1024 * 1024 * 1024
+
+# the ways the layout of a document can be found
+HEURISTIC_LAYOUT_PATH = "heuristic"
+MODEL_LAYOUT_PATH = "model"
+
+# the resolutions used when detection runs on low resolution pages and only the text is rasterized at high resolution for OCR
+TWO_RESOLUTION_DETECTION_DPI = 100
+TWO_RESOLUTION_OCR_DPI = 300
+
+# a rough multiple of a resized page's input tensor size that the network's activations take up, 
+# used to estimate the memory of a batch
+ACTIVATION_MEMORY_FACTOR = 40
+
 class DocumentLayout:
     def __init__(self, filepath : str):
         self.pdf_dir = Path(filepath)
@@ -86,18 +114,225 @@ def refine(block_1 : TextBlock, block_2 : TextBlock) -> None:
         block_2.set(type='None', inplace= True) if a1 > a2 else block_1.set(type='None', inplace= True)
     
 
+def suppress_redundant_blocks(layout_result : lp.Layout) -> None:
+    """ Marks Text and Title blocks that overlap a larger Text or Title block with the type 'None', inplace.
+        This gives the same result as calling `refine` on every pair of blocks in order, but computes the
+        overlap and area of every pair at once and only visits the pairs that overlap.
+
+    Args:
+        layout_result (lp.Layout): The detected blocks of a page.
+    """
+    indices = [index for index, block in enumerate(layout_result) if block.type == 'Text' or block.type == 'Title']
+    if len(indices) < 2:
+        return
+
+    blocks = [layout_result[index] for index in indices]
+    boxes = torch.tensor([[block.block.x_1, block.block.y_1, block.block.x_2, block.block.y_2] for block in blocks], dtype=torch.float)
+    overlaps = bops.box_iou(boxes, boxes) != 0
+    # areas are computed from the float32 coordinates in double precision, like `compute_area`
+    boxes = boxes.double()
+    areas = ((boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])).tolist()
+
+    # the overlapping blocks of each block, in order
+    overlapping = [[] for _ in blocks]
+    for i, j in overlaps.nonzero().tolist():
+        overlapping[i].append(j)
+
+    # the pairs are visited in the same order as the pairwise loop, since the types change as it goes
+    for i, block_i in enumerate(blocks):
+        if block_i.type != 'Text' and block_i.type != 'Title':
+            continue
+        for j in overlapping[i]:
+            block_j = blocks[j]
+            if block_j.type != 'Text' and block_j.type != 'Title':
+                continue
+            if block_i != block_j:
+                block_j.set(type='None', inplace= True) if areas[i] > areas[j] else block_i.set(type='None', inplace= True)
+
+def _get_batches(inputs : list[dict], batch_size : int, max_batch_bytes : int) -> list[list[dict]]:
+    """ Splits model inputs into consecutive batches of at most `batch_size` inputs whose estimated 
+        memory stays under `max_batch_bytes` (a single input always makes a batch on its own).
+
+    Args:
+        inputs (list[dict]): Detectron2 model inputs, each holding a resized page image tensor.
+        batch_size (int): The most inputs in a batch.
+        max_batch_bytes (int): The most memory a batch is estimated to use.
+    """
+    batches = []
+    batch = []
+    batch_bytes = 0
+    for model_input in inputs:
+        input_bytes = model_input["image"].element_size() * model_input["image"].nelement() * ACTIVATION_MEMORY_FACTOR
+        if len(batch) > 0 and (len(batch) >= batch_size or batch_bytes + input_bytes > max_batch_bytes):
+            batches.append(batch)
+            batch = []
+            batch_bytes = 0
+        batch.append(model_input)
+        batch_bytes += input_bytes
+    if len(batch) > 0:
+        batches.append(batch)
+    return batches
+
+def detect_layouts(model : lp.Detectron2LayoutModel, imgs : list[np.ndarray], batch_size : int = DEFAULT_LAYOUT_BATCH_SIZE, 
+                   max_batch_bytes : int = DEFAULT_MAX_BATCH_BYTES, inference_mode : bool = False) -> list[lp.Layout]:
+    """ Returns the detected layout of each page image, in the same order as the images. Pages are run 
+        through the network in batches rather than one call each, which uses the cpu much better.
+
+    Args:
+        model (lp.Detectron2LayoutModel): The layout detection model, or the client of a layout server.
+        imgs (list[np.ndarray]): The page images, in color or grayscale (height x width arrays, which are converted to color).
+        batch_size (int, optional): The most pages run through the network at once. Defaults to DEFAULT_LAYOUT_BATCH_SIZE.
+        max_batch_bytes (int, optional): The most memory a batch is estimated to use, with batches over it split
+            into smaller ones. Defaults to DEFAULT_MAX_BATCH_BYTES.
+        inference_mode (bool, optional): Whether to run the network under `torch.inference_mode`, which skips more
+            autograd bookkeeping than `torch.no_grad` (see `CpuInferenceProfile`). Defaults to False.
+    """
+    if isinstance(model, LayoutServerClient):
+        # the server batches the pages itself, along with the pages of other workers
+        return model.detect_many(imgs)
+
+    # the network takes three channel images, so grayscale pages are repeated across the channels
+    imgs = [np.repeat(img[:, :, None], 3, axis=2) if img.ndim == 2 else img for img in imgs]
+
+    predictor = model.model
+    if batch_size <= 1 or not hasattr(predictor, "aug"):
+        # not a detectron2 predictor that can be batched
+        with torch.inference_mode() if inference_mode else torch.no_grad():
+            return [model.detect(img) for img in imgs]
+
+    # prepare the inputs the same way the predictor does for a single image (so the layouts match `model.detect`)
+    inputs = []
+    for img in imgs:
+        if predictor.input_format == "RGB":
+            img = img[:, :, ::-1]
+        height, width = img.shape[:2]
+        image = predictor.aug.get_transform(img).apply_image(img)
+        image = torch.as_tensor(image.astype("float32").transpose(2, 0, 1))
+        inputs.append({"image": image, "height": height, "width": width})
+
+    layouts = []
+    with torch.inference_mode() if inference_mode else torch.no_grad():
+        for batch in _get_batches(inputs, batch_size, max_batch_bytes):
+            layouts.extend([model.gather_output(outputs) for outputs in predictor.model(batch)])
+    return layouts
+
+def _crop_block_at_resolution(block : TextBlock, img : np.ndarray, pdf_file : str, page_number : int, dpi : int, ocr_dpi : int) -> np.ndarray:
+    """ Returns the region of a (padded) block rasterized at a higher resolution than the page image it was detected on.
+
+    Args:
+        block (TextBlock): The padded block, in pixels of the page image.
+        img (np.ndarray): The page image the block was detected on.
+        pdf_file (str): The path of the pdf.
+        page_number (int): The number of the page, starting at 1.
+        dpi (int): The resolution of the page image.
+        ocr_dpi (int): The resolution to rasterize the region at.
+    """
+    scale = ocr_dpi / dpi
+    page_height, page_width = img.shape[:2]
+    # clamp to the page like `crop_image` does, then map the coordinates to the higher resolution
+    x_1, y_1, x_2, y_2 = block.coordinates
+    x_1, y_1 = max(0, x_1), max(0, y_1)
+    x_2, y_2 = min(page_width, x_2), min(page_height, y_2)
+    x, y = int(x_1 * scale), int(y_1 * scale)
+    width, height = max(1, int(x_2 * scale) - x), max(1, int(y_2 * scale) - y)
+    return rasterize_page_region(pdf_file, page_number, ocr_dpi, x, y, width, height)
+
+def _add_page_layout_data(img : np.ndarray, layout_result : lp.Layout, index : int, res_layout_data : list[tuple], debug : bool,
+                          pdf_file : str = None, dpi : int = DEFAULT_DPI, ocr_dpi : int = None, text_layer : PageTextLayer = None) -> list[tuple[int, np.ndarray]]:
+    """ Refines the detected layout of a page, orders its blocks, and adds their (type, data) to the layout data.
+        Blocks whose text has to be read with OCR are added with `None` as their data, and their positions in the
+        layout data are returned with the images to read, so all the blocks of the page can be read at once.
+
+    Args:
+        img (np.ndarray): The page image.
+        layout_result (lp.Layout): The layout detected on the page.
+        index (int): The index of the page.
+        res_layout_data (list[tuple]): The layout data of the page to add its blocks to.
+        debug (bool): Prints debugging info when True.
+        pdf_file (str, optional): The path of the pdf, needed when the text is rasterized again for OCR.
+        dpi (int, optional): The resolution of the page image. Defaults to DEFAULT_DPI.
+        ocr_dpi (int, optional): The resolution to rasterize text blocks at for OCR, or None to crop them from the page image.
+        text_layer (PageTextLayer, optional): The text layer of the page, to read the text of blocks from instead of
+            using OCR when it has usable text in the block.
+    """
+    # get rid of redundant boxes
+    suppress_redundant_blocks(layout_result)
+
+    layout_blocks = lp.Layout([b for b in layout_result if b.type != 'None'])
+    
+    # order the boundary boxes for reading, column by column
+    layout_blocks = lp.Layout([layout_blocks[i] for i in get_reading_order([b.coordinates for b in layout_blocks])])
+
+    # use layout block ids to identfy read order
+    layout_blocks = lp.Layout([b.set(id = idx) for idx, b in enumerate(layout_blocks)])
+    
+    
 
-def document_layout(pdf_name : str, debug : bool = False) -> list[tuple]:
+
+    if(debug):
+        print("---------\nPage {}\n---------".format(index))
+        for result in layout_blocks:
+            print(result, "\n")
+        draw_im = lp.draw_box(img, layout_blocks,  box_width=5, box_alpha=0.2, show_element_type=True, show_element_id=True)
+        draw_im.save("page[{}]_layout_boxes.jpeg".format(index))
+
+
+    # the page in pdf coordinates, for locating the blocks (pdfminer puts the origin of a page at its bottom left)
+    page_height, page_width = img.shape[:2]
+    page_bbox = text_layer.bbox if text_layer is not None else (0, 0, page_width * POINTS_PER_INCH / dpi, page_height * POINTS_PER_INCH / dpi)
+
+    ocr_blocks = []
+    for block in layout_blocks:
+        bbox = image_to_pdf_bbox(block.coordinates, dpi, page_bbox)
+        if block.type == 'Text' or block.type == 'Title':
+            padded_block = block.pad(left=15, right=15, top=5, bottom=5)
+
+            # use the text already in the pdf when there is any that isn't garbled
+            text = None
+            if text_layer is not None:
+                text = text_layer.get_image_block_text(padded_block.coordinates, dpi)
+                if not is_text_usable(text):
+                    text = None
+
+            if text is None:
+                # Crop image around the detected layout to be read with the rest of the page
+                if ocr_dpi is None:
+                    segment_image = padded_block.crop_image(img)
+                else:
+                    segment_image = _crop_block_at_resolution(padded_block, img, pdf_file, index + 1, dpi, ocr_dpi)
+                ocr_blocks.append((len(res_layout_data), segment_image))
+            res_layout_data.append(LayoutBlock(block.type, text, index + 1, bbox))
+        else:
+            res_layout_data.append(LayoutBlock(block.type, "IMG DATA -- NOT ADDED", index + 1, bbox))
+
+    return ocr_blocks
+
+def document_layout(pdf_name : str, debug : bool = False, model_registry : ModelRegistry = None, batch_size : int = DEFAULT_LAYOUT_BATCH_SIZE,
+                    dpi : int = DEFAULT_DPI, thread_count : int = 1, ocr_dpi : int = None, use_text_layer : bool = True,
+                    layout_cache : LayoutCache = None) -> list[tuple]:
     """Parses a pdf in search of document element order for the purpose of tagging
 
     Args:
         pdf_name (str): A relative or absolute path to a pdf file. If relative, will check the data input DIR
         debug (bool, optional): Prints debugging info when True. Defaults to False.
+        model_registry (ModelRegistry, optional): Where to get the layout model and OCR agent from. Defaults to 
+            the registry shared by the process, so they are only loaded for the first document.
+        batch_size (int, optional): The number of pages to detect the layout of at once. Defaults to DEFAULT_LAYOUT_BATCH_SIZE.
+        dpi (int, optional): The resolution to rasterize the pages at. Defaults to DEFAULT_DPI.
+        thread_count (int, optional): The number of poppler processes rasterizing the pages. Defaults to 1.
+        ocr_dpi (int, optional): When set, the layout is detected on pages rasterized at `dpi` and only the Text and Title
+            blocks are rasterized again at this resolution for OCR (see TWO_RESOLUTION_DETECTION_DPI and TWO_RESOLUTION_OCR_DPI).
+            Defaults to None, which crops the blocks for OCR from the same page images.
+        use_text_layer (bool, optional): Whether to read the text of blocks from the pdf's text layer, only using OCR
+            for blocks where it is missing or garbled. Defaults to True.
+        layout_cache (LayoutCache, optional): A cache of the blocks found on previously parsed pages, checked before 
+            running the model and OCR on a page. Defaults to None.
 
     Raises:
         FileNotFoundError: Raises if the function could not locate the provided pdf.
     Returns:
-        list[tuple]: List is ordered according to the read order. Each tuple element: (type, data)
+        list[tuple]: List is ordered according to the read order. Each tuple element: (type, data), as a `LayoutBlock`
+            that also has the page number and pdf bbox of the block
     """
 
     # if pdf_name is an absolute path then this will make pdf_file -> pdf_name
@@ -108,78 +343,116 @@ def document_layout(pdf_name : str, debug : bool = False) -> list[tuple]:
     
     res_layout_data : list[tuple] = []
 
-    # convert the pdf into a set of images
-    imgs = [np.asarray(page_img) for page_img in pdf2image.convert_from_path(pdf_file)]
-
-    #imgs = np.asarray(pdf2image.convert_from_path(pdf_file)[0])
-
-    
-    #pdf2image.convert_from_path(pdf_file)[0].save('pdf2img.jpeg', 'JPEG')
-
-    # model used to detect boundary boxes for layout text.
-    model = lp.Detectron2LayoutModel('lp://PubLayNet/mask_rcnn_X_101_32x8d_FPN_3x/config',
-                                 extra_config=["MODEL.ROI_HEADS.SCORE_THRESH_TEST", 0.5],
-                                 label_map={0: "Text", 1: "Title", 2: "List", 3:"Table", 4:"Figure"})
-
-    
-    ocr_agent = lp.TesseractAgent(languages='eng')
-    
-    for index, img in enumerate(imgs):
-        # use model to identify layout boxes in the pdf
-        layout_result = model.detect(img)
-        
-        # get rid of redundant boxes
-        for layout_i in layout_result:
-            
-            if layout_i.type != 'Text' and layout_i.type != 'Title':
-                continue
-
-            for layout_j in layout_result:
-                
-                if layout_j.type != 'Text' and layout_j.type != 'Title':
+    # model used to detect boundary boxes for layout text (loaded once per process).
+    if model_registry is None:
+        model_registry = get_model_registry()
+    model = model_registry.get_layout_model()
+    ocr_agent = model_registry.get_batch_ocr_agent()
+
+    # convert the pdf into images a batch at a time (the images are reused buffers, so only a batch is in memory at once)
+    page_images = iter_page_images(str(pdf_file), dpi=dpi, window_size=batch_size, thread_count=thread_count)
+    # the text layer is laid out a page at a time alongside the images
+    text_layer_reader = PageTextLayerReader(str(pdf_file)) if use_text_layer else None
+
+    # everything the blocks found on a page depend on besides the page image
+    cache_settings = {
+        "model_config" : LAYOUT_MODEL_CONFIG,
+        "model_extra_config" : LAYOUT_MODEL_EXTRA_CONFIG,
+        "label_map" : LAYOUT_LABEL_MAP,
+        "dpi" : dpi,
+        "ocr_dpi" : ocr_dpi,
+        "use_text_layer" : use_text_layer,
+        "cpu_profile" : None if model_registry.cpu_profile is None else model_registry.cpu_profile.get_cache_settings()
+    }
+
+    index = -1
+    ocr_count = 0
+    cache_hit_count = 0
+    try:
+        while True:
+            imgs = list(itertools.islice(page_images, batch_size))
+            if len(imgs) == 0:
+                break
+
+            # read the text layer of each page first, since the text of cached blocks depends on it as well as the image
+            text_layers = [None if text_layer_reader is None else text_layer_reader.read_next_page() for _ in imgs]
+
+            # look up the pages that have been parsed before
+            cache_keys = [None] * len(imgs) if layout_cache is None else [layout_cache.get_key(img, cache_settings, None if text_layer is None else text_layer.get_hash())
+                                                                          for img, text_layer in zip(imgs, text_layers)]
+            cached_page_data = [None if cache_key is None else layout_cache.get_page_layout(cache_key, index + 2 + page_offset) for page_offset, cache_key in enumerate(cache_keys)]
+
+            # use model to identify layout boxes in the pages that weren't cached
+            layout_results = iter(detect_layouts(model, [img for img, page_data in zip(imgs, cached_page_data) if page_data is None], batch_size,
+                                                 inference_mode=model_registry.cpu_profile is not None))
+
+            # order the blocks of each page and start reading the ones that need OCR, a page per OCR call
+            batch_pages = []
+            for img, text_layer, cache_key, page_data in zip(imgs, text_layers, cache_keys, cached_page_data):
+                index += 1
+                if page_data is not None:
+                    cache_hit_count += 1
+                    batch_pages.append((None, page_data, [], None))
                     continue
-
-                if layout_i != layout_j: 
-                    refine(layout_i, layout_j)
-
-        layout_blocks = lp.Layout([b for b in layout_result if b.type != 'None'])
-        
-        # sort boundary boxes by y-coordinates
-        # ! Need better method for this
-        layout_blocks.sort(key = lambda b:b.coordinates[1], inplace=True)
-
-        # use layout block ids to identfy read order
-        layout_blocks = lp.Layout([b.set(id = idx) for idx, b in enumerate(layout_blocks)])
-        
-        
-
-
-        if(debug):
-            print("---------\nPage {}\n---------".format(index))
-            for result in layout_blocks:
-                print(result, "\n")
-            draw_im = lp.draw_box(img, layout_blocks,  box_width=5, box_alpha=0.2, show_element_type=True, show_element_id=True)
-            draw_im.save("page[{}]_layout_boxes.jpeg".format(index))
-
-
-        for block in layout_blocks:
-            if block.type == 'Text' or block.type == 'Title':
-                # Crop image around the detected layout
-                segment_image = (block
-                                .pad(left=15, right=15, top=5, bottom=5)
-                                .crop_image(img))
-                
-                # Perform OCR
-                text = ocr_agent.detect(segment_image)
-                res_layout_data.append((block.type, text))
-            else:
-                res_layout_data.append((block.type, "IMG DATA -- NOT ADDED"))
+                page_data = []
+                ocr_blocks = _add_page_layout_data(img, next(layout_results), index, page_data, debug, str(pdf_file), dpi, ocr_dpi, text_layer)
+                ocr_future = ocr_agent.submit([segment_image for _, segment_image in ocr_blocks]) if len(ocr_blocks) > 0 else None
+                batch_pages.append((cache_key, page_data, ocr_blocks, ocr_future))
+
+            # fill in the text read from each page before the page images are reused for the next batch
+            for cache_key, page_data, ocr_blocks, ocr_future in batch_pages:
+                if ocr_future is not None:
+                    for (position, _), text in zip(ocr_blocks, ocr_future.result()):
+                        block = page_data[position]
+                        page_data[position] = LayoutBlock(block.type, text, block.page_number, block.bbox)
+                    ocr_count += len(ocr_blocks)
+                # only pages that were just parsed have a key to cache them under
+                if cache_key is not None:
+                    layout_cache.put_page_layout(cache_key, page_data)
+                res_layout_data.extend(page_data)
+    finally:
+        if text_layer_reader is not None:
+            text_layer_reader.close()
     
     if debug:
+        text_block_count = len([block_type for block_type, _ in res_layout_data if block_type == 'Text' or block_type == 'Title'])
+        print("OCR used for {} of {} text blocks".format(ocr_count, text_block_count))
+        if layout_cache is not None:
+            print("Layout cache hits: {} of {} pages (hit rate {:.0%} for this cache)".format(cache_hit_count, index + 1, layout_cache.get_stats()["hit_rate"]))
         for type, data in res_layout_data:
             print("Tag: {}".format(type))
             print(data, "\n")
+
+    return res_layout_data
             
+def document_layout_with_fast_path(pdf_name : str, debug : bool = False,
+                                   confidence_threshold : float = DEFAULT_CONFIDENCE_THRESHOLD, **layout_options) -> tuple[list[tuple], str, float]:
+    """Parses a pdf in search of document element order like `document_layout`, but first tries the heuristic layout
+    (see `heuristic_layout`), which doesn't need the layout model. The model is only run when the heuristics aren't
+    confident in the layout they found.
+
+    Args:
+        pdf_name (str): A relative or absolute path to a pdf file. If relative, will check the data input DIR
+        debug (bool, optional): Prints debugging info when True. Defaults to False.
+        confidence_threshold (float, optional): The lowest heuristic confidence that skips the model. Defaults to DEFAULT_CONFIDENCE_THRESHOLD.
+        layout_options: Any other arguments for `document_layout`.
+
+    Raises:
+        FileNotFoundError: Raises if the function could not locate the provided pdf.
+    Returns:
+        tuple[list[tuple], str, float]: The layout data, the path used to find it (HEURISTIC_LAYOUT_PATH or MODEL_LAYOUT_PATH),
+            and the heuristic confidence.
+    """
+    pdf_file : Path = pdf_dir.joinpath(pdf_name)
+    if not pdf_file.exists():
+        raise FileNotFoundError("Pdf File not found: {}".format(pdf_file))
+
+    res_layout_data, confidence = heuristic_layout(str(pdf_file))
+    if debug:
+        print("Heuristic layout confidence: {:.2f}".format(confidence))
+    if confidence >= confidence_threshold:
+        return res_layout_data, HEURISTIC_LAYOUT_PATH, confidence
+    return document_layout(pdf_name, debug, **layout_options), MODEL_LAYOUT_PATH, confidence
 
 def main():
     document_layout('example.pdf', True)
@@ -0,0 +1,131 @@
+# ===================================================
+# File: extraction_cache.py
+# Date: 10/18/2026
+# Description: Caches the paragraphs extracted from
+#   pdfs on disk, keyed by the content of the pdf.
+# ==================================================
+
+import math
+import zlib
+import struct
+import hashlib
+from utils.disk_cache import DiskCache, DEFAULT_MAX_SIZE_BYTES
+from utils.harvest.paragraph import Paragraph, FontStyle
+from utils.harvest.pdf_extractor import EXTRACTOR_VERSION
+
+# identifies the binary format of the cache entries
+ENTRY_MAGIC = b'PARA2'
+
+# the size of the chunks read when hashing pdfs
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def _pack_str(value: str) -> bytes:
+    '''Returns a length prefixed utf-8 encoding of a string.'''
+    encoded_value = value.encode('utf-8')
+    return struct.pack('<I', len(encoded_value)) + encoded_value
+
+def _unpack_str(data: bytes, offset: int) -> 'tuple[str, int]':
+    '''Returns the string packed at an offset and the offset after it.'''
+    (length,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    return data[offset:offset + length].decode('utf-8'), offset + length
+
+def encode_paragraphs(paragraphs: 'list[Paragraph]') -> bytes:
+    '''Returns a compact binary form of a list of `Paragraph` objects. Font sizes and families are stored
+    once in a table and referenced by index, styles take a byte each, the page number (0 when unknown) and
+    bbox (NaN when unknown) are stored with each paragraph, and the whole thing is compressed.
+
+    Args:
+        paragraphs (list[Paragraph]): The paragraphs to encode.
+    '''
+    font_table = {}
+    paragraph_data = [struct.pack('<I', len(paragraphs))]
+    for paragraph in paragraphs:
+        font_size_id = font_table.setdefault(paragraph.font_size, len(font_table))
+        font_family_id = font_table.setdefault(paragraph.font_family, len(font_table))
+        bbox = paragraph.bbox if paragraph.bbox is not None else (math.nan,) * 4
+        paragraph_data.append(struct.pack('<IIII4d', font_size_id, font_family_id, len(paragraph.text_info), paragraph.page_number or 0, *bbox))
+        for text, font_style in paragraph.text_info:
+            paragraph_data.append(struct.pack('<B', font_style.value) + _pack_str(text))
+
+    font_table_data = [struct.pack('<I', len(font_table))] + [_pack_str(font) for font in font_table.keys()]
+    return ENTRY_MAGIC + zlib.compress(b''.join(font_table_data + paragraph_data))
+
+def decode_paragraphs(data: bytes) -> 'list[Paragraph]':
+    '''Returns the list of `Paragraph` objects from their binary form.
+
+    Args:
+        data (bytes): The paragraphs encoded with `encode_paragraphs`.
+    '''
+    if not data.startswith(ENTRY_MAGIC):
+        raise ValueError('Not an encoded paragraph list')
+    data = zlib.decompress(data[len(ENTRY_MAGIC):])
+
+    # read the table of font sizes and families
+    (font_count,) = struct.unpack_from('<I', data, 0)
+    offset = 4
+    font_table = []
+    for _ in range(font_count):
+        font, offset = _unpack_str(data, offset)
+        font_table.append(font)
+
+    # read the paragraphs
+    (paragraph_count,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    paragraphs = []
+    for _ in range(paragraph_count):
+        font_size_id, font_family_id, section_count, page_number, *bbox = struct.unpack_from('<IIII4d', data, offset)
+        offset += struct.calcsize('<IIII4d')
+        text_info = []
+        for _ in range(section_count):
+            font_style = FontStyle(data[offset])
+            text, offset = _unpack_str(data, offset + 1)
+            text_info.append((text, font_style))
+        paragraphs.append(Paragraph(text_info, font_table[font_size_id], font_table[font_family_id],
+                                    None if page_number == 0 else page_number, None if math.isnan(bbox[0]) else bbox))
+    return paragraphs
+
+class ExtractionCache(DiskCache):
+    '''Caches the output of `extract_paragraphs_and_fonts_and_sizes` on disk, keyed by the SHA-256 of the 
+    pdf bytes and the extractor version so the same pdf is only ever extracted once.'''
+
+    def __init__(self, cache_directory: str, max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES):
+        '''Initializes the `ExtractionCache`.
+
+        Args:
+            cache_directory (str): The directory to store the extracted paragraphs in.
+            max_size_bytes (int): The most bytes the cache can take up before the least recently used entries are evicted.
+        '''
+        super().__init__(cache_directory, max_size_bytes)
+
+    def get_key(self, pdf_file_path: str) -> str:
+        '''Returns the cache key of a pdf.
+
+        Args:
+            pdf_file_path (str): The string path of the pdf file.
+        '''
+        pdf_hash = hashlib.sha256()
+        with open(pdf_file_path, 'rb') as pdf_file:
+            for chunk in iter(lambda: pdf_file.read(HASH_CHUNK_SIZE), b''):
+                pdf_hash.update(chunk)
+        return pdf_hash.hexdigest() + '-v' + EXTRACTOR_VERSION
+
+    def get_paragraphs(self, key: str) -> 'list[Paragraph]':
+        '''Returns the paragraphs cached for a key, or `None` if they have not been cached.
+
+        Args:
+            key (str): The cache key of the pdf from `get_key`.
+        '''
+        data = self.get(key)
+        if data is None:
+            return None
+        return decode_paragraphs(data)
+
+    def put_paragraphs(self, key: str, paragraphs: 'list[Paragraph]'):
+        '''Caches the paragraphs extracted from a pdf.
+
+        Args:
+            key (str): The cache key of the pdf from `get_key`.
+            paragraphs (list[Paragraph]): The paragraphs extracted from the pdf.
+        '''
+        self.put(key, encode_paragraphs(paragraphs))
@@ -0,0 +1,218 @@
+# ===================================================
+# File: heuristic_layout.py
+# Date: 10/18/2026
+# Description: Finds the layout of simple born-digital
+#   pdfs (one or two columns of text with a clear
+#   font hierarchy) from pdfminer's text boxes and the
+#   font sizes of the text, without the layout model,
+#   along with how confident it is in the result.
+# ==================================================
+
+import re
+import statistics
+from collections import Counter
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LAParams, LTPage, LTTextBox, LTTextLine, LTChar, LTFigure, LTImage, LTRect, LTLine, LTCurve
+from utils.harvest.layout_join import LayoutBlock
+from utils.harvest.text_layer import CONTROL_CID_PATTERN, is_text_usable
+
+# the data given for blocks whose text isn't read, matching `document_layout`
+NON_TEXT_BLOCK_DATA = "IMG DATA -- NOT ADDED"
+
+# a box in a font this many times the size of the body text, with no more than this many words, is a title
+TITLE_SIZE_RATIO = 1.2
+MAX_TITLE_WORDS = 20
+
+# a short single line box in a bold font at least the size of the body text, with no more than this many words, is a title
+MAX_BOLD_TITLE_WORDS = 12
+
+# the start of a list item: a bullet or dash, or a number or letter followed by a period or parenthesis
+LIST_ITEM_PATTERN = re.compile(r'^\s*([•●▪◦–\-\*]|\(?\d{1,3}[.)]|\(?[a-zA-Z][.)])\s+')
+
+# the fraction of a box's lines that have to start like a list item for it to be a list
+MIN_LIST_LINE_FRACTION = 0.5
+
+# figures smaller than this fraction of the page are ignored (like logos and icons in the margins)
+MIN_FIGURE_AREA_FRACTION = 0.01
+
+# a page with more ruling lines and rectangles than this probably has a table, which the heuristics can't find
+TABLE_GRAPHICS_COUNT = 20
+
+# how far past the middle of the page a column can reach (as a fraction of the page width), and how wide a box
+# has to be to span both columns
+COLUMN_TOLERANCE = 0.05
+SPANNING_WIDTH_FRACTION = 0.6
+
+# the fraction of a page's text that has to be in the right column for the page to have two columns
+MIN_RIGHT_COLUMN_FRACTION = 0.2
+
+# how much a page's confidence is lowered when it probably has a table, and by the fraction of the page covered in figures
+TABLE_CONFIDENCE_FACTOR = 0.5
+FIGURE_CONFIDENCE_WEIGHT = 0.5
+
+# documents with a confidence below this have their layout found with the layout model instead
+DEFAULT_CONFIDENCE_THRESHOLD = 0.75
+
+class _TextBoxInfo():
+    """The parts of a pdfminer text box the heuristics use, so the pdfminer objects don't need to be kept."""
+    __slots__ = ('bbox', 'lines', 'font_size', 'is_bold')
+
+    def __init__(self, text_box:LTTextBox):
+        """Reads the lines, main font size, and boldness of a text box."""
+        self.bbox = text_box.bbox
+        self.lines = []
+        font_sizes = Counter()
+        bold_characters = 0
+        for line in text_box:
+            if not isinstance(line, LTTextLine):
+                continue
+            line_text = CONTROL_CID_PATTERN.sub('', line.get_text()).strip()
+            if len(line_text) > 0:
+                self.lines.append(line_text)
+            for character in line:
+                if isinstance(character, LTChar):
+                    font_sizes[round(character.size * 2) / 2] += 1
+                    if 'bold' in character.fontname.lower():
+                        bold_characters += 1
+        character_count = sum(font_sizes.values())
+        self.font_size = font_sizes.most_common(1)[0][0] if character_count > 0 else 0
+        self.is_bold = character_count > 0 and bold_characters / character_count > 0.5
+
+    def get_text(self) -> str:
+        """Returns the text of the box with a line break between lines."""
+        return '\n'.join(self.lines)
+
+class _PageInfo():
+    """The text boxes, figures, and confidence of a page."""
+
+    def __init__(self, ltpage:LTPage):
+        """Reads the parts of a page laid out by pdfminer."""
+        self.bbox = ltpage.bbox
+        page_width = self.bbox[2] - self.bbox[0]
+        page_area = page_width * (self.bbox[3] - self.bbox[1])
+        self.text_boxes = []
+        self.figure_bboxes = []
+        graphics_count = 0
+        for element in ltpage:
+            if isinstance(element, LTTextBox):
+                text_box = _TextBoxInfo(element)
+                if len(text_box.lines) > 0:
+                    self.text_boxes.append(text_box)
+            elif isinstance(element, (LTFigure, LTImage)):
+                if element.width * element.height >= page_area * MIN_FIGURE_AREA_FRACTION:
+                    self.figure_bboxes.append(element.bbox)
+            elif isinstance(element, (LTRect, LTLine, LTCurve)):
+                graphics_count += 1
+
+        self.has_content = len(self.text_boxes) > 0 or len(self.figure_bboxes) > 0 or graphics_count > 0
+        right_column_length = sum([len(text_box.get_text()) for text_box in self.text_boxes if self._get_column(text_box.bbox) == 1])
+        text_length = sum([len(text_box.get_text()) for text_box in self.text_boxes])
+        self.is_two_column = text_length > 0 and right_column_length / text_length >= MIN_RIGHT_COLUMN_FRACTION
+        self.confidence = self._get_confidence(page_area, graphics_count)
+
+    def _is_spanning(self, bbox:tuple) -> bool:
+        """Returns whether a box spans both columns of the page."""
+        return bbox[2] - bbox[0] >= (self.bbox[2] - self.bbox[0]) * SPANNING_WIDTH_FRACTION
+
+    def _get_column(self, bbox:tuple) -> int:
+        """Returns 0 for a box in the left column (or spanning the page), 1 for the right column, and -1 for a box
+        that straddles the middle of the page without spanning it (like centered text)."""
+        page_width = self.bbox[2] - self.bbox[0]
+        middle = self.bbox[0] + page_width / 2
+        tolerance = page_width * COLUMN_TOLERANCE
+        if self._is_spanning(bbox) or bbox[2] <= middle + tolerance:
+            return 0
+        if bbox[0] >= middle - tolerance:
+            return 1
+        return -1
+
+    def _get_confidence(self, page_area:float, graphics_count:int) -> float:
+        """Returns how well the page fits a one or two column layout of readable text, from 0 to 1. On a page with
+        two columns, text that straddles them can't be placed in the reading order, so it lowers the confidence."""
+        if not self.has_content:
+            return 1.0
+        text = '\n'.join([text_box.get_text() for text_box in self.text_boxes])
+        if not is_text_usable(text):
+            # a scanned page or one with a broken text layer
+            return 0.0
+
+        # the fraction of the text that sits in the columns
+        confidence = 1.0
+        if self.is_two_column:
+            text_lengths = [len(text_box.get_text()) for text_box in self.text_boxes]
+            column_length = sum([length for text_box, length in zip(self.text_boxes, text_lengths) if self._get_column(text_box.bbox) != -1])
+            confidence = column_length / sum(text_lengths)
+
+        figure_area = sum([(x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in self.figure_bboxes])
+        confidence *= 1 - FIGURE_CONFIDENCE_WEIGHT * min(1.0, figure_area / page_area)
+        if graphics_count > TABLE_GRAPHICS_COUNT:
+            confidence *= TABLE_CONFIDENCE_FACTOR
+        return confidence
+
+    def get_ordered_blocks(self) -> list:
+        """Returns the ("text", text box, bbox) and ("figure", None, bbox) blocks of the page in reading order, top to
+        bottom. On a page with two columns, boxes spanning the page split it into bands, and within a band the left
+        column is read before the right one."""
+        if not self.is_two_column:
+            return sorted([("text", text_box, text_box.bbox) for text_box in self.text_boxes] + [("figure", None, bbox) for bbox in self.figure_bboxes], key=lambda block: -block[2][3])
+
+        spanning_tops = sorted([text_box.bbox[3] for text_box in self.text_boxes if self._is_spanning(text_box.bbox)], reverse=True)
+        blocks = [("text", text_box, text_box.bbox) for text_box in self.text_boxes] + [("figure", None, bbox) for bbox in self.figure_bboxes]
+
+        def get_sort_key(block):
+            _, _, bbox = block
+            top = bbox[3]
+            # the band is the number of spanning boxes above this box (a spanning box starts its own band)
+            band = len([spanning_top for spanning_top in spanning_tops if spanning_top > top])
+            column = -1 if self._is_spanning(bbox) else max(0, self._get_column(bbox))
+            return (band, column, -top)
+
+        return sorted(blocks, key=get_sort_key)
+
+def get_body_font_size(text_boxes:'list[_TextBoxInfo]') -> float:
+    """Returns the font size most of the text of the text boxes is in, or 0 if there is no text. It is found from
+    the same text boxes that are compared against it, since their sizes are rounded to the half point while the
+    sizes of extracted paragraphs are truncated to whole points."""
+    font_sizes = Counter()
+    for text_box in text_boxes:
+        font_sizes[text_box.font_size] += len(text_box.get_text())
+    return font_sizes.most_common(1)[0][0] if len(font_sizes) > 0 else 0
+
+def _get_text_box_type(text_box:_TextBoxInfo, body_font_size:float) -> str:
+    """Returns the block type of a text box: "Title", "List", or "Text"."""
+    word_count = len(text_box.get_text().split())
+    if body_font_size > 0 and text_box.font_size >= body_font_size * TITLE_SIZE_RATIO and word_count <= MAX_TITLE_WORDS:
+        return "Title"
+    if text_box.is_bold and len(text_box.lines) == 1 and text_box.font_size >= body_font_size and word_count <= MAX_BOLD_TITLE_WORDS:
+        return "Title"
+    list_line_count = len([line for line in text_box.lines if LIST_ITEM_PATTERN.match(line) is not None])
+    if list_line_count > 0 and list_line_count / len(text_box.lines) >= MIN_LIST_LINE_FRACTION:
+        return "List"
+    return "Text"
+
+def heuristic_layout(pdf_file_path:str) -> 'tuple[list[tuple], float]':
+    """Returns the layout of a pdf as the same `LayoutBlock`s as `document_layout`, along with a confidence
+    from 0 to 1 in it. The confidence is 0 when any page has no usable text (so it needs OCR), and otherwise the
+    average of how well each page fits one or two columns of text without tables or large figures.
+
+    Args:
+        pdf_file_path (str): The path of the pdf.
+    """
+    pages = [_PageInfo(ltpage) for ltpage in extract_pages(pdf_file_path, laparams=LAParams())]
+    content_pages = [page for page in pages if page.has_content]
+    if len(content_pages) == 0:
+        return [], 0.0
+    confidence = 0.0 if min([page.confidence for page in content_pages]) == 0 else statistics.mean([page.confidence for page in content_pages])
+
+    # the body text is in the most used font size
+    body_font_size = get_body_font_size([text_box for page in pages for text_box in page.text_boxes])
+
+    res_layout_data = []
+    for page_number, page in enumerate(pages, 1):
+        for block_kind, text_box, bbox in page.get_ordered_blocks():
+            if block_kind == "figure":
+                res_layout_data.append(LayoutBlock("Figure", NON_TEXT_BLOCK_DATA, page_number, bbox))
+                continue
+            block_type = _get_text_box_type(text_box, body_font_size)
+            res_layout_data.append(LayoutBlock(block_type, text_box.get_text() if block_type == "Text" or block_type == "Title" else NON_TEXT_BLOCK_DATA, page_number, bbox))
+    return res_layout_data, confidence
@@ -0,0 +1,84 @@
+# ===================================================
+# File: layout_cache.py
+# Date: 10/18/2026
+# Description: Caches the layout blocks and text found
+#   on pdf pages on disk, keyed by the rendered page
+#   and the settings used to find them.
+# ==================================================
+
+import json
+import zlib
+import hashlib
+from utils.disk_cache import DiskCache, DEFAULT_MAX_SIZE_BYTES
+from utils.harvest.layout_join import LayoutBlock
+
+# changes whenever the way page layouts are found changes, so old entries aren't used
+LAYOUT_CACHE_VERSION = '2'
+
+def encode_page_layout(page_layout_data: 'list[tuple]') -> bytes:
+    '''Returns the compressed bytes of the (type, data) blocks of a page, along with their bboxes. The page number
+    isn't stored, since the same page can be at a different place in another document.'''
+    blocks = [[block[0], block[1], getattr(block, 'bbox', None)] for block in page_layout_data]
+    return zlib.compress(json.dumps(blocks, ensure_ascii=False).encode('utf-8'))
+
+def decode_page_layout(data: bytes, page_number: int = None) -> 'list[LayoutBlock]':
+    '''Returns the blocks of a page from the bytes made by `encode_page_layout`.
+
+    Args:
+        data (bytes): The encoded blocks.
+        page_number (int): The number of the page the blocks are on, starting at 1, if known.
+    '''
+    return [LayoutBlock(block_type, block_data, page_number, bbox) for block_type, block_data, bbox in json.loads(zlib.decompress(data).decode('utf-8'))]
+
+class LayoutCache(DiskCache):
+    '''Caches the (type, data) blocks of pages on disk, keyed by the SHA-256 of the page image along with the
+    model and resolution settings, so unchanged pages (including pages shared between versions of a document)
+    are only run through the layout model and OCR once.'''
+
+    def __init__(self, cache_directory: str, max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES):
+        '''Initializes the `LayoutCache`.
+
+        Args:
+            cache_directory (str): The directory to store the page layouts in.
+            max_size_bytes (int): The most bytes the cache can take up before the least recently used entries are evicted.
+        '''
+        super().__init__(cache_directory, max_size_bytes)
+
+    def get_key(self, page_image, settings: dict, text_layer_hash: str = None) -> str:
+        '''Returns the cache key of a page.
+
+        Args:
+            page_image (np.ndarray): The rendered page.
+            settings (dict): Everything else the layout of the page depends on, like the model config and resolution.
+            text_layer_hash (str): The hash of the page's text layer from `PageTextLayer.get_hash` when the text of
+                its blocks is read from the text layer, since the same image can have a different text layer.
+        '''
+        page_hash = hashlib.sha256()
+        page_hash.update(json.dumps(settings, sort_keys=True).encode('utf-8'))
+        if text_layer_hash is not None:
+            page_hash.update(text_layer_hash.encode('ascii'))
+        page_hash.update(str(page_image.shape).encode('ascii'))
+        # hash the pixels in place when they are laid out in one block
+        page_hash.update(page_image.data if page_image.flags.c_contiguous else page_image.tobytes())
+        return page_hash.hexdigest() + '-v' + LAYOUT_CACHE_VERSION
+
+    def get_page_layout(self, key: str, page_number: int = None) -> 'list[LayoutBlock]':
+        '''Returns the blocks cached for a key, or `None` if they have not been cached.
+
+        Args:
+            key (str): The cache key of the page from `get_key`.
+            page_number (int): The number of the page in the document being parsed, starting at 1, to give the blocks.
+        '''
+        data = self.get(key)
+        if data is None:
+            return None
+        return decode_page_layout(data, page_number)
+
+    def put_page_layout(self, key: str, page_layout_data: 'list[tuple]'):
+        '''Caches the (type, data) blocks found on a page.
+
+        Args:
+            key (str): The cache key of the page from `get_key`.
+            page_layout_data (list[tuple]): The blocks of the page.
+        '''
+        self.put(key, encode_page_layout(page_layout_data))
@@ -0,0 +1,190 @@
+# ===================================================
+# File: layout_client.py
+# Date: 10/18/2026
+# Description: Sends page images to a shared layout
+#   server process through shared memory and a Unix
+#   socket, so workers don't each need their own copy
+#   of the layout model.
+# ==================================================
+
+import os
+import json
+import time
+import socket
+import tempfile
+import threading
+import numpy as np
+import layoutparser as lp
+from multiprocessing import shared_memory
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+# the socket the layout server listens on by default
+DEFAULT_SOCKET_PATH = os.path.join(tempfile.gettempdir(), "accessibility_apps_layout.sock")
+
+# seconds to wait for the layout of a page, which includes waiting for the pages of other workers ahead of it
+DEFAULT_REQUEST_TIMEOUT = 300
+
+class LayoutServerError(Exception):
+    """Raised when the layout server cannot be reached or fails to detect the layout of a page."""
+
+def encode_layout(layout:lp.Layout) -> list:
+    """Returns the blocks of a detected layout as [x_1, y_1, x_2, y_2, type, score] lists that can be sent as json."""
+    return [[float(coordinate) for coordinate in block.coordinates] + [block.type, None if block.score is None else float(block.score)] for block in layout]
+
+def decode_layout(blocks:list) -> lp.Layout:
+    """Returns the layout from the blocks made by `encode_layout`, with the same blocks as the layout model returns."""
+    return lp.Layout([lp.TextBlock(lp.Rectangle(x_1, y_1, x_2, y_2), type=block_type, score=score) for x_1, y_1, x_2, y_2, block_type, score in blocks])
+
+class _PendingPage():
+    """A page image waiting on the server, and the shared memory it was sent in."""
+
+    def __init__(self, image:np.ndarray):
+        """Copies the image into a new shared memory block."""
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        self.shape = image.shape
+        self.memory = shared_memory.SharedMemory(create=True, size=max(1, image.nbytes))
+        np.ndarray(image.shape, dtype=np.uint8, buffer=self.memory.buf)[...] = image
+        self.future = Future()
+
+    def release(self):
+        """Frees the shared memory once the server is done with it."""
+        self.memory.close()
+        self.memory.unlink()
+
+class LayoutServerClient():
+    """Detects the layout of pages with a layout server (see `layout_server`), with the same `detect` as the
+    layout model. Pages sent together are batched by the server with each other and with the pages of other
+    workers. The connection is opened by the first page and reopened after the server restarts."""
+
+    def __init__(self, socket_path:str=DEFAULT_SOCKET_PATH, timeout:float=DEFAULT_REQUEST_TIMEOUT):
+        """Initializes the client without connecting.
+
+        Args:
+            socket_path (str): The socket the server listens on.
+            timeout (float): Seconds to wait for the layout of a page.
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._socket = None
+        self._lock = threading.Lock()
+        self._pending_pages = {}
+        self._next_request_id = 0
+
+    def _connect(self) -> socket.socket:
+        """Returns the connection to the server, connecting if needed. Should be called while holding the lock."""
+        if self._socket is None:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                connection.connect(self.socket_path)
+            except OSError as e:
+                connection.close()
+                raise LayoutServerError("The layout server could not be reached at {}: {}".format(self.socket_path, e))
+            self._socket = connection
+            # responses are read on their own thread so pages can be waiting on the server at the same time
+            threading.Thread(target=self._read_responses, args=[connection], daemon=True).start()
+        return self._socket
+
+    def _read_responses(self, connection:socket.socket):
+        """Hands each response from the server to the page waiting on it until the connection closes."""
+        with connection.makefile("r", encoding="utf-8") as responses:
+            try:
+                for line in responses:
+                    try:
+                        response = json.loads(line)
+                    except ValueError:
+                        continue
+                    with self._lock:
+                        page = self._pending_pages.pop(response.get("id"), None)
+                    if page is None:
+                        continue
+                    page.release()
+                    if response.get("ok"):
+                        page.future.set_result(decode_layout(response["blocks"]))
+                    else:
+                        page.future.set_exception(LayoutServerError(response.get("error")))
+            except OSError:
+                pass
+
+        # the connection closed, so fail anything still waiting on it
+        with self._lock:
+            if self._socket is connection:
+                self._socket = None
+            pending_pages = self._pending_pages
+            self._pending_pages = {}
+        for page in pending_pages.values():
+            page.release()
+            page.future.set_exception(LayoutServerError("The connection to the layout server closed"))
+
+    def submit(self, image:np.ndarray) -> Future:
+        """Sends a page image to the server and returns a future for its layout.
+
+        Args:
+            image (np.ndarray): The page image.
+        """
+        return self._submit(image)[1]
+
+    def _submit(self, image:np.ndarray) -> 'tuple[int, Future]':
+        """Sends a page image to the server and returns its request id and a future for its layout."""
+        page = _PendingPage(image)
+        with self._lock:
+            try:
+                connection = self._connect()
+            except LayoutServerError:
+                page.release()
+                raise
+            request_id = self._next_request_id
+            self._next_request_id += 1
+            self._pending_pages[request_id] = page
+            try:
+                connection.sendall((json.dumps({"id" : request_id, "memory" : page.memory.name, "shape" : list(page.shape)}) + "\n").encode("utf-8"))
+            except OSError as e:
+                self._pending_pages.pop(request_id, None)
+                page.release()
+                raise LayoutServerError("The layout server could not be sent a page: " + str(e))
+        return request_id, page.future
+
+    def detect_many(self, images:'list[np.ndarray]') -> 'list[lp.Layout]':
+        """Returns the layout of each page image, sending them all before waiting so the server can batch them.
+
+        Args:
+            images (list[np.ndarray]): The page images.
+        """
+        futures = []
+        request_ids = []
+        for image in images:
+            request_id, future = self._submit(image)
+            request_ids.append(request_id)
+            futures.append(future)
+
+        # the whole batch shares one deadline, so a hung server doesn't keep it waiting a timeout per page
+        deadline = time.monotonic() + self.timeout
+        try:
+            return [future.result(max(0, deadline - time.monotonic())) for future in futures]
+        except FutureTimeoutError:
+            # stop waiting on the pages the server hasn't answered, and free their images
+            with self._lock:
+                unanswered_pages = [self._pending_pages.pop(request_id) for request_id in request_ids if request_id in self._pending_pages]
+            for page in unanswered_pages:
+                page.release()
+                page.future.cancel()
+            raise LayoutServerError("The layout server timed out")
+
+    def detect(self, image:np.ndarray) -> lp.Layout:
+        """Returns the layout of a page image.
+
+        Args:
+            image (np.ndarray): The page image.
+        """
+        return self.detect_many([image])[0]
+
+    def close(self):
+        """Closes the connection, failing any pages still waiting on the server."""
+        with self._lock:
+            connection = self._socket
+            self._socket = None
+        if connection is not None:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            connection.close()
@@ -0,0 +1,121 @@
+# ===================================================
+# File: layout_join.py
+# Date: 10/18/2026
+# Description: Layout blocks that know where they are
+#   on their page, and a spatial index of paragraphs
+#   for finding the paragraphs inside each block.
+# ==================================================
+
+from utils.harvest.paragraph import Paragraph
+from utils.harvest.spatial_index import GridIndex
+
+# the width and height of the grid cells paragraphs are indexed in, in pdf points (paragraphs are a lot
+# bigger than the characters the text layer indexes)
+PARAGRAPH_CELL_SIZE = 64
+
+class LayoutBlock(tuple):
+    """A (type, data) block of a document's layout that also knows where it is: `page_number` (starting at 1)
+    and `bbox`, the (x0, y0, x1, y1) of the block in pdf coordinates, which are `None` when unknown. It unpacks
+    and compares like the (type, data) tuple, so it can be used anywhere one is."""
+
+    def __new__(cls, block_type:str, data:str, page_number:int=None, bbox:tuple=None):
+        """Creates the block.
+
+        Args:
+            block_type (str): The type of the block, like "Text" or "Figure".
+            data (str): The text of the block, or a note that it has none.
+            page_number (int): The number of the page the block is on, starting at 1.
+            bbox (tuple): The (x0, y0, x1, y1) of the block in pdf coordinates.
+        """
+        block = super().__new__(cls, (block_type, data))
+        block.page_number = page_number
+        block.bbox = None if bbox is None else tuple(bbox)
+        return block
+
+    @property
+    def type(self) -> str:
+        """The type of the block."""
+        return self[0]
+
+    @property
+    def data(self) -> str:
+        """The text of the block, or a note that it has none."""
+        return self[1]
+
+    def __reduce__(self):
+        """Keeps the location when the block is pickled."""
+        return (LayoutBlock, (self[0], self[1], self.page_number, self.bbox))
+
+    def __repr__(self) -> str:
+        """Returns the string representation of the block."""
+        return "LayoutBlock({!r}, {!r}, {}, {})".format(self[0], self[1], self.page_number, self.bbox)
+
+class ParagraphIndex():
+    """The paragraphs of a document in a grid index per page, for finding the paragraphs in a region of a page
+    without looking at every paragraph. Paragraphs without a page number or bbox (like ones extracted from html)
+    aren't indexed."""
+
+    def __init__(self, paragraphs:'list[Paragraph]', cell_size:float=PARAGRAPH_CELL_SIZE):
+        """Indexes the paragraphs.
+
+        Args:
+            paragraphs (list[Paragraph]): The paragraphs of the document (or any iterable of them, like a `ParagraphStore`).
+            cell_size (float): The width and height of a grid cell, in pdf points.
+        """
+        self.cell_size = cell_size
+        # the index of each page's paragraphs, by page number
+        self.pages = {}
+        for paragraph in paragraphs:
+            page_number, bbox = paragraph.page_number, paragraph.bbox
+            if page_number is None or bbox is None:
+                continue
+            page_index = self.pages.get(page_number)
+            if page_index is None:
+                page_index = GridIndex(cell_size)
+                self.pages[page_number] = page_index
+            page_index.insert(bbox, paragraph)
+
+    def query(self, page_number:int, bbox:tuple) -> 'list[Paragraph]':
+        """Returns the paragraphs on a page that overlap a region, in document order.
+
+        Args:
+            page_number (int): The page, starting at 1.
+            bbox (tuple): The (x0, y0, x1, y1) region in pdf coordinates.
+        """
+        page_index = self.pages.get(page_number)
+        return [] if page_index is None else page_index.query(bbox)
+
+    def query_point(self, page_number:int, x:float, y:float) -> 'list[Paragraph]':
+        """Returns the paragraphs on a page that contain a point, in document order.
+
+        Args:
+            page_number (int): The page, starting at 1.
+            x (float): The x coordinate of the point in pdf coordinates.
+            y (float): The y coordinate of the point in pdf coordinates.
+        """
+        page_index = self.pages.get(page_number)
+        return [] if page_index is None else page_index.query_point(x, y)
+
+    def get_block_paragraphs(self, block:LayoutBlock) -> 'list[Paragraph]':
+        """Returns the paragraphs whose centers are inside a block, in document order, or an empty list if the
+        block's location is unknown.
+
+        Args:
+            block (LayoutBlock): The block.
+        """
+        page_number, bbox = getattr(block, "page_number", None), getattr(block, "bbox", None)
+        page_index = self.pages.get(page_number)
+        if page_index is None or bbox is None:
+            return []
+        return page_index.query_centers(bbox)
+
+def join_blocks_to_paragraphs(layout_blocks:'list[LayoutBlock]', paragraphs:'list[Paragraph]') -> 'list[list[Paragraph]]':
+    """Returns the paragraphs inside each layout block, in the same order as the blocks. A paragraph is inside a
+    block when its center is, so a paragraph inside overlapping blocks is listed with each of them.
+
+    Args:
+        layout_blocks (list[LayoutBlock]): The layout blocks of a document.
+        paragraphs (list[Paragraph]): The paragraphs of the document.
+    """
+    paragraph_index = ParagraphIndex(paragraphs)
+    return [paragraph_index.get_block_paragraphs(block) for block in layout_blocks]
@@ -0,0 +1,218 @@
+# ===================================================
+# File: layout_server.py
+# Date: 10/18/2026
+# Description: A process that holds the one copy of
+#   the layout model for every pipeline worker on a
+#   host, detecting the layout of the pages they send
+#   in batches of pages that arrive together.
+# ==================================================
+
+#! Run the server from the parent directory or module (accessibility_apps) to avoid relative import errors.
+# python -m utils.harvest.layout_server [socket path]
+
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import threading
+import numpy as np
+import multiprocessing
+from multiprocessing import shared_memory, resource_tracker
+from utils.harvest.model_registry import ModelRegistry
+from utils.harvest.cpu_inference import CpuInferenceProfile
+from utils.harvest.document_layout import detect_layouts
+from utils.harvest.layout_client import DEFAULT_SOCKET_PATH, LayoutServerError, encode_layout
+
+# the most pages detected at once, and the longest the first page of a batch waits for more pages to join it
+DEFAULT_MAX_BATCH_SIZE = 4
+DEFAULT_MAX_BATCH_WAIT = 0.05
+
+# seconds to wait for a started server to load the model and listen
+DEFAULT_START_TIMEOUT = 300
+
+class _PageRequest():
+    """A page sent by a worker, read from its shared memory."""
+    __slots__ = ('connection', 'send_lock', 'id', 'memory', 'image')
+
+    def __init__(self, connection:socket.socket, send_lock:threading.Lock, request:dict):
+        """Attaches to the shared memory of a request."""
+        self.connection = connection
+        self.send_lock = send_lock
+        self.id = request["id"]
+        self.memory = shared_memory.SharedMemory(name=request["memory"])
+        # the worker owns the memory and unlinks it, so this process shouldn't clean it up when it exits
+        resource_tracker.unregister(self.memory._name, "shared_memory")
+        self.image = np.ndarray(tuple(request["shape"]), dtype=np.uint8, buffer=self.memory.buf)
+
+    def respond(self, response:dict):
+        """Sends the response to the worker and detaches from the shared memory."""
+        # the image has to be let go before the memory can be closed
+        self.image = None
+        self.memory.close()
+        response["id"] = self.id
+        try:
+            with self.send_lock:
+                self.connection.sendall((json.dumps(response) + "\n").encode("utf-8"))
+        except OSError:
+            # the worker went away, so there is no one to tell
+            pass
+
+class LayoutServer():
+    """Listens on a Unix socket for page images from `LayoutServerClient`s and detects their layouts with one
+    model. Pages are queued as they arrive, and the first page waiting is batched with the pages that arrive
+    within `max_batch_wait` seconds, up to `max_batch_size` pages."""
+
+    def __init__(self, socket_path:str=DEFAULT_SOCKET_PATH, max_batch_size:int=DEFAULT_MAX_BATCH_SIZE, max_batch_wait:float=DEFAULT_MAX_BATCH_WAIT,
+                 model_registry:ModelRegistry=None):
+        """Initializes the server without loading the model.
+
+        Args:
+            socket_path (str): The socket to listen on.
+            max_batch_size (int): The most pages detected at once.
+            max_batch_wait (float): The longest the first page of a batch waits for more pages, in seconds.
+            model_registry (ModelRegistry): Where to load the model from. Defaults to a registry of its own (with the
+                cpu profile from the environment), so the model is loaded here even when the process is set up to use
+                a layout server.
+        """
+        self.socket_path = socket_path
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait = max_batch_wait
+        self.model_registry = ModelRegistry(cpu_profile=CpuInferenceProfile.from_environment()) if model_registry is None else model_registry
+        self.requests = queue.Queue()
+        self._listener = None
+        self._stopped = threading.Event()
+        # the number of batches and pages detected, for seeing how full the batches are
+        self.batch_count = 0
+        self.page_count = 0
+
+    def _read_requests(self, connection:socket.socket):
+        """Queues each page a worker sends until it disconnects."""
+        send_lock = threading.Lock()
+        with connection, connection.makefile("r", encoding="utf-8") as requests:
+            try:
+                for line in requests:
+                    request = None
+                    try:
+                        request = json.loads(line)
+                        self.requests.put(_PageRequest(connection, send_lock, request))
+                    except (ValueError, KeyError, TypeError, OSError) as e:
+                        response = {"id" : request.get("id") if isinstance(request, dict) else None, "ok" : False, "error" : "Bad request: " + str(e)}
+                        with send_lock:
+                            connection.sendall((json.dumps(response) + "\n").encode("utf-8"))
+            except OSError:
+                pass
+
+    def _get_batch(self) -> 'list[_PageRequest]':
+        """Waits for a page and returns it with the pages that arrive within the batch wait, or an empty list
+        when the server is stopped."""
+        while not self._stopped.is_set():
+            try:
+                batch = [self.requests.get(timeout=0.5)]
+                break
+            except queue.Empty:
+                continue
+        else:
+            return []
+        deadline = time.monotonic() + self.max_batch_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.requests.get(timeout=remaining) if remaining > 0 else self.requests.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run_batches(self, model):
+        """Detects the layouts of the queued pages a batch at a time until the server is stopped."""
+        while True:
+            batch = self._get_batch()
+            if len(batch) == 0:
+                return
+            try:
+                layouts = detect_layouts(model, [request.image for request in batch], self.max_batch_size,
+                                         inference_mode=self.model_registry.cpu_profile is not None)
+            except Exception as e:
+                for request in batch:
+                    request.respond({"ok" : False, "error" : "Layout detection failed: " + str(e)})
+                continue
+            self.batch_count += 1
+            self.page_count += len(batch)
+            for request, layout in zip(batch, layouts):
+                request.respond({"ok" : True, "blocks" : encode_layout(layout)})
+
+    def serve_forever(self):
+        """Loads the model, then listens for workers until `stop` is called."""
+        self.model_registry.warm_up()
+        model = self.model_registry.get_layout_model()
+
+        # a socket left behind by a server that didn't shut down cleanly would stop this one from listening
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(self.socket_path)
+        self._listener.listen()
+        batch_thread = threading.Thread(target=self._run_batches, args=[model], daemon=True)
+        batch_thread.start()
+        try:
+            while not self._stopped.is_set():
+                try:
+                    connection, _ = self._listener.accept()
+                except OSError:
+                    break
+                threading.Thread(target=self._read_requests, args=[connection], daemon=True).start()
+        finally:
+            self.stop()
+            batch_thread.join()
+
+    def stop(self):
+        """Stops listening and detecting pages."""
+        self._stopped.set()
+        if self._listener is not None:
+            try:
+                self._listener.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._listener.close()
+            self._listener = None
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+def _serve(socket_path:str, max_batch_size:int, max_batch_wait:float):
+    """Runs a layout server until the process is terminated."""
+    LayoutServer(socket_path, max_batch_size, max_batch_wait).serve_forever()
+
+def start_layout_server(socket_path:str=DEFAULT_SOCKET_PATH, max_batch_size:int=DEFAULT_MAX_BATCH_SIZE, max_batch_wait:float=DEFAULT_MAX_BATCH_WAIT,
+                        start_timeout:float=DEFAULT_START_TIMEOUT) -> multiprocessing.Process:
+    """Starts a layout server process and waits for it to load the model and listen. Workers use it by setting
+    LAYOUT_SERVER_SOCKET_ENV to the socket path (see `ModelRegistry`). Raises `LayoutServerError` if it doesn't start.
+
+    Args:
+        socket_path (str): The socket to listen on.
+        max_batch_size (int): The most pages detected at once.
+        max_batch_wait (float): The longest the first page of a batch waits for more pages, in seconds.
+        start_timeout (float): Seconds to wait for the server to load the model and listen.
+    """
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    # a fresh interpreter, so the server doesn't inherit the threads and state of the process starting it
+    process = multiprocessing.get_context("spawn").Process(target=_serve, args=[socket_path, max_batch_size, max_batch_wait], daemon=True)
+    process.start()
+    deadline = time.monotonic() + start_timeout
+    while time.monotonic() < deadline:
+        if not process.is_alive():
+            raise LayoutServerError("The layout server exited while starting")
+        if os.path.exists(socket_path):
+            return process
+        time.sleep(0.1)
+    process.terminate()
+    raise LayoutServerError("The layout server timed out while starting")
+
+if __name__ == "__main__":
+    server = LayoutServer(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SOCKET_PATH)
+    print("Layout server loading the model, then listening on {}".format(server.socket_path))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,19 @@
+# ===================================================
+# File: model_preload.py
+# Date: 10/18/2026
+# Description: Importing this module loads the layout
+#   model into the process, so a fork server that
+#   preloads it hands every worker it forks a copy-on-
+#   write copy of the weights.
+# ==================================================
+
+import gc
+from utils.harvest.model_registry import get_model_registry
+
+# only the weights are loaded, without running the model, since the threads torch starts on the first
+# inference don't survive a fork (and without pinning the fork server, which every worker would inherit,
+# since each worker sets up its own threads)
+get_model_registry().preload_layout_model()
+
+# keep the garbage collector from touching (and so copying) the pages of everything loaded so far in the workers
+gc.freeze()
@@ -0,0 +1,163 @@
+# ===================================================
+# File: model_registry.py
+# Date: 10/18/2026
+# Description: Loads the layout detection model and
+#   OCR agent once per process and shares them between
+#   documents, recording how long they took to load
+#   and how much memory they use.
+# ==================================================
+
+import os
+import time
+import threading
+import numpy as np
+import layoutparser as lp
+from utils.harvest.batch_ocr import BatchOcrAgent
+from utils.harvest.layout_client import LayoutServerClient
+from utils.harvest.cpu_inference import CpuInferenceProfile
+
+# the layout detection model and the types of blocks it detects
+LAYOUT_MODEL_CONFIG = 'lp://PubLayNet/mask_rcnn_X_101_32x8d_FPN_3x/config'
+LAYOUT_MODEL_EXTRA_CONFIG = ["MODEL.ROI_HEADS.SCORE_THRESH_TEST", 0.5]
+LAYOUT_LABEL_MAP = {0: "Text", 1: "Title", 2: "List", 3:"Table", 4:"Figure"}
+
+# the languages the OCR agent reads
+OCR_LANGUAGES = 'eng'
+
+# the environment variable with the socket of a layout server (see `layout_server`) for workers to use instead of loading the model
+LAYOUT_SERVER_SOCKET_ENV = 'LAYOUT_SERVER_SOCKET'
+
+# the size of the blank page the models are warmed up on
+WARM_UP_IMAGE_SIZE = (1100, 850)
+
+def _get_resident_memory_bytes() -> int:
+    """Returns the resident memory of this process in bytes, or 0 if it cannot be read."""
+    try:
+        with open("/proc/self/statm", "r") as statm_file:
+            resident_pages = int(statm_file.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+class ModelRegistry():
+    """Holds the layout model and OCR agent for a process. Each is loaded the first time it is asked
+    for (or by `warm_up`), and only once even when several threads ask for it at the same time. When the
+    registry is given a layout server, its client stands in for the layout model."""
+
+    def __init__(self, layout_server_path:str=None, cpu_profile:CpuInferenceProfile=None):
+        """Initializes the registry without loading anything.
+
+        Args:
+            layout_server_path (str): The socket of a layout server to detect layouts with, or `None` to load the model in this process.
+            cpu_profile (CpuInferenceProfile): How to run the model on the cpu, or `None` for the default. The model is
+                quantized when it is loaded, and the threads of each process are set up the first time it gets the model.
+        """
+        self.layout_server_path = layout_server_path
+        self.cpu_profile = cpu_profile
+        self._layout_model = None
+        # the process the cpu profile's threads were set up in (a forked worker sets up its own)
+        self._cpu_threads_pid = None
+        self._batch_ocr_agent = None
+        self._lock = threading.Lock()
+        self._warmed_up = False
+        # the load time in seconds and memory increase in bytes of each model, by name
+        self.metrics = {}
+
+    def _load(self, name:str, load_function):
+        """Loads a model and records its metrics. Should be called while holding the lock.
+
+        Args:
+            name (str): The name to record the metrics under.
+            load_function (function): Loads and returns the model.
+        """
+        memory_before = _get_resident_memory_bytes()
+        start_time = time.perf_counter()
+        model = load_function()
+        self.metrics[name] = {
+            "load_seconds" : time.perf_counter() - start_time,
+            "memory_bytes" : max(0, _get_resident_memory_bytes() - memory_before)
+        }
+        return model
+
+    def _load_layout_model(self) -> lp.Detectron2LayoutModel:
+        """Loads the layout detection model, quantizing it if the cpu profile does."""
+        model = lp.Detectron2LayoutModel(LAYOUT_MODEL_CONFIG, extra_config=LAYOUT_MODEL_EXTRA_CONFIG, label_map=LAYOUT_LABEL_MAP)
+        if self.cpu_profile is not None:
+            model = self.cpu_profile.quantize_model(model)
+        return model
+
+    def apply_cpu_profile(self, cpu_profile:CpuInferenceProfile):
+        """Sets up this process's threads with a cpu profile, which is used from now on (like a worker's share of
+        the host's cpus). It should quantize the model the same way as the profile it was loaded with.
+
+        Args:
+            cpu_profile (CpuInferenceProfile): The profile.
+        """
+        with self._lock:
+            self.cpu_profile = cpu_profile
+            cpu_profile.apply_threads()
+            self._cpu_threads_pid = os.getpid()
+
+    def _apply_cpu_threads(self):
+        """Sets up the threads of this process with the cpu profile if they haven't been yet."""
+        if self.cpu_profile is not None and self._cpu_threads_pid != os.getpid():
+            with self._lock:
+                if self._cpu_threads_pid != os.getpid():
+                    self.cpu_profile.apply_threads()
+                    self._cpu_threads_pid = os.getpid()
+
+    def preload_layout_model(self):
+        """Loads the layout detection model without setting up the threads of this process, for a fork server whose
+        workers each set up their own."""
+        if self._layout_model is None:
+            with self._lock:
+                if self._layout_model is None:
+                    if self.layout_server_path is not None:
+                        self._layout_model = self._load("layout_model", lambda: LayoutServerClient(self.layout_server_path))
+                    else:
+                        self._layout_model = self._load("layout_model", self._load_layout_model)
+
+    def get_layout_model(self) -> lp.Detectron2LayoutModel:
+        """Returns the layout detection model (or the client of the layout server), loading it if needed."""
+        self._apply_cpu_threads()
+        self.preload_layout_model()
+        return self._layout_model
+
+    def get_batch_ocr_agent(self) -> BatchOcrAgent:
+        """Returns the OCR agent that reads all the blocks of a page at once, creating it if needed."""
+        if self._batch_ocr_agent is None:
+            with self._lock:
+                if self._batch_ocr_agent is None:
+                    self._batch_ocr_agent = self._load("batch_ocr_agent", lambda: BatchOcrAgent(OCR_LANGUAGES))
+        return self._batch_ocr_agent
+
+    def warm_up(self):
+        """Loads both models and runs them once on a blank page, so the first document doesn't pay for
+        loading the weights or the lazy setup done on the first inference."""
+        layout_model = self.get_layout_model()
+        ocr_agent = self.get_batch_ocr_agent()
+        with self._lock:
+            if self._warmed_up:
+                return
+            blank_page = np.full(WARM_UP_IMAGE_SIZE + (3,), 255, dtype=np.uint8)
+            memory_before = _get_resident_memory_bytes()
+            start_time = time.perf_counter()
+            layout_model.detect(blank_page)
+            ocr_agent.recognize([blank_page[:100, :100]])
+            self.metrics["warm_up"] = {
+                "load_seconds" : time.perf_counter() - start_time,
+                "memory_bytes" : max(0, _get_resident_memory_bytes() - memory_before)
+            }
+            self._warmed_up = True
+
+    def get_metrics(self) -> dict:
+        """Returns the load time in seconds and memory increase in bytes of each model loaded so far."""
+        with self._lock:
+            return {name : dict(metrics) for name, metrics in self.metrics.items()}
+
+# the registry shared by everything in this process
+_model_registry = ModelRegistry(os.environ.get(LAYOUT_SERVER_SOCKET_ENV), CpuInferenceProfile.from_environment())
+
+def get_model_registry() -> ModelRegistry:
+    """Returns the model registry shared by everything in this process."""
+    return _model_registry
@@ -0,0 +1,95 @@
+# ===================================================
+# File: page_images.py
+# Date: 10/18/2026
+# Description: Rasterizes the pages of a pdf a small
+#   window at a time into reused numpy buffers, so the
+#   memory needed doesn't grow with the page count,
+#   and rasterizes regions of pages on their own.
+# ==================================================
+
+import io
+import subprocess
+import pdf2image
+import numpy as np
+from PIL import Image
+
+# the resolution pages are rasterized at (the pdf2image default)
+DEFAULT_DPI = 200
+
+# the number of pages rasterized at once
+DEFAULT_WINDOW_SIZE = 4
+
+def get_pdf_page_count(pdf_file_path:str) -> int:
+    """Returns the number of pages in a pdf, read by poppler without rasterizing anything."""
+    return pdf2image.pdfinfo_from_path(pdf_file_path)["Pages"]
+
+class _BufferRing():
+    """A fixed number of reusable byte buffers handed out in turn, each grown when an image doesn't fit in it."""
+
+    def __init__(self, size:int):
+        """Initializes the ring with `size` empty buffers."""
+        self.buffers = [np.empty(0, dtype=np.uint8) for _ in range(size)]
+        self.next_buffer = 0
+
+    def copy_image(self, image) -> np.ndarray:
+        """Copies a PIL image into the next buffer and returns the array view of it."""
+        shape = (image.height, image.width) if image.mode == "L" else (image.height, image.width, len(image.getbands()))
+        byte_count = int(np.prod(shape))
+        buffer = self.buffers[self.next_buffer]
+        if buffer.size < byte_count:
+            buffer = np.empty(byte_count, dtype=np.uint8)
+            self.buffers[self.next_buffer] = buffer
+        self.next_buffer = (self.next_buffer + 1) % len(self.buffers)
+
+        page_image = buffer[:byte_count].reshape(shape)
+        np.copyto(page_image, np.asarray(image))
+        return page_image
+
+def iter_page_images(pdf_file_path:str, dpi:int=DEFAULT_DPI, grayscale:bool=False, window_size:int=DEFAULT_WINDOW_SIZE, thread_count:int=1, page_count:int=None):
+    """Returns a generator of the page images of a pdf as numpy arrays, rasterizing `window_size` pages at a time.
+
+    The arrays are views of `window_size` buffers that are reused, so an array is only valid until `window_size`
+    more pages have been generated. Copy any array that needs to be kept longer than that.
+
+    Args:
+        pdf_file_path (str): The path of the pdf.
+        dpi (int): The resolution to rasterize the pages at.
+        grayscale (bool): Whether to rasterize the pages in grayscale (height x width arrays) rather than
+            color (height x width x 3 arrays).
+        window_size (int): The number of pages rasterized at once.
+        thread_count (int): The number of poppler processes rasterizing each window.
+        page_count (int): The number of pages in the pdf, if it is already known.
+    """
+    if page_count is None:
+        page_count = get_pdf_page_count(pdf_file_path)
+    buffer_ring = _BufferRing(window_size)
+
+    for first_page in range(1, page_count + 1, window_size):
+        last_page = min(first_page + window_size - 1, page_count)
+        page_images = pdf2image.convert_from_path(pdf_file_path, dpi=dpi, first_page=first_page, last_page=last_page, grayscale=grayscale, thread_count=thread_count)
+        # hand each page over as an array and drop its PIL image
+        for page_number in range(len(page_images)):
+            page_image = buffer_ring.copy_image(page_images[page_number])
+            page_images[page_number] = None
+            yield page_image
+
+def rasterize_page_region(pdf_file_path:str, page_number:int, dpi:int, x:int, y:int, width:int, height:int, grayscale:bool=False) -> np.ndarray:
+    """Returns an image of just a rectangle of a page, rasterized by poppler without rendering the rest of the page.
+
+    Args:
+        pdf_file_path (str): The path of the pdf.
+        page_number (int): The number of the page, starting at 1.
+        dpi (int): The resolution to rasterize the region at.
+        x (int): The left of the region in pixels at that resolution.
+        y (int): The top of the region in pixels at that resolution.
+        width (int): The width of the region in pixels.
+        height (int): The height of the region in pixels.
+        grayscale (bool): Whether to rasterize the region in grayscale rather than color.
+    """
+    command = ["pdftoppm", "-r", str(dpi), "-f", str(page_number), "-l", str(page_number), "-x", str(x), "-y", str(y), "-W", str(width), "-H", str(height)]
+    if grayscale:
+        command.append("-gray")
+    # without an output file name the image is written to stdout
+    command.append(pdf_file_path)
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    return np.asarray(Image.open(io.BytesIO(process.stdout)))
@@ -2,11 +2,14 @@
 # File: paragraph.py
 # Author: Trent Bultsma
 # Date: 11/15/2022
-# Description: Defines a class to store a paragraph with 
+# Description: Defines a class to store a paragraph with
 # text, font size, font family, and font style data.
 # =======================================================
 
+import sys
+import math
 from enum import Enum
+from array import array
 
 class FontStyle(Enum):
     '''Represents the style of text.'''
@@ -15,33 +18,76 @@ class FontStyle(Enum):
     ITALIC = 3
     BOLD_ITALIC = 4
 
+# font styles indexed by their value, for turning stored style bytes back into `FontStyle`s
+_FONT_STYLES_BY_VALUE = (None,) + tuple(FontStyle)
+
+def parse_font_size(font_size) -> 'int | float':
+    '''Returns the numeric value of a font size given either as a number or a string like "10px".'''
+    if not isinstance(font_size, str):
+        return font_size
+    if font_size.endswith('px'):
+        font_size = font_size[:-len('px')]
+    try:
+        return int(font_size)
+    except ValueError:
+        return float(font_size)
+
+def format_font_size(font_size_value: 'int | float') -> str:
+    '''Returns the string form of a numeric font size, like "10px".'''
+    if font_size_value == int(font_size_value):
+        return str(int(font_size_value)) + 'px'
+    return str(font_size_value) + 'px'
+
 class Paragraph():
-    '''Defines a paragraph with text, font size, font family, and font style data.'''
-    
-    def __init__(self, text_info: list[tuple[str, FontStyle]], font_size: str, font_family: str):
+    '''Defines a paragraph with text, font size, font family, and font style data.
+
+    The font size is kept as a number (`font_size_value`), the font family name is interned so paragraphs
+    in the same font share one string, and the font styles are packed into bytes.
+
+    Paragraphs extracted from a page's layout also know where they are: `page_number` (starting at 1) and
+    `bbox`, the (x0, y0, x1, y1) of the paragraph in pdf coordinates. Both are `None` when unknown, and
+    neither is part of comparing paragraphs.
+    '''
+    __slots__ = ('_texts', '_styles', 'font_size_value', 'font_family', 'page_number', 'bbox')
+
+    def __init__(self, text_info: list[tuple[str, FontStyle]], font_size: 'str | int | float', font_family: str,
+                 page_number: int = None, bbox: 'tuple[float, float, float, float]' = None):
         '''Initializes the `Paragraph`.'''
-        self.font_size = font_size
-        self.font_family = font_family
-        self.text_info = text_info
+        self.font_size_value = parse_font_size(font_size)
+        self.font_family = sys.intern(font_family)
+        self._texts = tuple([text for text, _ in text_info])
+        self._styles = bytes([font_style.value for _, font_style in text_info])
+        self.page_number = page_number
+        self.bbox = None if bbox is None else tuple(bbox)
+
+    @property
+    def font_size(self) -> str:
+        '''The font size as a string, like "10px".'''
+        return format_font_size(self.font_size_value)
+
+    @property
+    def text_info(self) -> list[tuple[str, FontStyle]]:
+        '''A list of the (text, font style) sections of the paragraph.'''
+        return [(text, _FONT_STYLES_BY_VALUE[style]) for text, style in zip(self._texts, self._styles)]
 
     def __eq__(self, other: object) -> bool:
         '''Returns whether the other object is equivalent to this Paragraph object.'''
-        
+
         # make sure the other object is a Paragraph
-        if type(other) is not Paragraph:
+        if not isinstance(other, Paragraph):
             return False
 
         # make sure the text info, font size, and font family match for both objects
-        if self.font_size != other.font_size:
+        if self.font_size_value != other.font_size_value:
             return False
         if self.font_family != other.font_family:
             return False
-        for ((thisText, thisStyle), (otherText, otherStyle)) in zip(self.text_info, other.text_info):
+        for ((thisText, thisStyle), (otherText, otherStyle)) in zip(zip(self._texts, self._styles), zip(other._texts, other._styles)):
             if thisText != otherText:
                 return False
             if thisStyle != otherStyle:
                 return False
-        
+
         # if we got to here, they must have the same value for everything
         return True
 
@@ -51,7 +97,135 @@ class Paragraph():
 
     def get_raw_text(self):
         '''Returns the text of the paragraph without any style formatting.'''
-        text_list = []
-        for text, font_style in self.text_info:
-            text_list.append(text)
-        return " ".join(text_list)
\ No newline at end of file
+        return " ".join(self._texts)
+
+class ParagraphView(Paragraph):
+    '''A `Paragraph` that reads its data from a row of a `ParagraphStore` instead of holding it.'''
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: 'ParagraphStore', index: int):
+        '''Initializes the `ParagraphView`.
+
+        Args:
+            store (ParagraphStore): The store holding the paragraph.
+            index (int): The index of the paragraph in the store.
+        '''
+        self._store = store
+        self._index = index
+
+    @property
+    def font_size_value(self) -> 'int | float':
+        '''The font size of the paragraph as a number.'''
+        font_size_value = self._store.font_sizes[self._index]
+        return int(font_size_value) if font_size_value.is_integer() else font_size_value
+
+    @property
+    def font_family(self) -> str:
+        '''The font family of the paragraph.'''
+        return self._store.font_families[self._store.font_ids[self._index]]
+
+    @property
+    def page_number(self) -> int:
+        '''The number of the page the paragraph is on, starting at 1, or `None` if unknown.'''
+        page_number = self._store.page_numbers[self._index]
+        return None if page_number == 0 else page_number
+
+    @property
+    def bbox(self) -> 'tuple[float, float, float, float]':
+        '''The (x0, y0, x1, y1) of the paragraph in pdf coordinates, or `None` if unknown.'''
+        bbox = tuple(self._store.bboxes[self._index * 4:self._index * 4 + 4])
+        return None if math.isnan(bbox[0]) else bbox
+
+    @property
+    def _texts(self) -> 'tuple[str]':
+        '''The text of each section of the paragraph.'''
+        store = self._store
+        text = store.get_text_buffer()
+        first_section = store.section_offsets[self._index]
+        last_section = store.section_offsets[self._index + 1]
+        return tuple([text[store.text_offsets[section]:store.text_offsets[section + 1]] for section in range(first_section, last_section)])
+
+    @property
+    def _styles(self) -> bytes:
+        '''The font style value of each section of the paragraph.'''
+        store = self._store
+        return bytes(store.styles[store.section_offsets[self._index]:store.section_offsets[self._index + 1]])
+
+class ParagraphStore():
+    '''Stores many paragraphs in columns rather than as separate objects: an array of font sizes, a font
+    family id per paragraph into a table of names, a page number and four bbox coordinates per paragraph
+    (0 and NaN when unknown), a style byte per text section, and all the text in a single buffer with offsets.
+    Indexing and iterating give `ParagraphView`s, so a store can be used anywhere a list of `Paragraph`s is.'''
+
+    def __init__(self, paragraphs: 'list[Paragraph]' = ()):
+        '''Initializes the `ParagraphStore`.
+
+        Args:
+            paragraphs (list[Paragraph]): Paragraphs (or any iterable of them) to add to the store.
+        '''
+        self.font_sizes = array('d')
+        self.font_ids = array('I')
+        self.font_families = []
+        self._font_family_ids = {}
+        self.page_numbers = array('I')
+        self.bboxes = array('d')
+        # the sections of paragraph i are [section_offsets[i], section_offsets[i + 1])
+        self.section_offsets = array('I', [0])
+        self.styles = bytearray()
+        # the text of section j is text_buffer[text_offsets[j]:text_offsets[j + 1]]
+        self.text_offsets = array('Q', [0])
+        self._text_buffer = ''
+        self._pending_texts = []
+        self.extend(paragraphs)
+
+    def append(self, paragraph: Paragraph):
+        '''Adds a paragraph to the end of the store.'''
+        self.font_sizes.append(paragraph.font_size_value)
+
+        font_family = paragraph.font_family
+        font_id = self._font_family_ids.get(font_family)
+        if font_id is None:
+            font_id = len(self.font_families)
+            self.font_families.append(font_family)
+            self._font_family_ids[font_family] = font_id
+        self.font_ids.append(font_id)
+
+        self.page_numbers.append(paragraph.page_number or 0)
+        self.bboxes.extend(paragraph.bbox if paragraph.bbox is not None else (math.nan,) * 4)
+
+        text_offset = self.text_offsets[-1]
+        for text in paragraph._texts:
+            text_offset += len(text)
+            self.text_offsets.append(text_offset)
+            self._pending_texts.append(text)
+        self.styles += paragraph._styles
+        self.section_offsets.append(len(self.styles))
+
+    def extend(self, paragraphs: 'list[Paragraph]'):
+        '''Adds paragraphs to the end of the store.'''
+        for paragraph in paragraphs:
+            self.append(paragraph)
+
+    def get_text_buffer(self) -> str:
+        '''Returns the text of every section of every paragraph joined together.'''
+        # join the text added since the last read in one go rather than one section at a time
+        if len(self._pending_texts) > 0:
+            self._text_buffer = ''.join([self._text_buffer] + self._pending_texts)
+            self._pending_texts = []
+        return self._text_buffer
+
+    def __len__(self) -> int:
+        '''Returns the number of paragraphs in the store.'''
+        return len(self.font_sizes)
+
+    def __getitem__(self, index: int) -> ParagraphView:
+        '''Returns a view of the paragraph at an index.'''
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('ParagraphStore index out of range')
+        return ParagraphView(self, index)
+
+    def __iter__(self):
+        '''Returns an iterator over views of the paragraphs in the store.'''
+        return (ParagraphView(self, index) for index in range(len(self)))
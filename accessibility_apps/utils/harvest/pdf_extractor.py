@@ -7,16 +7,34 @@
 
 # imports
 from utils.harvest.paragraph import *
+import os
 import re
+import html
+import itertools
 from io import StringIO
+from concurrent.futures import ProcessPoolExecutor
 from bs4 import BeautifulSoup
-from pdfminer.layout import LAParams
-from pdfminer.high_level import extract_text_to_fp
+from pdfminer.utils import make_compat_str
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.high_level import extract_text_to_fp, extract_pages
+from pdfminer.layout import LAParams, LTPage, LTCurve, LTFigure, LTImage, LTTextLine, LTTextBox, LTChar, LTText
 
 # constants
 FONT_SIZE_STR = 'font-size'
 FONT_FAMILY_STR = 'font-family'
 
+# extraction engines
+HTML_ENGINE = 'html'
+LAYOUT_ENGINE = 'layout'
+
+# identifies the output of the extractor, change it whenever the extracted paragraphs would change
+EXTRACTOR_VERSION = '2'
+
+# the number of pages each worker extracts at a time when extracting in parallel
+DEFAULT_PAGES_PER_CHUNK = 16
+
 def _get_font_style_delimeter(style: FontStyle, is_start: bool) -> str:
     '''Returns the html delimeter for a font style.
     
@@ -103,132 +121,510 @@ def _convert_cid_str(text: str) -> str:
 
     return text
 
-def extract_paragraphs_and_fonts_and_sizes(pdf_file_path: str) -> list[Paragraph]:
-    '''Returns a list of `Paragraph` objects extracted from the input pdf.
+def _clean_span_text(span_text: str) -> str:
+    '''Returns the text of a span without (cid:xxx) strings, indentation, line breaks,
+    double spaces or trailing/leading whitespace.
+
+    Args:
+        span_text (str): The raw text of the span.
+    '''
+
+    # get rid of the (cid:xxx) strings in the span text
+    span_text = _convert_cid_str(span_text)
+
+    # get the text from the span without indentation or line 
+    # breaks or double spaces or trailing/leading whitespace
+    return span_text.replace('\n', '').replace(
+        '\t', '').replace('  ', ' ').strip()
+
+def _create_paragraph(span_sections: 'list[tuple[str, str, str | int]]', page_number: int = None, bbox: tuple = None) -> Paragraph:
+    '''Returns a `Paragraph` built from the spans of a div, or `None` if the div has no text.
+
+    Args:
+        span_sections (list[tuple[str, str, str | int]]): The (text, font family, font size) of each non-empty span in the div.
+        page_number (int): The number of the page the div is on, starting at 1, if known.
+        bbox (tuple): The (x0, y0, x1, y1) of the div in pdf coordinates, if known.
+    '''
+
+    # skip empty divs
+    if len(span_sections) == 0:
+        return None
+
+    # keep track of the font sizes in the div, a list of tuples of (font size, text length using that size)
+    # used to get a normalized font size for the div, which usually just ends up being the font
+    # size for all the spans, but sometimes there are little variations and in that case, the most
+    # commonly appearing font size is used for a unified div. TODO may want to investigate this approach later
+    font_size_distribution_dict = {}
+    # also keep track of the font to get the average font
+    font_family_distribution_dict = {}
+
+    # to store a list of tuples of (text, font style)
+    span_text_sections_and_font_style = []
+    for span_text, font_family, font_size in span_sections:
+        # update the average font family
+        if font_family not in font_family_distribution_dict.keys():
+            font_family_distribution_dict[font_family] = 0
+        font_family_distribution_dict[font_family] += len(span_text)
+
+        # store the text and font style from the span
+        span_text_sections_and_font_style.append((span_text, _get_font_style(font_family)))
+
+        # update the average font size
+        if font_size not in font_size_distribution_dict.keys():
+            font_size_distribution_dict[font_size] = 0
+        font_size_distribution_dict[font_size] += len(span_text)
+
+    # calculate the most commonly appearing font size in the div
+    div_font_size = sorted(font_size_distribution_dict.items(), key=lambda sizeLenTup : sizeLenTup[1], reverse=True)[0][0]
+
+    # calculate the most commonly appearing font family in the div
+    div_font_family = sorted(font_family_distribution_dict.items(), key=lambda sizeLenTup : sizeLenTup[1], reverse=True)[0][0]
+
+    return Paragraph(span_text_sections_and_font_style, div_font_size, div_font_family, page_number, bbox)
+
+class _LayoutDiv():
+    '''A div that pdfminer's html converter would write for a text box or figure.'''
+    __slots__ = ('children', 'bbox')
+
+    def __init__(self, bbox: tuple = None):
+        '''Initializes the `_LayoutDiv` with the bbox of the layout object it is for.'''
+        self.children = []
+        self.bbox = bbox
+
+class _LayoutSpan():
+    '''A span that pdfminer's html converter would write for a run of characters in one font.'''
+    __slots__ = ('font_family', 'font_size', 'children')
+
+    def __init__(self, font_family: str, font_size: int):
+        '''Initializes the `_LayoutSpan`.'''
+        self.font_family = font_family
+        self.font_size = font_size
+        self.children = []
+
+def _get_element_text(element) -> str:
+    '''Returns all the text nested within a `_LayoutDiv` or `_LayoutSpan`.'''
+    return ''.join([child if type(child) is str else _get_element_text(child) for child in element.children])
+
+def _find_elements(element, element_type: type, found_elements: list):
+    '''Adds all the elements of a type nested within `element` to `found_elements` in document order.'''
+    for child in element.children:
+        if type(child) is not str:
+            if type(child) is element_type:
+                found_elements.append(child)
+            _find_elements(child, element_type, found_elements)
+
+class _LayoutWalker():
+    '''Walks pdfminer layout objects the same way pdfminer's html converter renders them, building 
+    the divs and spans it would write directly from the fonts the characters carry.'''
+
+    def __init__(self):
+        '''Initializes the `_LayoutWalker`.'''
+        # the (font name, font size) of the open span and the fonts of the spans open outside each div
+        self.font = None
+        self.font_stack = []
+        self.open_elements = []
+
+    def get_page_divs(self, ltpage: LTPage) -> 'list[_LayoutDiv]':
+        '''Returns the divs of a page in document order.
+
+        Args:
+            ltpage (LTPage): The laid out page from pdfminer.
+        '''
+        page_element = _LayoutDiv()
+        self.open_elements = [page_element]
+        self._render(ltpage)
+
+        page_divs = []
+        _find_elements(page_element, _LayoutDiv, page_divs)
+        return page_divs
+
+    def _begin_div(self, bbox: tuple):
+        '''Opens a div for a layout object with a bbox, which starts without a font.'''
+        div = _LayoutDiv(bbox)
+        self.open_elements[-1].children.append(div)
+        self.open_elements.append(div)
+        self.font_stack.append(self.font)
+        self.font = None
+
+    def _end_div(self):
+        '''Closes the open span (if any) and div, going back to the font outside the div.'''
+        if self.font is not None:
+            self.open_elements.pop()
+        self.font = self.font_stack.pop()
+        self.open_elements.pop()
+
+    def _put_text(self, text: str, font_name: str, font_size: float):
+        '''Adds text in a font, starting a new span whenever the font changes.'''
+        font = (font_name, font_size)
+        if font != self.font:
+            if self.font is not None:
+                self.open_elements.pop()
+            # remove the subset tag from the font name and truncate the size like the html converter does
+            span = _LayoutSpan(font_name.split('+')[-1].strip(), int(font_size))
+            self.open_elements[-1].children.append(span)
+            self.open_elements.append(span)
+            self.font = font
+        self.open_elements[-1].children.append(text)
+
+    def _render(self, item):
+        '''Renders a layout object and everything it contains.'''
+        if isinstance(item, LTPage):
+            for child in item:
+                self._render(child)
+        elif isinstance(item, (LTCurve, LTImage)):
+            # borders and images never hold text
+            return
+        elif isinstance(item, LTFigure):
+            self._begin_div(item.bbox)
+            for child in item:
+                self._render(child)
+            self._end_div()
+        elif isinstance(item, LTTextLine):
+            for child in item:
+                self._render(child)
+        elif isinstance(item, LTTextBox):
+            self._begin_div(item.bbox)
+            for child in item:
+                self._render(child)
+            self._end_div()
+        elif isinstance(item, LTChar):
+            self._put_text(item.get_text(), make_compat_str(item.fontname), item.size)
+        elif isinstance(item, LTText):
+            self.open_elements[-1].children.append(item.get_text())
+
+def _get_page_paragraphs(walker: _LayoutWalker, ltpage: LTPage, page_number: int = None) -> 'list[Paragraph]':
+    '''Returns the `Paragraph` objects of a pdfminer page.
+
+    Args:
+        walker (_LayoutWalker): The walker keeping track of the font state across the document.
+        ltpage (LTPage): The laid out page from pdfminer.
+        page_number (int): The number of the page in the pdf, starting at 1.
+    '''
+    paragraphs = []
+    for div in walker.get_page_divs(ltpage):
+        span_sections = []
+        spans = []
+        _find_elements(div, _LayoutSpan, spans)
+        for span in spans:
+            span_text = _clean_span_text(_get_element_text(span))
+
+            # skip over empty spans
+            if span_text == '':
+                continue
+
+            span_sections.append((span_text, span.font_family, span.font_size))
+
+        paragraph = _create_paragraph(span_sections, page_number, div.bbox)
+        if paragraph is not None:
+            paragraphs.append(paragraph)
+    return paragraphs
+
+def iter_paragraphs(pdf_file_path: str, page_numbers: 'range' = None):
+    '''Yields the `Paragraph` objects of the input pdf one page at a time, as each page is laid out,
+    so only a single page is held in memory.
+
+    Args:
+        pdf_file_path (str): The string path of the pdf file to extract data from.
+        page_numbers (range): The zero-indexed pages to extract, or `None` for all of them.
+    '''
+    walker = _LayoutWalker()
+    # pdfminer numbers the pages it lays out from 1 no matter which pages they are, so count them from the pages asked for
+    page_indices = itertools.count() if page_numbers is None else sorted(set(page_numbers))
+    for ltpage, page_index in zip(extract_pages(pdf_file_path, page_numbers=page_numbers, laparams=LAParams()), page_indices):
+        yield from _get_page_paragraphs(walker, ltpage, page_index + 1)
+
+class ParagraphStream():
+    '''An iterable over the paragraphs of a pdf that extracts them again every time it is iterated 
+    instead of keeping them in memory.'''
+
+    def __init__(self, pdf_file_path: str):
+        '''Initializes the `ParagraphStream`.
+
+        Args:
+            pdf_file_path (str): The string path of the pdf file to extract data from.
+        '''
+        self.pdf_file_path = pdf_file_path
+
+    def __iter__(self):
+        '''Returns a generator over the paragraphs of the pdf.'''
+        return iter_paragraphs(self.pdf_file_path)
+
+def _extract_paragraphs_from_layout(pdf_file_path: str, page_numbers: 'range' = None) -> 'list[Paragraph]':
+    '''Returns a list of `Paragraph` objects built by walking pdfminer's layout objects directly.
+
+    Args:
+        pdf_file_path (str): The string path of the pdf file to extract data from.
+        page_numbers (range): The zero-indexed pages to extract, or `None` for all of them.
+    '''
+    return list(iter_paragraphs(pdf_file_path, page_numbers))
+
+def _extract_paragraphs_from_html(pdf_file_path: str, page_numbers: 'range' = None) -> 'list[Paragraph]':
+    '''Returns a list of `Paragraph` objects parsed from the html pdfminer renders the pdf to.
 
     Args:
         pdf_file_path (str): The string path of the pdf file to extract data from.
+        page_numbers (range): The zero-indexed pages to extract, or `None` for all of them.
     '''
 
     # read the pdf
     pdf_content = StringIO()
     with open(pdf_file_path, 'rb') as fin:
-        extract_text_to_fp(fin, pdf_content, laparams=LAParams(), output_type='html', codec=None)
+        extract_text_to_fp(fin, pdf_content, laparams=LAParams(), output_type='html', codec=None, page_numbers=page_numbers)
 
     # parse the html file
     parsed_html = BeautifulSoup(pdf_content.getvalue(), 'html.parser')
 
     paragraphs = []
     for div in parsed_html.findAll('div'):
-        # keep track of the font sizes in the div, a list of tuples of (font size, text length using that size)
-        # used to get a normalized font size for the div, which usually just ends up being the font
-        # size for all the spans, but sometimes there are little variations and in that case, the most
-        # commonly appearing font size is used for a unified div. TODO may want to investigate this approach later
-        font_size_distribution = []
-        # also keep track of the font to get the average font
-        font_family_distribution = []
-
-        # to store a list of tuples of (text, font style)
-        span_text_sections_and_font_style = []
+        # to store a list of tuples of (text, font family, font size)
+        span_sections = []
         for span in div.findAll('span'):
-            # get rid of the (cid:xxx) strings in the span text
-            span_text = _convert_cid_str(span.get_text())
-
-            # get the text from the span without indentation or line 
-            # breaks or double spaces or trailing/leading whitespace
-            span_text = span_text.replace('\n', '').replace(
-                '\t', '').replace('  ', ' ').strip()
+            span_text = _clean_span_text(span.get_text())
 
             # skip over empty spans
             if span_text == '':
                 continue
 
             span_attributes = _get_attributes(span.attrs['style'])
-            
-            # update the average font family
-            font_family = span_attributes[FONT_FAMILY_STR]
-            font_family_distribution.append((font_family, len(span_text)))
-
-            # store the text and font style from the span
-            span_text_sections_and_font_style.append((span_text, _get_font_style(font_family)))
-        
-            # update the average font size
-            font_size = span_attributes[FONT_SIZE_STR]
-            font_size_distribution.append((font_size, len(span_text)))
-        
-        # skip empty spans
-        if len(span_text_sections_and_font_style) == 0:
-            continue
-
-        # calculate the most commonly appearing font size in the div
-        font_size_distribution_dict = {}
-        for font_size, text_len in font_size_distribution:
-            if font_size not in font_size_distribution_dict.keys():
-                font_size_distribution_dict[font_size] = 0
-            font_size_distribution_dict[font_size] += text_len
-        div_font_size = sorted(font_size_distribution_dict.items(), key=lambda sizeLenTup : sizeLenTup[1], reverse=True)[0][0]
-
-        # calculate the most commonly appearing font family in the div
-        font_family_distribution_dict = {}
-        for font_family, text_len in font_family_distribution:
-            if font_family not in font_family_distribution_dict.keys():
-                font_family_distribution_dict[font_family] = 0
-            font_family_distribution_dict[font_family] += text_len
-        div_font_family = sorted(font_family_distribution_dict.items(), key=lambda sizeLenTup : sizeLenTup[1], reverse=True)[0][0]
+            span_sections.append((span_text, span_attributes[FONT_FAMILY_STR], span_attributes[FONT_SIZE_STR]))
 
         # add the span data to the div info
-        paragraphs.append(Paragraph(span_text_sections_and_font_style, div_font_size, div_font_family))
+        paragraph = _create_paragraph(span_sections)
+        if paragraph is not None:
+            paragraphs.append(paragraph)
     
     return paragraphs
 
-def export_to_html(paragraphs: list[Paragraph], output_html_path: str):
+def _extract_page_range(pdf_file_path: str, engine: str, page_numbers: range) -> 'list[Paragraph]':
+    '''Returns the `Paragraph` objects from a range of pages, run by the workers when extracting in parallel.
+
+    Args:
+        pdf_file_path (str): The string path of the pdf file to extract data from.
+        engine (str): The extraction engine to use.
+        page_numbers (range): The zero-indexed pages to extract.
+    '''
+    if engine == LAYOUT_ENGINE:
+        return _extract_paragraphs_from_layout(pdf_file_path, page_numbers)
+    elif engine == HTML_ENGINE:
+        return _extract_paragraphs_from_html(pdf_file_path, page_numbers)
+    else:
+        raise ValueError("Unknown extraction engine: " + str(engine))
+
+def get_page_count(pdf_file_path: str) -> int:
+    '''Returns the number of pages in a pdf without laying any of them out.
+
+    Args:
+        pdf_file_path (str): The string path of the pdf file.
+    '''
+    with open(pdf_file_path, 'rb') as fin:
+        return sum(1 for _ in PDFPage.create_pages(PDFDocument(PDFParser(fin))))
+
+def extract_paragraphs_and_fonts_and_sizes(pdf_file_path: str, engine: str = LAYOUT_ENGINE, workers: int = 1, pages_per_chunk: int = DEFAULT_PAGES_PER_CHUNK) -> list[Paragraph]:
+    '''Returns a list of `Paragraph` objects extracted from the input pdf.
+
+    Args:
+        pdf_file_path (str): The string path of the pdf file to extract data from.
+        engine (str): `LAYOUT_ENGINE` to build the paragraphs from pdfminer's layout objects directly or
+            `HTML_ENGINE` to parse them out of the html pdfminer renders. Both give the same paragraphs.
+        workers (int): The number of processes to extract pages with, `None` for one per cpu. 
+            With more than one, the pdf is split into ranges of pages that are extracted in parallel.
+        pages_per_chunk (int): The number of pages in each range handed to a worker.
+    '''
+    if workers is None:
+        workers = os.cpu_count()
+    if pages_per_chunk < 1:
+        raise ValueError("pages_per_chunk must be at least 1")
+
+    # extract everything in this process when not running in parallel
+    if workers <= 1:
+        return _extract_page_range(pdf_file_path, engine, None)
+
+    # split the pdf into ranges of pages
+    page_count = get_page_count(pdf_file_path)
+    page_ranges = [range(first_page, min(first_page + pages_per_chunk, page_count)) for first_page in range(0, page_count, pages_per_chunk)]
+
+    # not worth starting up processes for a single range
+    if len(page_ranges) <= 1:
+        return _extract_page_range(pdf_file_path, engine, None)
+
+    # extract the ranges in parallel, map keeps the results in page order
+    paragraphs = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(page_ranges))) as executor:
+        for range_paragraphs in executor.map(_extract_page_range, [pdf_file_path] * len(page_ranges), [engine] * len(page_ranges), page_ranges):
+            paragraphs += range_paragraphs
+    return paragraphs
+
+# the html tags that text in each font style is wrapped in
+FONT_STYLE_TAGS = {
+    FontStyle.STANDARD : (),
+    FontStyle.BOLD : ('strong',),
+    FontStyle.ITALIC : ('em',),
+    FontStyle.BOLD_ITALIC : ('strong', 'em')
+}
+
+class HtmlWriter():
+    '''Streams an html document of paragraphs straight to a text file object as the paragraphs are
+    written, one element or piece of text per line. Text and attribute values are escaped.
+
+    With css classes, each distinct font size and family gets a generated class in a `<style>` block
+    instead of every div and p repeating an inline style, which makes the html smaller and cheaper for
+    a browser to lay out.'''
+
+    def __init__(self, output_file, pretty: bool = True, css_classes: bool = False):
+        '''Initializes the `HtmlWriter`.
+
+        Args:
+            output_file (TextIO): The file (or in-memory buffer like a `StringIO`) to write the html to.
+            pretty (bool): Whether to indent each line by its depth in the document.
+            css_classes (bool): Whether to style the paragraphs with generated css classes instead of inline styles.
+        '''
+        self.output_file = output_file
+        self.pretty = pretty
+        self.css_classes = css_classes
+        self.depth = 0
+        # maps (font size, font family) to the name of its css class
+        self.font_classes = {}
+        self.written_font_class_count = 0
+
+    def _write_line(self, line: str):
+        '''Writes a line of html at the current depth.'''
+        if self.pretty:
+            self.output_file.write(' ' * self.depth)
+        self.output_file.write(line)
+        self.output_file.write('\n')
+
+    def _open_tag(self, tag: str, style: str = None, css_class: str = None):
+        '''Writes an opening tag, with a style or class attribute if given, and goes a level deeper.'''
+        if style is not None:
+            self._write_line('<' + tag + ' style="' + html.escape(style) + '">')
+        elif css_class is not None:
+            self._write_line('<' + tag + ' class="' + css_class + '">')
+        else:
+            self._write_line('<' + tag + '>')
+        self.depth += 1
+
+    def _close_tag(self, tag: str):
+        '''Goes back up a level and writes a closing tag.'''
+        self.depth -= 1
+        self._write_line('</' + tag + '>')
+
+    def add_font_class(self, paragraph: Paragraph) -> str:
+        '''Returns the name of the css class for the font of a paragraph, generating one if it is new.
+
+        Args:
+            paragraph (Paragraph): The paragraph to get the font class of.
+        '''
+        font = (paragraph.font_size, paragraph.font_family)
+        font_class = self.font_classes.get(font)
+        if font_class is None:
+            font_class = 'f' + str(len(self.font_classes))
+            self.font_classes[font] = font_class
+        return font_class
+
+    def _write_style_block(self):
+        '''Writes a `<style>` block defining the font classes that have not been written yet.'''
+        self._open_tag('style')
+        for (font_size, font_family), font_class in list(self.font_classes.items())[self.written_font_class_count:]:
+            # keep the font name from closing the style block early
+            font_family = font_family.replace('<', '\\3c ')
+            self._write_line('.' + font_class + ' {' + FONT_SIZE_STR + ':' + font_size + '; ' + FONT_FAMILY_STR + ':' + font_family + '}')
+        self._close_tag('style')
+        self.written_font_class_count = len(self.font_classes)
+
+    def write_start(self):
+        '''Writes everything before the paragraphs, including the font classes added so far.'''
+        self._open_tag('html')
+        self._open_tag('head')
+        self._write_line('<meta content="text/html" http-equiv="Content-Type"/>')
+        if len(self.font_classes) > self.written_font_class_count:
+            self._write_style_block()
+        self._close_tag('head')
+        self._open_tag('body')
+
+    def write_paragraph(self, paragraph: Paragraph):
+        '''Writes a paragraph.
+
+        Args:
+            paragraph (Paragraph): The paragraph to write.
+        '''
+        if self.css_classes:
+            # the font family is inherited by the p from the div
+            self._open_tag('div', css_class=self.add_font_class(paragraph))
+            self._open_tag('p')
+        else:
+            self._open_tag('div', FONT_SIZE_STR + ':' + paragraph.font_size)
+            self._open_tag('p', FONT_FAMILY_STR + ':' + paragraph.font_family)
+        for text, font_style in paragraph.text_info:
+            font_style_tags = FONT_STYLE_TAGS[font_style]
+            for tag in font_style_tags:
+                self._open_tag(tag)
+            self._write_line(html.escape(text, quote=False))
+            for tag in reversed(font_style_tags):
+                self._close_tag(tag)
+        self._close_tag('p')
+        self._close_tag('div')
+
+    def write_end(self):
+        '''Writes everything after the paragraphs, including the font classes added since the start was written.'''
+        if len(self.font_classes) > self.written_font_class_count:
+            self._write_style_block()
+        self._close_tag('body')
+        self._close_tag('html')
+
+    def write_document(self, paragraphs: list[Paragraph]):
+        '''Writes a whole html document, consuming the paragraphs one at a time.
+
+        With css classes, the classes of paragraphs already in memory are generated up front so their style 
+        block goes in the head. Paragraphs that are streamed can only be read once, so their style block
+        goes at the end of the body instead.
+
+        Args:
+            paragraphs (list[Paragraph]): The paragraphs (or any iterable of them, like a generator) to write.
+        '''
+        if self.css_classes and isinstance(paragraphs, (list, tuple, ParagraphStore)):
+            for paragraph in paragraphs:
+                self.add_font_class(paragraph)
+
+        self.write_start()
+        for paragraph in paragraphs:
+            self.write_paragraph(paragraph)
+        self.write_end()
+
+def export_to_html(paragraphs: list[Paragraph], output_html_path: str, pretty: bool = True, css_classes: bool = False):
     '''Exports the pdf data from the `paragraphs` list into an html file in the location `output_html_path`.
 
     Args:
         paragraphs (list[Paragraph]): The data representing an extracted pdf file.
         output_html_path (str): The file location to output the html file.
+        pretty (bool): Whether to indent the html.
+        css_classes (bool): Whether to style the paragraphs with generated css classes instead of inline styles.
     '''
 
-    formatted_output = _get_exported_html_value(paragraphs)
-
-    # write to an html file
+    # stream the html to the file as the paragraphs are consumed
     with open(output_html_path, 'w', encoding='utf-8') as output_file:
-        output_file.write(formatted_output)
+        HtmlWriter(output_file, pretty, css_classes).write_document(paragraphs)
 
-def _get_exported_html_value(paragraphs: list[Paragraph]) -> str:
-    '''Returns the contents of the html exported from the provided list of `Paragraph`s.
+def export_to_html_str(paragraphs: list[Paragraph], pretty: bool = True, css_classes: bool = False) -> str:
+    '''Returns the html exported from the `paragraphs` list as a string instead of writing it to a file.
 
     Args:
         paragraphs (list[Paragraph]): The data representing an extracted pdf file.
+        pretty (bool): Whether to indent the html.
+        css_classes (bool): Whether to style the paragraphs with generated css classes instead of inline styles.
     '''
-    # start the output html lines
-    output_html_lines = [
-        '<html>',
-        '<head>',
-        '<meta content="text/html" http-equiv="Content-Type"/>',
-        '</head>',
-        '<body>'
-    ]
-
-    # add information to the html from the processed data
-    for paragraph in paragraphs:
-        output_html_lines.append('<div style="' + FONT_SIZE_STR + ':' + paragraph.font_size + '">')
-        output_html_lines.append('<p style="' + FONT_FAMILY_STR + ':' + paragraph.font_family + '">')
-        for text, font_style in paragraph.text_info:
-            output_html_lines.append(_get_font_style_delimeter(font_style, True))
-            output_html_lines.append(text)
-            output_html_lines.append(_get_font_style_delimeter(font_style, False))
-        output_html_lines.append('</p>')
-        output_html_lines.append('</div>')
-
-    # finish the output html lines
-    output_html_lines.append('</body>')
-    output_html_lines.append('</html>')
+    html_content = StringIO()
+    HtmlWriter(html_content, pretty, css_classes).write_document(paragraphs)
+    return html_content.getvalue()
 
-    # generate a formatted html from the lines
-    formatted_output = BeautifulSoup('\n'.join(output_html_lines), 'html.parser').prettify()
+def _get_exported_html_value(paragraphs: list[Paragraph], pretty: bool = True, css_classes: bool = False) -> str:
+    '''Returns the contents of the html exported from the provided list of `Paragraph`s.
 
-    return formatted_output
+    Args:
+        paragraphs (list[Paragraph]): The data representing an extracted pdf file.
+        pretty (bool): Whether to indent the html.
+        css_classes (bool): Whether to style the paragraphs with generated css classes instead of inline styles.
+    '''
+    return export_to_html_str(paragraphs, pretty, css_classes)
 
 # run the code in this file for testing purposes
 if __name__ == '__main__':
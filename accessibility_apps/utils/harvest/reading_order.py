@@ -0,0 +1,139 @@
+# ===================================================
+# File: reading_order.py
+# Date: 10/18/2026
+# Description: Orders the blocks of a page for reading
+#   with a recursive XY-cut: columns are read left to
+#   right and top to bottom, and blocks spanning the
+#   columns (like titles and wide figures) split the
+#   page into bands read one after the other.
+# ==================================================
+
+# the smallest gap between the projections of blocks that the page is cut at, in the units of the boxes
+DEFAULT_MIN_GAP = 0
+
+# the axes the page is cut along
+X_AXIS = 0
+Y_AXIS = 1
+
+def _split_sorted(ids:'list[int]', boxes:'list[tuple]', axis:int, min_gap:float) -> 'list[list[int]]':
+    """Splits blocks sorted by their start along an axis into the runs between the gaps in their projection
+    onto that axis. The runs are slices of the sorted ids, in order."""
+    runs = []
+    run_start = 0
+    run_end = boxes[ids[0]][axis + 2]
+    for position in range(1, len(ids)):
+        box = boxes[ids[position]]
+        if box[axis] - run_end >= min_gap:
+            runs.append(ids[run_start:position])
+            run_start = position
+        run_end = max(run_end, box[axis + 2])
+    runs.append(ids[run_start:])
+    return runs
+
+def _get_covered_intervals(ids:'list[int]', boxes:'list[tuple]', axis:int, min_gap:float) -> 'list[list[float]]':
+    """Returns the [start, end] intervals of an axis covered by blocks sorted by their start along it, joining
+    intervals closer together than the smallest gap."""
+    intervals = []
+    for block_id in ids:
+        start, end = boxes[block_id][axis], boxes[block_id][axis + 2]
+        if len(intervals) > 0 and start - intervals[-1][1] < min_gap:
+            intervals[-1][1] = max(intervals[-1][1], end)
+        else:
+            intervals.append([start, end])
+    return intervals
+
+def _merge_intervals(first:'list[list[float]]', second:'list[list[float]]', min_gap:float) -> 'list[list[float]]':
+    """Returns the union of two sorted lists of covered intervals, joining intervals closer together than the
+    smallest gap."""
+    merged = []
+    first_position = second_position = 0
+    while first_position < len(first) or second_position < len(second):
+        if second_position == len(second) or (first_position < len(first) and first[first_position][0] <= second[second_position][0]):
+            start, end = first[first_position]
+            first_position += 1
+        else:
+            start, end = second[second_position]
+            second_position += 1
+        if len(merged) > 0 and start - merged[-1][1] < min_gap:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+def _partition(ids:'list[int]', labels:'list[int]', part_count:int) -> 'list[list[int]]':
+    """Splits ids into parts by their labels, keeping their order within each part."""
+    parts = [[] for _ in range(part_count)]
+    for block_id in ids:
+        parts[labels[block_id]].append(block_id)
+    return parts
+
+def get_reading_order(bboxes:'list[tuple]', min_gap:float=DEFAULT_MIN_GAP) -> 'list[int]':
+    """Returns the indices of the boxes of a page's blocks in reading order, using a recursive XY-cut.
+
+    A region is cut into columns wherever there is a vertical gap between its blocks, and the columns are read left
+    to right. A region without columns is cut into rows at its horizontal gaps, and consecutive rows are read
+    together as long as they still share a column gap, so columns whose paragraphs happen to line up aren't read
+    across. Rows that can't be read together (because a title or figure spans the columns) are read top to bottom.
+    Blocks that can't be cut apart at all are read by their top, then their left edge.
+
+    The blocks are sorted along each axis once, and each cut is a linear sweep over the sorted blocks of its
+    region that keeps them sorted for the regions it makes, so a page takes O(n log n) to sort plus O(n) for
+    each level of cuts (a few levels on real pages), instead of comparing blocks pairwise.
+
+    Args:
+        bboxes (list[tuple]): The (x0, y0, x1, y1) box of each block, with y increasing down the page (like image
+            coordinates).
+        min_gap (float): The smallest gap between blocks that the page is cut at. Defaults to DEFAULT_MIN_GAP,
+            which cuts wherever the blocks don't overlap.
+    """
+    boxes = [tuple(float(coordinate) for coordinate in bbox) for bbox in bboxes]
+    if len(boxes) == 0:
+        return []
+    # the label of each block's part during the current cut, so the other axis's order can be partitioned in one pass
+    labels = [0] * len(boxes)
+
+    order = []
+    # the regions left to order, each as its blocks sorted along x and along y (the next region to read is last)
+    regions = [(sorted(range(len(boxes)), key=lambda i: (boxes[i][0], boxes[i][1])),
+                sorted(range(len(boxes)), key=lambda i: (boxes[i][1], boxes[i][0])))]
+    while len(regions) > 0:
+        ids_by_x, ids_by_y = regions.pop()
+        columns = _split_sorted(ids_by_x, boxes, X_AXIS, min_gap)
+        if len(columns) > 1:
+            for label, column in enumerate(columns):
+                for block_id in column:
+                    labels[block_id] = label
+            column_ids_by_y = _partition(ids_by_y, labels, len(columns))
+            regions.extend(reversed(list(zip(columns, column_ids_by_y))))
+            continue
+
+        rows = _split_sorted(ids_by_y, boxes, Y_AXIS, min_gap)
+        if len(rows) == 1:
+            order.extend(ids_by_y)
+            continue
+
+        # find the horizontal extent of each row's blocks
+        for label, row in enumerate(rows):
+            for block_id in row:
+                labels[block_id] = label
+        row_intervals = [_get_covered_intervals(row_ids_by_x, boxes, X_AXIS, min_gap) for row_ids_by_x in _partition(ids_by_x, labels, len(rows))]
+
+        # read consecutive rows together while they still have a column gap in common
+        bands = []
+        band_intervals = None
+        for row, intervals in zip(rows, row_intervals):
+            if band_intervals is not None:
+                merged_intervals = _merge_intervals(band_intervals, intervals, min_gap)
+                if len(merged_intervals) > 1:
+                    bands[-1].extend(row)
+                    band_intervals = merged_intervals
+                    continue
+            bands.append(list(row))
+            band_intervals = intervals
+
+        for label, band in enumerate(bands):
+            for block_id in band:
+                labels[block_id] = label
+        band_ids_by_x = _partition(ids_by_x, labels, len(bands))
+        regions.extend(reversed(list(zip(band_ids_by_x, bands))))
+    return order
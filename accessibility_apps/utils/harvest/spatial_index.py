@@ -0,0 +1,104 @@
+# ===================================================
+# File: spatial_index.py
+# Date: 10/18/2026
+# Description: A uniform grid index of rectangles for
+#   quickly finding the ones in a region of a page.
+# ==================================================
+
+import math
+
+# the default width and height of a grid cell, in the units of the rectangles (pdf points are 1/72 inch)
+DEFAULT_CELL_SIZE = 32
+
+class GridIndex():
+    """Indexes items by their bounding box (x0, y0, x1, y1) in a grid of square cells. Each item is listed in
+    every cell its box touches, so a query only looks at the items in the cells the query region touches."""
+
+    def __init__(self, cell_size:float=DEFAULT_CELL_SIZE):
+        """Initializes an empty index.
+
+        Args:
+            cell_size (float): The width and height of a grid cell.
+        """
+        self.cell_size = cell_size
+        self.items = []
+        self.bboxes = []
+        # the ids (insertion indices) of the items touching each cell, keyed by (column, row)
+        self._cells = {}
+
+    def _get_cell_range(self, bbox:tuple) -> tuple:
+        """Returns the first and last column and row of the cells a box touches."""
+        x0, y0, x1, y1 = bbox
+        return (math.floor(x0 / self.cell_size), math.floor(y0 / self.cell_size), math.floor(x1 / self.cell_size), math.floor(y1 / self.cell_size))
+
+    def insert(self, bbox:tuple, item):
+        """Adds an item to the index.
+
+        Args:
+            bbox (tuple): The (x0, y0, x1, y1) bounding box of the item, with x0 <= x1 and y0 <= y1.
+            item: The item.
+        """
+        item_id = len(self.items)
+        self.items.append(item)
+        self.bboxes.append(bbox)
+        first_column, first_row, last_column, last_row = self._get_cell_range(bbox)
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                self._cells.setdefault((column, row), []).append(item_id)
+
+    def _get_candidate_ids(self, bbox:tuple) -> set:
+        """Returns the ids of the items in the cells a box touches."""
+        first_column, first_row, last_column, last_row = self._get_cell_range(bbox)
+        candidate_ids = set()
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                candidate_ids.update(self._cells.get((column, row), ()))
+        return candidate_ids
+
+    def query(self, bbox:tuple) -> list:
+        """Returns the items whose boxes overlap a box, in the order they were inserted.
+
+        Args:
+            bbox (tuple): The (x0, y0, x1, y1) region to search.
+        """
+        x0, y0, x1, y1 = bbox
+        found_ids = []
+        for item_id in self._get_candidate_ids(bbox):
+            item_x0, item_y0, item_x1, item_y1 = self.bboxes[item_id]
+            if item_x0 < x1 and x0 < item_x1 and item_y0 < y1 and y0 < item_y1:
+                found_ids.append(item_id)
+        return [self.items[item_id] for item_id in sorted(found_ids)]
+
+    def query_centers(self, bbox:tuple) -> list:
+        """Returns the items whose box centers are inside a box, in the order they were inserted.
+
+        Args:
+            bbox (tuple): The (x0, y0, x1, y1) region to search.
+        """
+        x0, y0, x1, y1 = bbox
+        found_ids = []
+        for item_id in self._get_candidate_ids(bbox):
+            item_x0, item_y0, item_x1, item_y1 = self.bboxes[item_id]
+            center_x = (item_x0 + item_x1) / 2
+            center_y = (item_y0 + item_y1) / 2
+            if x0 <= center_x <= x1 and y0 <= center_y <= y1:
+                found_ids.append(item_id)
+        return [self.items[item_id] for item_id in sorted(found_ids)]
+
+    def query_point(self, x:float, y:float) -> list:
+        """Returns the items whose boxes contain a point (including their edges), in the order they were inserted.
+
+        Args:
+            x (float): The x coordinate of the point.
+            y (float): The y coordinate of the point.
+        """
+        found_ids = []
+        for item_id in self._cells.get((math.floor(x / self.cell_size), math.floor(y / self.cell_size)), ()):
+            item_x0, item_y0, item_x1, item_y1 = self.bboxes[item_id]
+            if item_x0 <= x <= item_x1 and item_y0 <= y <= item_y1:
+                found_ids.append(item_id)
+        return [self.items[item_id] for item_id in found_ids]
+
+    def __len__(self) -> int:
+        """Returns the number of items in the index."""
+        return len(self.items)
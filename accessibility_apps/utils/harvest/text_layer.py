@@ -0,0 +1,170 @@
+# ===================================================
+# File: text_layer.py
+# Date: 10/18/2026
+# Description: Reads the text inside regions of pdf
+#   pages from the pdf's own text layer, so text that
+#   is already in the pdf doesn't need to be OCRed.
+# ==================================================
+
+import re
+import json
+import hashlib
+from pdfminer.pdfpage import PDFPage
+from pdfminer.high_level import extract_pages
+from pdfminer.converter import PDFPageAggregator
+from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+from pdfminer.layout import LAParams, LTPage, LTTextLine, LTChar, LTAnno
+from utils.harvest.spatial_index import GridIndex
+
+# pdfminer writes characters it can't map to unicode as "(cid:<number>)"
+CID_PATTERN = re.compile(r'\(cid:\d+\)')
+
+# unmapped control characters (like the line ends some pdfs draw as glyphs) which are left out of the text
+CONTROL_CID_PATTERN = re.compile(r'\(cid:([0-9]|[12][0-9]|3[01])\)')
+
+# the most of a text that can be unmapped characters before it is considered garbled
+MAX_GARBLED_FRACTION = 0.1
+
+# the number of pdf points in an inch, for converting image pixels to pdf coordinates
+POINTS_PER_INCH = 72
+
+def is_text_usable(text:str) -> bool:
+    """Returns whether text read from a pdf's text layer has something in it and isn't mostly unmapped characters."""
+    stripped_text = text.strip()
+    if len(stripped_text) == 0:
+        return False
+    garbled_length = sum([len(cid) for cid in CID_PATTERN.findall(stripped_text)]) + stripped_text.count('\ufffd')
+    return garbled_length / len(stripped_text) <= MAX_GARBLED_FRACTION
+
+def image_to_pdf_bbox(coordinates:tuple, dpi:int, page_bbox:tuple) -> tuple:
+    """Returns the pdf coordinates (x0, y0, x1, y1) of a box on an image of a page.
+
+    Args:
+        coordinates (tuple): The (x_1, y_1, x_2, y_2) of the box in image pixels, from the top left.
+        dpi (int): The resolution the page image was rasterized at.
+        page_bbox (tuple): The (x0, y0, x1, y1) of the page in pdf coordinates.
+    """
+    scale = POINTS_PER_INCH / dpi
+    page_x0, _, _, page_y1 = page_bbox
+    x_1, y_1, x_2, y_2 = coordinates
+    return (page_x0 + x_1 * scale, page_y1 - y_2 * scale, page_x0 + x_2 * scale, page_y1 - y_1 * scale)
+
+class PageTextLayer():
+    """The characters of a pdf page in a spatial index, for reading the text inside regions of the page."""
+
+    def __init__(self, ltpage:LTPage):
+        """Indexes the characters of a page laid out by pdfminer.
+
+        Args:
+            ltpage (LTPage): The page.
+        """
+        self.bbox = ltpage.bbox
+        self.index = GridIndex()
+        self._line_number = 0
+        self._add_characters(ltpage)
+
+    def _add_characters(self, element):
+        """Adds the characters within a layout element to the index. Each character is stored with the number of
+        its line, and the spaces pdfminer inserts between words are kept with the character after them."""
+        if isinstance(element, LTTextLine):
+            self._line_number += 1
+            pending_space = ''
+            for child in element:
+                if isinstance(child, LTChar):
+                    if CONTROL_CID_PATTERN.fullmatch(child.get_text()) is None:
+                        self.index.insert(child.bbox, (self._line_number, pending_space + child.get_text()))
+                        pending_space = ''
+                elif isinstance(child, LTAnno) and child.get_text() == ' ':
+                    pending_space = ' '
+        elif isinstance(element, LTChar):
+            # a character outside of a text line (like in a figure) is a line of its own
+            if CONTROL_CID_PATTERN.fullmatch(element.get_text()) is None:
+                self._line_number += 1
+                self.index.insert(element.bbox, (self._line_number, element.get_text()))
+        elif hasattr(element, '__iter__'):
+            for child in element:
+                self._add_characters(child)
+
+    def image_to_pdf_bbox(self, coordinates:tuple, dpi:int) -> tuple:
+        """Returns the pdf coordinates (x0, y0, x1, y1) of a box on an image of the page.
+
+        Args:
+            coordinates (tuple): The (x_1, y_1, x_2, y_2) of the box in image pixels, from the top left.
+            dpi (int): The resolution the page image was rasterized at.
+        """
+        return image_to_pdf_bbox(coordinates, dpi, self.bbox)
+
+    def get_text(self, bbox:tuple) -> str:
+        """Returns the text of the characters whose centers are inside a region of the page, with a line break
+        between lines.
+
+        Args:
+            bbox (tuple): The (x0, y0, x1, y1) region in pdf coordinates.
+        """
+        lines = []
+        current_line_number = None
+        for line_number, text in self.index.query_centers(bbox):
+            if line_number != current_line_number:
+                lines.append([])
+                current_line_number = line_number
+                text = text.lstrip(' ')
+            lines[-1].append(text)
+        return '\n'.join([''.join(line) for line in lines])
+
+    def get_hash(self) -> str:
+        """Returns a hash of the characters of the page and where they are, which changes whenever the text read
+        from the page could."""
+        page_hash = hashlib.sha256()
+        page_hash.update(json.dumps([self.bbox, self.index.bboxes, self.index.items]).encode('utf-8'))
+        return page_hash.hexdigest()
+
+    def get_image_block_text(self, coordinates:tuple, dpi:int) -> str:
+        """Returns the text inside a box on an image of the page.
+
+        Args:
+            coordinates (tuple): The (x_1, y_1, x_2, y_2) of the box in image pixels, from the top left.
+            dpi (int): The resolution the page image was rasterized at.
+        """
+        return self.get_text(self.image_to_pdf_bbox(coordinates, dpi))
+
+def iter_page_text_layers(pdf_file_path:str, page_numbers:'range'=None):
+    """Yields the `PageTextLayer` of each page of a pdf, laying out one page at a time.
+
+    Args:
+        pdf_file_path (str): The path of the pdf.
+        page_numbers (range): The zero-indexed pages to read, or `None` for all of them.
+    """
+    for ltpage in extract_pages(pdf_file_path, page_numbers=page_numbers, laparams=LAParams()):
+        yield PageTextLayer(ltpage)
+
+class PageTextLayerReader():
+    """Reads the text layers of the pages of a pdf in order, only laying out the pages whose text layer is needed."""
+
+    def __init__(self, pdf_file_path:str):
+        """Opens the pdf.
+
+        Args:
+            pdf_file_path (str): The path of the pdf.
+        """
+        self._pdf_file = open(pdf_file_path, 'rb')
+        resource_manager = PDFResourceManager()
+        self._device = PDFPageAggregator(resource_manager, laparams=LAParams())
+        self._interpreter = PDFPageInterpreter(resource_manager, self._device)
+        self._pages = PDFPage.get_pages(self._pdf_file)
+
+    def read_next_page(self, lay_out:bool=True) -> PageTextLayer:
+        """Moves on to the next page and returns its text layer, or `None` if there are no more pages or it
+        wasn't laid out.
+
+        Args:
+            lay_out (bool): Whether to lay out the page. Skipping pages that aren't needed saves most of the work.
+        """
+        page = next(self._pages, None)
+        if page is None or not lay_out:
+            return None
+        self._interpreter.process_page(page)
+        return PageTextLayer(self._device.get_result())
+
+    def close(self):
+        """Closes the pdf."""
+        self._pdf_file.close()
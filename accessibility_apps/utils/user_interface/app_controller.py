@@ -8,43 +8,157 @@
 # ==================================================
 
 import os
-from threading import Event, Thread
+from sys import platform
+from collections import Counter
+from threading import Event, Thread, Lock
+from concurrent.futures import as_completed
 from utils.accessible_document import AccessibleDocument
+from utils.harvest.extraction_cache import ExtractionCache
+from utils.harvest.layout_cache import LayoutCache
+from utils.export.export_manifest import get_export_manifest, write_export_csv
+from utils.harvest.model_registry import get_model_registry
+from utils.harvest.cpu_inference import CpuInferenceProfile
+from utils.worker_pool import PreloadedWorkerPool
 from utils.harvest.metadata_csv_reader import read_metadata_csv
 from utils.database_communication.downloader import DocumentDownloader
 
+def _run_pipeline_and_export(document:AccessibleDocument, output_directory:str):
+    """Run all accessibility pipeline functions over a given document and export it.
+
+    Args:
+        document (AccessibleDocument): The document to run the accessibility pipeline over.
+        output_directory (str): The folder to export the document to.
+    """
+    document.generate_tags()
+    document.create_alternative_text()
+    document.check_color_contrast()
+    # TODO add more accessibility functions here
+    document.export_document(output_directory + "/" + document.get_filename())
+
+def _process_local_document(file_path:str, metadata:tuple, output_directory:str, extraction_cache_directory:str, layout_cache_directory:str) -> str:
+    """Runs a local document through the accessibility pipeline in a pool worker and returns how its layout was found.
+
+    Args:
+        file_path (str): The path of the document.
+        metadata (tuple): The (author, title, subject) of the document.
+        output_directory (str): The folder to export the document to.
+        extraction_cache_directory (str): The folder of the extraction cache.
+        layout_cache_directory (str): The folder of the layout cache.
+    """
+    document = AccessibleDocument(file_path, True, extraction_cache=ExtractionCache(extraction_cache_directory), layout_cache=LayoutCache(layout_cache_directory))
+    document.set_metadata(*metadata)
+    _run_pipeline_and_export(document, output_directory)
+    # workers exit without running exit handlers, so the export is written to the manifest right away
+    get_export_manifest(output_directory).flush()
+    return document.layout_path
+
+def _get_document_metadata(metadata:dict) -> tuple:
+    """Returns the (author, title, subject) of a document from its metadata in the metadata csv."""
+    # get the author(s)
+    orgainzation = metadata.get("OCREATOR_ORGANIZATION")
+    first_names = metadata.get("CREATOR_FAMNAME")
+    last_names = metadata.get("CREATOR_GIVNAME")
+    author = ""
+    if orgainzation is not None:
+        author = ", ".join(orgainzation)
+    if first_names is not None and last_names is not None and len(first_names) == len(last_names):
+        names = ", ".join([first_name + " " + last_name for (first_name, last_name) in zip(first_names, last_names)])
+        if author == "":
+            author = names
+        else:
+            author += ", " + names
+
+    # get the title
+    title = metadata.get("ASSET_TITLE")
+    # either set it to be an empty string or the first element from the 
+    # metadata list since there should only be one title so grab the first one
+    title = "" if title is None else title[0]
+
+    # get the subject 
+    subject = metadata.get("ASSET_ABSTRACT")
+    # either set it to be an empty string or the first element from the 
+    # metadata list since there should only be one subject so grab the first one
+    subject = "" if subject is None else subject[0]
+
+    return author, title, subject
+
 class AccessibilityAppController():
     """Serves as a bridge between the user interface of the accessibility application and the back end functionality."""
 
     def __init__(self):
         self.input_directory = os.path.abspath(__file__) + "/../../../../data/input"
         self.output_directory = os.path.abspath(__file__) + "/../../../../data/output"
+        # local folders tend to be processed again after tweaking things, so keep what was extracted from them and the page layouts found
+        self.extraction_cache = ExtractionCache(os.path.abspath(__file__) + "/../../../../data/cache/extraction")
+        self.layout_cache = LayoutCache(os.path.abspath(__file__) + "/../../../../data/cache/layout")
         self.current_document = None
         self.auto_processed_docs_count = 0
-        self.downloader = DocumentDownloader(self.input_directory)
+        self.downloader = DocumentDownloader(self.input_directory, get_export_manifest(self.output_directory))
         self.update_ui_current_auto_document = lambda document_name: None
         self.update_ui_current_document_count = lambda document_count: None
+        # the number of documents whose layout was found each way (heuristics or the layout model)
+        self.layout_path_counts = Counter()
+        self.layout_path_counts_lock = Lock()
+        # the workers local folders are processed in, forked with the layout model already loaded (started by the first folder)
+        self.worker_pool = None
+        self.worker_pool_lock = Lock()
+        # whether the models of this process have started loading (local folders use the workers' models instead)
+        self.models_warming_up = False
+        self.models_warming_up_lock = Lock()
 
-    def _export_document(self, document:AccessibleDocument):
-        """Exports a document object to a pdf file.
-
-        Args:
-            document (AccessibleDocument): The document to export.
-        """
-        filename = self.output_directory + "/" + document.get_filename()
-        document.export_document(filename)
-    
     def _run_accessibility_pipeline(self, document:AccessibleDocument):
         """Run all accessibility pipeline functions over a given document.
 
         Args:
             document (AccessibleDocument): The document to run the accessibility pipeline over.
         """
-        document.generate_tags()
-        document.create_alternative_text()
-        document.check_color_contrast()
-        # TODO add more accessibility functions here
-        self._export_document(document)
+        _run_pipeline_and_export(document, self.output_directory)
+        self._count_layout_path(document.layout_path)
+
+    def _warm_up_models(self):
+        """Loads the models of this process in the background, for the documents processed here rather than in the
+        workers, so they are ready by the first document (layout parsing only runs on linux)."""
+        with self.models_warming_up_lock:
+            if self.models_warming_up or (platform != "linux" and platform != "linux2"):
+                return
+            self.models_warming_up = True
+        Thread(target=get_model_registry().warm_up, daemon=True).start()
+
+    def _count_layout_path(self, layout_path:str):
+        """Counts a processed document whose layout was found a way."""
+        with self.layout_path_counts_lock:
+            self.layout_path_counts[layout_path] += 1
+
+    def _get_worker_pool(self) -> PreloadedWorkerPool:
+        """Returns the pool of workers that process local folders, starting it if needed."""
+        with self.worker_pool_lock:
+            if self.worker_pool is None:
+                # the workers share the cpu profile from the environment, each pinned to its own share of the cpus
+                self.worker_pool = PreloadedWorkerPool(cpu_profile=CpuInferenceProfile.from_environment())
+            return self.worker_pool
+
+    def get_layout_path_report(self, reset:bool=False) -> str:
+        """Returns a summary of how many documents processed since the counts were last reset had their layout found each way.
+
+        Args:
+            reset (bool): Whether to start counting again, so the next report covers the next batch of documents.
+        """
+        with self.layout_path_counts_lock:
+            layout_path_counts = dict(self.layout_path_counts)
+            if reset:
+                self.layout_path_counts.clear()
+        total = sum(layout_path_counts.values())
+        return "\n".join(["{}: {} of {} documents".format("skipped" if layout_path is None else layout_path, count, total) for layout_path, count in layout_path_counts.items()])
+
+    def _print_layout_path_report(self, batch_name:str):
+        """Prints how the layout of each document in a finished batch was found (heuristics or the layout model).
+
+        Args:
+            batch_name (str): What the batch was, like the folder that was processed.
+        """
+        report = self.get_layout_path_report(reset=True)
+        if report != "":
+            print("Layout paths for {}:\n{}".format(batch_name, report))
 
     def _auto_download_and_process_documents(self, finish_event:Event):
         """Downloads documents on a loop and runs them through the accessibility pipeline until the passed threading `Event` is set."""
@@ -86,46 +200,23 @@ class AccessibilityAppController():
         # get the number of documents needing to be processed
         num_of_documents = len(all_files_metadata.keys())
 
-        # loop through the files from the csv and process each one of them
-        for file_name, metadata in all_files_metadata.items():
-            document = AccessibleDocument(folder + "/" + file_name, True)
-
-            # set the metadata for the file
-
-            # get the author(s)
-            orgainzation = metadata.get("OCREATOR_ORGANIZATION")
-            first_names = metadata.get("CREATOR_FAMNAME")
-            last_names = metadata.get("CREATOR_GIVNAME")
-            author = ""
-            if orgainzation is not None:
-                author = ", ".join(orgainzation)
-            if first_names is not None and last_names is not None and len(first_names) == len(last_names):
-                names = ", ".join([first_name + " " + last_name for (first_name, last_name) in zip(first_names, last_names)])
-                if author == "":
-                    author = names
-                else:
-                    author += ", " + names
-
-            # get the title
-            title = metadata.get("ASSET_TITLE")
-            # either set it to be an empty string or the first element from the 
-            # metadata list since there should only be one title so grab the first one
-            title = "" if title is None else title[0]
-
-            # get the subject 
-            subject = metadata.get("ASSET_ABSTRACT")
-            # either set it to be an empty string or the first element from the 
-            # metadata list since there should only be one subject so grab the first one
-            subject = "" if subject is None else subject[0]
-
-            document.set_metadata(author, title, subject)
-
-            # process the document
-            self._run_accessibility_pipeline(document)
+        # process the files from the csv in the worker pool (after creating the export manifest, so workers don't
+        # each import the legacy export csv into it)
+        get_export_manifest(self.output_directory).open()
+        worker_pool = self._get_worker_pool()
+        futures = [worker_pool.submit(_process_local_document, folder + "/" + file_name, _get_document_metadata(metadata), self.output_directory,
+                                      self.extraction_cache.cache_directory, self.layout_cache.cache_directory)
+                   for file_name, metadata in all_files_metadata.items()]
+        for future in as_completed(futures):
+            self._count_layout_path(future.result())
 
             # update the progress bar each time a document is completed
             progress_update_callback(100/num_of_documents)
 
+        # update the export csv once for the whole folder (the exports were recorded by the workers)
+        write_export_csv(self.output_directory, force=True)
+        self._print_layout_path_report(folder)
+
         # broadcast that the folder processing finished
         finished_callback()
 
@@ -149,6 +240,8 @@ class AccessibilityAppController():
 
             # end the processing once all the documents are done 
             if num_documents == processed_documents:
+                write_export_csv(self.output_directory)
+                self._print_layout_path_report("the document id list")
                 finished_callback()
 
         # call all the threads to start processing
@@ -157,6 +250,7 @@ class AccessibilityAppController():
 
     def start_auto_mode(self):
         """Starts the automatic processing of documents."""
+        self._warm_up_models()
         self.auto_mode_pause_event = Event()
         self.auto_document_processing_thread = Thread(target=self._auto_download_and_process_documents, args=[self.auto_mode_pause_event])
         self.auto_document_processing_thread.start()
@@ -165,6 +259,8 @@ class AccessibilityAppController():
         """Stops the automatic processing of documents."""
         self.auto_mode_pause_event.set()
         self.auto_document_processing_thread.join()
+        write_export_csv(self.output_directory)
+        self._print_layout_path_report("automatic processing")
         # to update the count just in case the document 
         self.update_ui_current_document_count(self.auto_processed_docs_count)
 
@@ -197,6 +293,8 @@ class AccessibilityAppController():
             id (str): The id number of the document.
             finished_callback (function): The function to call after the document has been processed.
         """
+        self._warm_up_models()
+
         # define a function to download and process the document
         def run_document_processing():
             # don't crash when a non-pdf is processed, just pass over it
@@ -242,4 +340,5 @@ class AccessibilityAppController():
         """
         self.input_directory = input_folder
         self.downloader.download_path = self.input_directory
-        self.output_directory = output_folder
\ No newline at end of file
+        self.output_directory = output_folder
+        self.downloader.export_manifest = get_export_manifest(self.output_directory)
\ No newline at end of file
@@ -0,0 +1,211 @@
+# ===================================================
+# File: worker_pool.py
+# Date: 10/18/2026
+# Description: Runs pipeline work in processes forked
+#   from a fork server that has already imported the
+#   heavy libraries and loaded the layout model, and
+#   keeps track of the memory unique to each worker.
+# ==================================================
+
+import os
+import sys
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+
+# the modules the fork server imports before forking workers
+DEFAULT_PRELOAD_MODULES = ['utils.harvest.model_preload']
+
+# the folder the app's modules are imported from (accessibility_apps)
+APP_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the number of workers, and the number of tasks a worker runs before it is replaced with a fresh fork
+DEFAULT_WORKER_COUNT = max(1, min(4, (os.cpu_count() or 1) // 2))
+DEFAULT_MAX_TASKS_PER_WORKER = 50
+
+# the fields of /proc/<pid>/smaps_rollup with the memory only mapped by one process
+PRIVATE_MEMORY_FIELDS = ('Private_Clean:', 'Private_Dirty:', 'Private_Hugetlb:')
+
+def get_unique_memory_bytes(pid:int=None) -> int:
+    """Returns the unique set size of a process in bytes: the memory that would be freed if it exited, which leaves
+    out pages shared copy-on-write with the process it was forked from. Returns 0 if it cannot be read.
+
+    Args:
+        pid (int): The process, or `None` for this one.
+    """
+    process = "self" if pid is None else str(pid)
+    private_kilobytes = 0
+    try:
+        # smaps_rollup has the totals already added up; older kernels only have the mapping by mapping smaps
+        smaps_path = "/proc/{}/smaps_rollup".format(process)
+        if not os.path.exists(smaps_path):
+            smaps_path = "/proc/{}/smaps".format(process)
+        with open(smaps_path, "r") as smaps_file:
+            for line in smaps_file:
+                if line.startswith(PRIVATE_MEMORY_FIELDS):
+                    private_kilobytes += int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        return 0
+    return private_kilobytes * 1024
+
+def _is_process_running(pid:int) -> bool:
+    """Returns whether a process is running (and not a zombie waiting to be reaped)."""
+    try:
+        with open("/proc/{}/stat".format(pid), "r") as stat_file:
+            # the state follows the parenthesized command name, which can contain spaces
+            return stat_file.read().rsplit(")", 1)[1].split()[0] not in ("Z", "X")
+    except FileNotFoundError:
+        return False
+    except (OSError, IndexError):
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+def _claim_worker_slot(worker_pids) -> int:
+    """Returns the number of a slot no running worker has, taking it for this worker."""
+    with worker_pids.get_lock():
+        for slot, pid in enumerate(worker_pids):
+            if pid == 0 or not _is_process_running(pid):
+                worker_pids[slot] = os.getpid()
+                return slot
+    # a replaced worker still holds its slot until it is reaped, so share one
+    return os.getpid() % len(worker_pids)
+
+def _initialize_worker(cpu_profile, worker_pids):
+    """Sets up the threads of a new worker with its own share of the cpu profile."""
+    from utils.harvest.model_registry import get_model_registry
+    get_model_registry().apply_cpu_profile(cpu_profile.for_worker(_claim_worker_slot(worker_pids), len(worker_pids)))
+
+def _add_to_python_path(directory:str):
+    """Adds a directory to the module search path of the python processes this one starts."""
+    python_path = os.environ.get("PYTHONPATH", "")
+    if directory not in python_path.split(os.pathsep):
+        os.environ["PYTHONPATH"] = directory if python_path == "" else directory + os.pathsep + python_path
+
+def _get_missing_modules(module_names:'list[str]') -> 'list[str]':
+    """Returns the modules that haven't been imported into this process."""
+    return [module_name for module_name in module_names if module_name not in sys.modules]
+
+def _run_task(function, args:tuple, kwargs:dict) -> tuple:
+    """Runs a task in a worker and returns its result along with the worker's pid and unique memory afterwards."""
+    result = function(*args, **kwargs)
+    return result, os.getpid(), get_unique_memory_bytes()
+
+class PreloadedWorkerPool():
+    """A pool of worker processes forked from a fork server that imports `preload_modules` once, so the libraries
+    and model weights they load are shared copy-on-write by every worker instead of loaded by each of them, and
+    a worker replaced after `max_tasks_per_worker` tasks starts without loading them again. Where fork servers
+    aren't supported (like on windows), workers are spawned and load everything themselves.
+
+    The fork server is shared by the whole program, so the preload modules of the first pool to start it are
+    the ones used. It isn't given the program's module search path and ignores modules it can't import, so the
+    app's folder is added to the `PYTHONPATH` it starts with, and a warning is printed if the first worker finds
+    any of the preload modules missing (each worker would load them itself).
+
+    The fork server doesn't pin itself or set its torch threads, since every worker would inherit them. With a
+    `cpu_profile`, each worker pins itself to its own share of the profile's cpus when it starts."""
+
+    def __init__(self, worker_count:int=DEFAULT_WORKER_COUNT, max_tasks_per_worker:int=DEFAULT_MAX_TASKS_PER_WORKER,
+                 preload_modules:'list[str]'=DEFAULT_PRELOAD_MODULES, cpu_profile:'CpuInferenceProfile'=None):
+        """Starts the pool. The fork server loads the preload modules when the first worker is needed.
+
+        Args:
+            worker_count (int): The most workers running at once.
+            max_tasks_per_worker (int): The number of tasks a worker runs before it is replaced, or `None` to keep them.
+            preload_modules (list[str]): The modules the fork server imports before forking workers.
+            cpu_profile (CpuInferenceProfile): The cpu profile the workers share, or `None` to leave their threads alone.
+        """
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(list(preload_modules))
+            # the fork server imports the preload modules from its own search path whatever the working directory is
+            _add_to_python_path(APP_DIRECTORY)
+        else:
+            context = multiprocessing.get_context("spawn")
+        self.start_method = context.get_start_method()
+        self.preload_modules = list(preload_modules)
+        initializer, initargs = None, ()
+        if cpu_profile is not None:
+            # the pid of the worker holding each share of the cpus
+            initializer, initargs = _initialize_worker, (cpu_profile, context.Array("i", worker_count))
+        self._executor = ProcessPoolExecutor(worker_count, mp_context=context, initializer=initializer, initargs=initargs,
+                                             max_tasks_per_child=max_tasks_per_worker)
+        self._lock = threading.Lock()
+        # the unique memory in bytes after the latest task and the number of tasks run, by worker pid
+        self.worker_memory = {}
+        # check that the first worker was forked with the preload modules already imported
+        self._preload_check = None
+        if self.start_method == "forkserver":
+            self._preload_check = self._executor.submit(_get_missing_modules, list(preload_modules))
+            self._preload_check.add_done_callback(self._warn_missing_preload_modules)
+
+    def _warn_missing_preload_modules(self, preload_check:Future):
+        """Prints a warning if the fork server didn't preload every module."""
+        if preload_check.cancelled():
+            return
+        missing_modules = self.preload_modules if preload_check.exception() is not None else preload_check.result()
+        if len(missing_modules) > 0:
+            print("Warning: the fork server didn't preload {}, so each worker imports them itself".format(", ".join(missing_modules)))
+
+    def get_missing_preload_modules(self) -> 'list[str]':
+        """Waits for the first worker and returns the preload modules it didn't get from the fork server (all of them
+        when workers are spawned)."""
+        if self._preload_check is None:
+            return list(self.preload_modules)
+        return self._preload_check.result()
+
+    def _record_task(self, task_future:Future, result_future:Future):
+        """Records the memory of the worker that ran a task and passes its result on."""
+        try:
+            result, pid, unique_memory_bytes = task_future.result()
+        except BaseException as e:
+            result_future.set_exception(e)
+            return
+        with self._lock:
+            worker = self.worker_memory.setdefault(pid, {"uss_bytes" : 0, "peak_uss_bytes" : 0, "task_count" : 0})
+            worker["uss_bytes"] = unique_memory_bytes
+            worker["peak_uss_bytes"] = max(worker["peak_uss_bytes"], unique_memory_bytes)
+            worker["task_count"] += 1
+        result_future.set_result(result)
+
+    def submit(self, function, *args, **kwargs) -> Future:
+        """Runs a function in a worker and returns a future for its result. The function and its arguments have to
+        be picklable, so the function should be defined at the top level of a module.
+
+        Args:
+            function (function): The function to run.
+        """
+        result_future = Future()
+        task_future = self._executor.submit(_run_task, function, args, kwargs)
+        task_future.add_done_callback(lambda task_future: self._record_task(task_future, result_future))
+        return result_future
+
+    def get_worker_memory(self) -> dict:
+        """Returns the unique memory in bytes after the latest task, the most unique memory after any task, and the
+        number of tasks run, of each worker that has run a task, by pid."""
+        with self._lock:
+            return {pid : dict(worker) for pid, worker in self.worker_memory.items()}
+
+    def get_memory_report(self) -> str:
+        """Returns a summary of the unique memory of the workers."""
+        worker_memory = self.get_worker_memory()
+        lines = ["worker {}: {:.1f} MB unique ({:.1f} MB peak) after {} tasks".format(pid, worker["uss_bytes"] / 2**20, worker["peak_uss_bytes"] / 2**20, worker["task_count"])
+                 for pid, worker in sorted(worker_memory.items())]
+        if len(worker_memory) > 0:
+            lines.append("average: {:.1f} MB unique per worker".format(sum([worker["uss_bytes"] for worker in worker_memory.values()]) / len(worker_memory) / 2**20))
+        return "\n".join(lines)
+
+    def close(self):
+        """Waits for the tasks that were submitted and stops the workers."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
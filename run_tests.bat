@@ -2,4 +2,16 @@ cd accessibility_apps
 python -m unittest -v tests.test_metadata_csv_reader
 python -m unittest -v tests.test_pdf_extractor
 python -m unittest -v tests.test_tag_tree
+python -m unittest -v tests.test_extraction_cache
+python -m unittest -v tests.test_pdf_metadata
+python -m unittest -v tests.test_export_manifest
+python -m unittest -v tests.test_text_layer
+python -m unittest -v tests.test_heuristic_layout
+python -m unittest -v tests.test_layout_cache
+python -m unittest -v tests.test_worker_pool
+python -m unittest -v tests.test_layout_join
+python -m unittest -v tests.test_reading_order
+python -m unittest -v tests.test_layout_client
+python -m unittest -v tests.test_batch_ocr
+python -m unittest -v tests.test_document_layout
 pause
\ No newline at end of file